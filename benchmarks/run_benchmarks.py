@@ -0,0 +1,212 @@
+"""
+Measure replication throughput, solver iteration cost, and the cost of the
+analysis pipeline. Results are saved as .json in benchmarks/results and can be
+compared against a saved baseline, e.g.,
+
+    python benchmarks/run_benchmarks.py --output after.json --baseline benchmarks/results/before.json
+
+Everything runs offline on CPU (MAXCUT uses the local Aer simulator or the
+NumPy statevector backend).
+"""
+import sys
+import os.path as o
+import os
+sys.path.append(o.abspath(o.join(o.dirname(sys.modules[__name__].__file__), ".."))) # type:ignore
+
+import argparse
+import json
+import platform
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+from mrg32k3a.mrg32k3a import MRG32k3a
+
+from simopt import profiling
+from simopt.base import Solution
+from simopt.directory import problem_directory
+from simopt.experiment_base import ProblemSolver, post_normalize, bootstrap_procedure, plot_progress_curves, mean_of_curves
+
+# 3- to 6-node graphs from run/maxcut_run_vmiastrodf_hpc.py.
+maxcut_edges = {3: [[0, 1], [1, 2], [0, 2]],
+                4: [[0, 1], [1, 2], [0, 2], [0, 3]],
+                5: [[0, 3], [0, 4], [1, 3], [2, 4]],
+                6: [[0, 1], [1, 3], [1, 4], [1, 5], [2, 4], [2, 5]]}
+solvers = ["VMIASTRODF", "ASTRODF1M", "ASTRODF2M", "NELDMDQ", "SPSAQ"]
+
+
+def best_time(function, repeats):
+    """Return the shortest wall-clock time (in seconds) of several calls."""
+    times = []
+    for _ in range(repeats):
+        tic = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - tic)
+    return min(times)
+
+
+def replications_per_second(problem, x, n_reps, repeats):
+    """Time ``problem.simulate`` at `x` and return replications per second."""
+    def simulate():
+        solution = Solution(x, problem)
+        solution.attach_rngs([MRG32k3a(s_ss_sss_index=[0, rng_index, 0]) for rng_index in range(problem.model.n_rngs)], copy=False)
+        problem.simulate(solution, n_reps)
+    return n_reps / best_time(simulate, repeats)
+
+
+def bench_replicate(results, quick):
+    repeats = 1 if quick else 3
+    # SYN across dimensions.
+    for dim in [2, 4, 8, 16, 32]:
+        problem = problem_directory["SYN-1"](fixed_factors={"initial_solution": (0,) * dim}, model_fixed_factors={"dim": dim})
+        for m in [1, 100]:
+            n_reps = 200 if quick else 2000
+            # Time m replications per simulate call.
+            def simulate():
+                solution = Solution((1.0,) * dim, problem)
+                solution.attach_rngs([MRG32k3a(s_ss_sss_index=[0, 0, 0])], copy=False)
+                for _ in range(n_reps // m):
+                    problem.simulate(solution, m)
+            results[f"replicate/SYN/dim={dim}/m={m}"] = {"value": n_reps / best_time(simulate, repeats), "unit": "reps/s", "higher_is_better": True}
+    # MAXCUT on 3- to 6-node graphs with p = 1 and p = 10.
+    try:
+        for p in [1, 10]:
+            for n_nodes, edges in maxcut_edges.items():
+                theta = (1.6,) * (2 * p)
+                problem = problem_directory["MAXCUT-1"](fixed_factors={"initial_solution": theta}, model_fixed_factors={"edges": edges, "p": p, "theta": theta})
+                n_reps = 5 if quick else 50
+                results[f"replicate/MAXCUT/p={p}/nodes={n_nodes}"] = {"value": replications_per_second(problem, theta, n_reps, repeats), "unit": "reps/s", "higher_is_better": True}
+    except ImportError as error:
+        print(f"Skipping MAXCUT replication benchmarks: {error}")
+    # MAXCUT with the NumPy statevector backend on 16- and 20-node circulant graphs.
+    for n_nodes in [16, 20]:
+        edges = [[i, (i + 1) % n_nodes] for i in range(n_nodes)] + [[i, (i + 5) % n_nodes] for i in range(n_nodes)]
+        theta = (1.6,) * 2
+        problem = problem_directory["MAXCUT-1"](fixed_factors={"initial_solution": theta}, model_fixed_factors={"edges": edges, "theta": theta, "backend": "qaoa_numpy"})
+        n_reps = 3 if quick else 20
+        results[f"replicate/MAXCUT-qaoa_numpy/p=1/nodes={n_nodes}"] = {"value": replications_per_second(problem, theta, n_reps, repeats), "unit": "reps/s", "higher_is_better": True}
+
+
+def bench_solvers(results, quick):
+    repeats = 1 if quick else 3
+    budget = 500 if quick else 3000
+    for solver_name in solvers:
+        # Keep the fastest of several identical macroreplications.
+        runtime = np.inf
+        for _ in range(repeats):
+            experiment = ProblemSolver(solver_name=solver_name, problem_name="SYN-1", problem_fixed_factors={"budget": budget}, file_name_path=o.join(tempfile.gettempdir(), "benchmark.pickle"))
+            experiment.solver.attach_rngs([MRG32k3a(s_ss_sss_index=[2, i + 1, 0]) for i in range(3)])
+            experiment.profile = True
+            __, __, repeat_runtime, repeat_profiler = experiment.run_multithread(0)
+            if repeat_runtime < runtime:
+                runtime, profiler = repeat_runtime, repeat_profiler
+        # Solvers without an iterate method are charged per simulate call.
+        n_iterations = profiler.counts.get(f"{experiment.solver.name}.iterate", profiler.counts.get("SYN-1.simulate", 1))
+        results[f"solver/{solver_name}/SYN/budget={budget}/solve"] = {"value": runtime, "unit": "s", "higher_is_better": False}
+        results[f"solver/{solver_name}/SYN/budget={budget}/per_iteration"] = {"value": runtime / n_iterations, "unit": "s", "higher_is_better": False}
+        simulate_time = profiler.totals.get("SYN-1.simulate", 0.0)
+        results[f"solver/{solver_name}/SYN/budget={budget}/overhead_fraction"] = {"value": (runtime - simulate_time) / runtime, "unit": "fraction", "higher_is_better": False}
+
+
+def synthetic_experiment(solver_name, n_macroreps, n_budgets, budget, seed):
+    """Create a SYN experiment with made-up recommended solutions (no solver run)."""
+    experiment = ProblemSolver(solver_name=solver_name, problem_name="SYN-1", problem_fixed_factors={"budget": budget})
+    rng = np.random.default_rng(seed)
+    experiment.n_macroreps = n_macroreps
+    experiment.all_recommended_xs = [[(0, 0)] + [tuple(rng.normal((3, 2), 1)) for _ in range(n_budgets - 1)] for _ in range(n_macroreps)]
+    experiment.all_intermediate_budgets = [[0] + sorted(rng.choice(np.arange(1, budget), n_budgets - 2, replace=False).tolist()) + [budget] for _ in range(n_macroreps)]
+    experiment.timings = [0.0] * n_macroreps
+    return experiment
+
+
+def bench_analysis(results, quick):
+    n_macroreps = 4 if quick else 20
+    n_postreps = 20 if quick else 200
+    n_bootstraps = 10 if quick else 100
+    # Work in a temporary directory because the pipeline writes .pickle files and plots.
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        experiments = [synthetic_experiment(solver_name, n_macroreps, 20, 10000, seed) for seed, solver_name in enumerate(["VMIASTRODF", "NELDMDQ"])]
+        tic = time.perf_counter()
+        for experiment in experiments:
+            experiment.post_replicate(n_postreps=n_postreps)
+        results["analysis/post_replicate"] = {"value": time.perf_counter() - tic, "unit": "s", "higher_is_better": False}
+        tic = time.perf_counter()
+        post_normalize(experiments=experiments, n_postreps_init_opt=n_postreps)
+        results["analysis/post_normalize"] = {"value": time.perf_counter() - tic, "unit": "s", "higher_is_better": False}
+        tic = time.perf_counter()
+        for experiment in experiments:
+            bootstrap_procedure(experiments=[[experiment]], n_bootstraps=n_bootstraps, conf_level=0.95, plot_type="mean", estimator=mean_of_curves(experiment.progress_curves))
+        results["analysis/bootstrap_procedure"] = {"value": time.perf_counter() - tic, "unit": "s", "higher_is_better": False}
+        tic = time.perf_counter()
+        plot_progress_curves(experiments=experiments, plot_type="mean", n_bootstraps=n_bootstraps)
+        results["analysis/plot_progress_curves"] = {"value": time.perf_counter() - tic, "unit": "s", "higher_is_better": False}
+    finally:
+        os.chdir(cwd)
+
+
+def compare(results, baseline, tolerance):
+    """Print the change of each benchmark relative to a baseline and return the regressions."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline["results"]:
+            continue
+        old = baseline["results"][name]["value"]
+        new = result["value"]
+        # Ratio > 1 means faster (or better) than the baseline.
+        ratio = new / old if result["higher_is_better"] else old / new
+        flag = ""
+        if ratio < 1 - tolerance:
+            flag = "  <-- regression"
+            regressions.append(name)
+        print(f"{name}: {old:.4g} -> {new:.4g} {result['unit']} ({ratio:.2f}x){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the simopt benchmarks.")
+    parser.add_argument("--suites", nargs="+", default=["replicate", "solver", "analysis"], help="suites to run")
+    parser.add_argument("--quick", action="store_true", help="fewer replications and repeats (smoke test)")
+    parser.add_argument("--output", default=None, help="name of .json results file in benchmarks/results")
+    parser.add_argument("--baseline", default=None, help=".json results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    results = {}
+    if "replicate" in args.suites:
+        bench_replicate(results, args.quick)
+    if "solver" in args.suites:
+        bench_solvers(results, args.quick)
+    if "analysis" in args.suites:
+        bench_analysis(results, args.quick)
+    # Make sure no profiler is left running.
+    profiling.stop_profiling()
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, cwd=o.dirname(o.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    output = {"metadata": {"time": time.strftime("%Y-%m-%d %H:%M:%S"), "commit": commit, "quick": args.quick,
+                           "python": platform.python_version(), "numpy": np.__version__, "machine": platform.platform(),
+                           "processor": platform.processor(), "cpu_count": os.cpu_count()},
+              "results": results}
+    results_dir = o.join(o.dirname(o.abspath(__file__)), "results")
+    os.makedirs(results_dir, exist_ok=True)
+    file_name = args.output if args.output is not None else f"benchmarks_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    with open(o.join(results_dir, file_name), "w") as file:
+        json.dump(output, file, indent=2)
+    print(f"Results saved to {o.join(results_dir, file_name)}.")
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance)
+        print(f"{len(regressions)} regressions beyond {args.tolerance:.0%}.")
+
+
+if (__name__ == "__main__"):
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+"""
+Summary
+-------
+Run solvers through an ask/tell protocol, so a driver decides how and
+where each simulation request is evaluated.
+
+``solve_steps`` turns ``solver.solve(problem)`` into a generator: each
+call the solver makes to ``problem.simulate(solution, m)`` is yielded to
+the driver as an ``EvaluationRequest``, and the solver resumes once the
+driver sends ``None`` back (after evaluating the request, e.g., inline,
+batched with requests from other solvers or macroreplications, on a
+pool, or on a remote backend). The solver runs in a helper thread that
+is paused while the driver holds a request, so solvers need no changes
+and only one of the two threads runs at a time.
+
+A driver stops a solver through ``time_budget_exhausted``, which every
+solver checks in its main and sampling loops: once the driver's own
+budget accounting says so, the solver finishes its current step and
+returns its recommended solutions as if its budget had run out.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+
+
+class SolveCancelled(Exception):
+    """Raised inside a solver whose ask/tell generator was closed."""
+
+
+class EvaluationRequest(object):
+    """Request from a solver to simulate replications at a solution.
+
+    Attributes
+    ----------
+    solution : ``base.Solution``
+        Solution to simulate, with its RNGs attached.
+    m : int
+        Number of replications to simulate.
+    overhead : float
+        Overhead charged per request (the solver's ``overhead_burden``).
+    budget : float
+        Budget charged for the request: ``m + overhead``.
+
+    Parameters
+    ----------
+    solution : ``base.Solution``
+        Solution to simulate.
+    m : int
+        Number of replications to simulate.
+    overhead : float, default=0
+        Overhead charged per request.
+    """
+    def __init__(self, solution: "Solution", m: int, overhead: float = 0):
+        self.solution = solution
+        self.m = m
+        self.overhead = overhead
+        self.budget = m + overhead
+
+
+class ProblemProxy(object):
+    """Stand-in for a problem that forwards ``simulate`` calls to the driver.
+
+    All other attributes are looked up on the wrapped problem.
+
+    Parameters
+    ----------
+    problem : ``base.Problem``
+        Problem to wrap.
+    overhead : float
+        Overhead charged per request.
+    requests : ``queue.Queue``
+        Queue of requests to the driver.
+    replies : ``queue.Queue``
+        Queue of replies from the driver.
+    should_stop : callable, optional
+        Function returning True once the driver wants the solver to stop.
+    """
+    def __init__(self, problem: "Problem", overhead: float, requests: queue.Queue, replies: queue.Queue, should_stop=None):
+        self._problem = problem
+        self._overhead = overhead
+        self._requests = requests
+        self._replies = replies
+        self._should_stop = should_stop
+
+    def __getattr__(self, name: str):
+        return getattr(self._problem, name)
+
+    def time_budget_exhausted(self) -> bool:
+        if self._should_stop is not None and self._should_stop():
+            return True
+        return self._problem.time_budget_exhausted()
+
+    def simulate(self, solution: "Solution", m: int = 1):
+        self._requests.put(EvaluationRequest(solution, m, self._overhead))
+        if not self._replies.get():
+            raise SolveCancelled()
+
+    def simulate_up_to(self, solutions: list["Solution"], n_reps: int):
+        for solution in solutions:
+            if solution.n_reps < n_reps:
+                self.simulate(solution, n_reps - solution.n_reps)
+
+    def simulate_shots(self, solution: "Solution", total_shots: int) -> int:
+        shots = self._problem.model.shots_per_replication()
+        m = max(1, -(-total_shots // shots))
+        self.simulate(solution, m)
+        return m
+
+
+def solve_steps(solver: "Solver", problem: "Problem", should_stop=None):
+    """Run a macroreplication of a solver as a generator of evaluation requests.
+
+    Notes
+    -----
+    Each request must be evaluated (e.g., with ``problem.simulate(request.solution, request.m)``)
+    before ``send(None)`` resumes the solver. The generator returns the
+    result of ``solver.solve``, i.e., it raises ``StopIteration`` with value
+    (recommended solutions, intermediate budgets). Closing the generator
+    early stops the solver and discards its results; `should_stop` lets
+    the solver stop at the end of its current step and return them.
+
+    Parameters
+    ----------
+    solver : ``base.Solver``
+        Solver to run (with its RNGs attached).
+    problem : ``base.Problem``
+        Problem to solve.
+    should_stop : callable, optional
+        Function returning True once the solver is to stop; the solver sees
+        it as ``problem.time_budget_exhausted()``.
+
+    Yields
+    ------
+    ``ask_tell.EvaluationRequest``
+        Next simulation the solver is waiting for.
+    """
+    requests = queue.Queue(maxsize=1)
+    replies = queue.Queue(maxsize=1)
+    proxy = ProblemProxy(problem, solver.factors.get("overhead_burden", 0), requests, replies, should_stop)
+    outcome = {}
+
+    def run_solver():
+        try:
+            outcome["result"] = solver.solve(problem=proxy)
+        except SolveCancelled:
+            pass
+        except BaseException as error:
+            outcome["error"] = error
+        finally:
+            requests.put(None)
+
+    thread = threading.Thread(target=run_solver, daemon=True)
+    thread.start()
+    try:
+        while True:
+            request = requests.get()
+            if request is None:
+                break
+            yield request
+            replies.put(True)
+    except GeneratorExit:
+        # Stop the solver at its pending request.
+        replies.put(False)
+        requests.get()
+        thread.join()
+        raise
+    thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def evaluate_inline(problem: "Problem", requests: list["EvaluationRequest"]):
+    """Evaluate requests one after another in this thread.
+
+    Parameters
+    ----------
+    problem : ``base.Problem``
+        Problem to simulate.
+    requests : list [``ask_tell.EvaluationRequest``]
+        Requests to evaluate.
+    """
+    for request in requests:
+        problem.simulate(request.solution, request.m)
+
+
+def run_ask_tell(pairs: list[tuple["Solver", "Problem"]], evaluate_batch=None, budgets: list = None) -> list[dict]:
+    """Run several solver-problem pairs side by side through the ask/tell
+    protocol, evaluating their pending requests together.
+
+    Notes
+    -----
+    In each round, every unfinished pair contributes its pending request;
+    ``evaluate_batch(problem, requests)`` is called once per problem with
+    all of that problem's requests (pairs are grouped by problem object).
+    The driver keeps the budget accounting: each request is charged
+    ``m + overhead_burden``, as the solvers charge themselves. Once a pair
+    has expended its entry of `budgets`, the driver stops it: the solver
+    finishes its current step (whose requests are still evaluated and
+    charged, so the pair may overrun its budget by that step) and returns
+    its recommended solutions. `budgets` is read in every round, so the
+    caller (e.g., from `evaluate_batch`) may raise or lower the budgets of
+    pairs while they run to reallocate budget among them. Without
+    `budgets`, each solver stops on its own budget.
+
+    Parameters
+    ----------
+    pairs : list [tuple [``base.Solver``, ``base.Problem``]]
+        Solvers (with RNGs attached) and the problems they solve. Each pair
+        needs its own solver object; problems may be shared.
+    evaluate_batch : callable, optional
+        Function (problem, list of requests) evaluating the requests
+        (default: ``evaluate_inline``).
+    budgets : list [float], optional
+        Budget of each pair, in the units charged per request.
+
+    Returns
+    -------
+    results : list [dict]
+        For each pair, "recommended_solns" and "intermediate_budgets" returned
+        by the solver, the "expended_budget" and "n_requests" accounted
+        by the driver, and "stopped" (True if the pair reached its entry of
+        `budgets`).
+    """
+    if evaluate_batch is None:
+        evaluate_batch = evaluate_inline
+    results = [{"recommended_solns": None, "intermediate_budgets": None, "expended_budget": 0, "n_requests": 0, "stopped": False} for _ in pairs]
+
+    def budget_spent(index):
+        return budgets is not None and results[index]["expended_budget"] >= budgets[index]
+
+    steps = [solve_steps(solver, problem, should_stop=lambda index=index: budget_spent(index)) for index, (solver, problem) in enumerate(pairs)]
+    pending = {}
+
+    def advance(index):
+        # Resume pair `index` and record its next request (or its result).
+        try:
+            pending[index] = next(steps[index])
+        except StopIteration as stop:
+            pending.pop(index, None)
+            results[index]["recommended_solns"], results[index]["intermediate_budgets"] = stop.value
+            results[index]["stopped"] = budget_spent(index)
+
+    for index in range(len(pairs)):
+        advance(index)
+    while len(pending) > 0:
+        # Group the pending requests by problem.
+        batches = {}
+        for index, request in pending.items():
+            batches.setdefault(id(pairs[index][1]), (pairs[index][1], []))[1].append((index, request))
+        for problem, indexed_requests in batches.values():
+            evaluate_batch(problem, [request for _, request in indexed_requests])
+            for index, request in indexed_requests:
+                results[index]["expended_budget"] += request.budget
+                results[index]["n_requests"] += 1
+        for index in list(pending):
+            advance(index)
+    return results
@@ -0,0 +1,344 @@
+#!/usr/bin/env python
+"""
+Summary
+-------
+Emulate a remote simulation backend (e.g., a cloud quantum service) on a
+local machine, to benchmark solvers and evaluation strategies when each
+backend job pays queueing latency rather than a nominal overhead.
+
+A ``LatencyBackend`` runs jobs on a fixed number of worker threads fed by
+a queue of bounded depth, and makes each job wait a per-job latency plus a
+per-shot cost before it runs. ``LatencyModel`` wraps any ``base.Model`` so
+that each replication call (or batch of replications) is one job, e.g.,
+
+    backend = LatencyBackend(latency=0.2, shot_cost=1e-4, concurrency=4)
+    problem.model = LatencyModel(problem.model, backend)
+
+Submitted-job timelines are recorded by the backend (see ``timeline``
+and ``summary``). ``evaluate_concurrently`` evaluates a batch of ask/tell
+requests (see ``ask_tell.run_ask_tell``) in parallel, so jobs from several
+solvers or macroreplications overlap on the backend.
+"""
+from __future__ import annotations
+
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Job(object):
+    """Job submitted to a ``LatencyBackend``.
+
+    Attributes
+    ----------
+    job_id : int
+        Index of the job in the order of submission.
+    label : str
+        Label of the job (e.g., the model name).
+    shots : int
+        Number of shots (elementary samples) charged to the job.
+    submitted : float
+        Time (``time.perf_counter``) the job was submitted.
+    started : float
+        Time the job left the queue (None until then).
+    finished : float
+        Time the job finished (None until then).
+
+    Parameters
+    ----------
+    job_id : int
+        Index of the job.
+    function : callable
+        Function (without arguments) computing the result of the job.
+    shots : int
+        Number of shots charged to the job.
+    label : str
+        Label of the job.
+    """
+    def __init__(self, job_id: int, function, shots: int, label: str):
+        self.job_id = job_id
+        self.function = function
+        self.shots = shots
+        self.label = label
+        self.submitted = time.perf_counter()
+        self.started = None
+        self.finished = None
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+
+    def result(self):
+        """Wait for the job to finish and return its result.
+
+        Returns
+        -------
+        object
+            Return value of the job's function (its exception is raised again).
+        """
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class LatencyBackend(object):
+    """Local stand-in for a remote backend that runs jobs with emulated
+    latency, shot cost, queue depth, and concurrency.
+
+    Notes
+    -----
+    Each job sleeps ``latency + shots * shot_cost`` seconds on a worker
+    thread and then computes its result on that thread. Submitting blocks
+    while ``queue_depth`` jobs are already waiting. The worker threads are
+    started on the first submission and are not pickled, so a backend can
+    be sent to worker processes (each process gets its own workers and an
+    empty timeline).
+
+    Attributes
+    ----------
+    latency : float
+        Fixed time (in seconds) each job waits before running.
+    shot_cost : float
+        Additional time (in seconds) per shot of a job.
+    queue_depth : int
+        Max number of jobs waiting for a worker (0 for unbounded).
+    concurrency : int
+        Number of jobs run at the same time.
+    jobs : list [``backends.Job``]
+        Jobs submitted so far.
+
+    Parameters
+    ----------
+    latency : float, default=0.0
+        Fixed time (in seconds) each job waits before running.
+    shot_cost : float, default=0.0
+        Additional time (in seconds) per shot of a job.
+    queue_depth : int, default=0
+        Max number of jobs waiting for a worker (0 for unbounded).
+    concurrency : int, default=1
+        Number of jobs run at the same time.
+    """
+    def __init__(self, latency: float = 0.0, shot_cost: float = 0.0, queue_depth: int = 0, concurrency: int = 1):
+        if latency < 0 or shot_cost < 0 or queue_depth < 0 or concurrency < 1:
+            print('--* Error: Latency, shot cost, and queue depth must be nonnegative and concurrency must be at least 1. ')
+            print('--* Aborting. ')
+            raise ValueError("invalid backend settings")
+        self.latency = latency
+        self.shot_cost = shot_cost
+        self.queue_depth = queue_depth
+        self.concurrency = concurrency
+        self.jobs = []
+        self._lock = threading.Lock()
+        self._queue = None
+        self._workers = []
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["jobs"] = []
+        state["_lock"] = None
+        state["_queue"] = None
+        state["_workers"] = []
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the worker threads (if not running).
+        """
+        with self._lock:
+            if self._queue is None:
+                self._queue = queue.Queue(maxsize=self.queue_depth)
+                self._workers = [threading.Thread(target=self._work, daemon=True) for _ in range(self.concurrency)]
+                for worker in self._workers:
+                    worker.start()
+
+    def _work(self):
+        # Run jobs until a None job arrives.
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            job.started = time.perf_counter()
+            time.sleep(self.latency + job.shots * self.shot_cost)
+            try:
+                job._result = job.function()
+            except BaseException as error:
+                job._error = error
+            job.finished = time.perf_counter()
+            job._done.set()
+
+    def submit(self, function, shots: int = 0, label: str = "") -> "Job":
+        """Submit a job, waiting while the queue is full.
+
+        Parameters
+        ----------
+        function : callable
+            Function (without arguments) computing the result of the job.
+        shots : int, default=0
+            Number of shots charged to the job.
+        label : str, default=""
+            Label of the job.
+
+        Returns
+        -------
+        ``backends.Job``
+            Submitted job.
+        """
+        self.start()
+        with self._lock:
+            job = Job(len(self.jobs), function, shots, label)
+            self.jobs.append(job)
+        self._queue.put(job)
+        return job
+
+    def run(self, function, shots: int = 0, label: str = ""):
+        """Submit a job and wait for its result.
+
+        Parameters
+        ----------
+        function : callable
+            Function (without arguments) computing the result of the job.
+        shots : int, default=0
+            Number of shots charged to the job.
+        label : str, default=""
+            Label of the job.
+
+        Returns
+        -------
+        object
+            Result of the job.
+        """
+        return self.submit(function, shots, label).result()
+
+    def close(self):
+        """Stop the worker threads once the submitted jobs are done.
+        """
+        with self._lock:
+            if self._queue is None:
+                return
+            for _ in self._workers:
+                self._queue.put(None)
+            workers = self._workers
+            self._queue = None
+            self._workers = []
+        for worker in workers:
+            worker.join()
+
+    def timeline(self) -> list[dict]:
+        """Return the timeline of the finished jobs.
+
+        Returns
+        -------
+        list [dict]
+            For each finished job: "job_id", "label", "shots", and the
+            "submitted", "started", and "finished" times (in seconds since
+            the first submission).
+        """
+        finished = [job for job in self.jobs if job.finished is not None]
+        if len(finished) == 0:
+            return []
+        t0 = min(job.submitted for job in self.jobs)
+        return [{"job_id": job.job_id,
+                 "label": job.label,
+                 "shots": job.shots,
+                 "submitted": job.submitted - t0,
+                 "started": job.started - t0,
+                 "finished": job.finished - t0
+                 } for job in finished]
+
+    def summary(self) -> dict:
+        """Summarize the timeline of the finished jobs.
+
+        Returns
+        -------
+        dict
+            "n_jobs", "shots", mean "queue_wait" (submission to start) and
+            "turnaround" (submission to finish) times, "makespan" (first
+            submission to last finish), and "utilization" (busy time of the
+            workers divided by ``concurrency * makespan``).
+        """
+        timeline = self.timeline()
+        if len(timeline) == 0:
+            return {"n_jobs": 0, "shots": 0, "queue_wait": 0.0, "turnaround": 0.0, "makespan": 0.0, "utilization": 0.0}
+        n_jobs = len(timeline)
+        makespan = max(job["finished"] for job in timeline)
+        busy = sum(job["finished"] - job["started"] for job in timeline)
+        return {"n_jobs": n_jobs,
+                "shots": sum(job["shots"] for job in timeline),
+                "queue_wait": sum(job["started"] - job["submitted"] for job in timeline) / n_jobs,
+                "turnaround": sum(job["finished"] - job["submitted"] for job in timeline) / n_jobs,
+                "makespan": makespan,
+                "utilization": busy / (self.concurrency * makespan) if makespan > 0 else 0.0
+                }
+
+
+class LatencyModel(object):
+    """Wrapper of a model whose replication calls run as jobs on a
+    ``LatencyBackend``.
+
+    Notes
+    -----
+    Each call to ``replicate``/``replicate_at`` is one job of
+    ``shots_per_replication()`` shots, and each call to
+    ``replicate_batch``/``replicate_batch_at`` is one job of `m` times as
+    many shots. The results are those of the wrapped model. All other
+    attributes are looked up on the wrapped model.
+
+    Attributes
+    ----------
+    model : ``base.Model``
+        Wrapped model.
+    backend : ``backends.LatencyBackend``
+        Backend running the jobs.
+
+    Parameters
+    ----------
+    model : ``base.Model``
+        Model to wrap.
+    backend : ``backends.LatencyBackend``
+        Backend running the jobs.
+    """
+    def __init__(self, model: "Model", backend: "LatencyBackend"):
+        self.model = model
+        self.backend = backend
+
+    def __getattr__(self, name: str):
+        if name.startswith("__") or name in ("model", "backend"):
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    def replicate(self, rng_list: list["MRG32k3a"]) -> tuple[dict, dict]:
+        return self.backend.run(lambda: self.model.replicate(rng_list), self.model.shots_per_replication(), self.model.name)
+
+    def replicate_at(self, factors: dict, rng_list: list["MRG32k3a"]) -> tuple[dict, dict]:
+        return self.backend.run(lambda: self.model.replicate_at(factors, rng_list), self.model.shots_per_replication(), self.model.name)
+
+    def replicate_batch(self, rng_list: list["MRG32k3a"], m: int) -> dict:
+        return self.backend.run(lambda: self.model.replicate_batch(rng_list, m), m * self.model.shots_per_replication(), self.model.name)
+
+    def replicate_batch_at(self, factors: dict, rng_list: list["MRG32k3a"], m: int) -> dict:
+        return self.backend.run(lambda: self.model.replicate_batch_at(factors, rng_list, m), m * self.model.shots_per_replication(), self.model.name)
+
+
+def evaluate_concurrently(problem: "Problem", requests: list["EvaluationRequest"]):
+    """Evaluate ask/tell requests on parallel threads, e.g., so their
+    backend jobs overlap (see ``ask_tell.run_ask_tell``).
+
+    Notes
+    -----
+    The requests must be for different solutions.
+
+    Parameters
+    ----------
+    problem : ``base.Problem``
+        Problem to simulate.
+    requests : list [``ask_tell.EvaluationRequest``]
+        Requests to evaluate.
+    """
+    with ThreadPoolExecutor(max_workers=max(len(requests), 1)) as executor:
+        futures = [executor.submit(problem.simulate, request.solution, request.m) for request in requests]
+        for future in futures:
+            future.result()
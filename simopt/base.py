@@ -6,10 +6,13 @@ Provide base classes for solvers, problems, and models.
 """
 from __future__ import annotations
 
+import time
 import numpy as np
-from copy import deepcopy
+from copy import copy as shallow_copy
 from mrg32k3a.mrg32k3a import MRG32k3a
 
+from simopt import profiling, progress
+
 
 class Solver(object):
     """Base class to implement simulation-optimization solvers.
@@ -34,6 +37,8 @@ class Solver(object):
         List of RNGs used for the solver's internal purposes.
     solution_progenitor_rngs : list [``mrg32k3a.mrg32k3a.MRG32k3a``]
         List of RNGs used as a baseline for simulating solutions.
+    macrorep : int
+        Index of the macroreplication currently being run.
 
     Parameters
     ----------
@@ -47,6 +52,7 @@ class Solver(object):
         for key in self.specifications:
             if key not in fixed_factors:
                 self.factors[key] = self.specifications[key]["default"]
+        self.macrorep = 0
 
     def __eq__(self, other: "Solver") -> bool:
         """Check if two solvers are equivalent.
@@ -102,6 +108,24 @@ class Solver(object):
         """
         raise NotImplementedError
 
+    def ask_tell(self, problem: "Problem"):
+        """Run ``solve`` as a generator of simulation requests, so the caller
+        decides how each request is evaluated (see ``ask_tell.solve_steps``).
+
+        Parameters
+        ----------
+        problem : ``base.Problem``
+            Simulation-optimization problem to solve.
+
+        Returns
+        -------
+        generator
+            Yields ``ask_tell.EvaluationRequest`` objects and returns
+            (recommended_solns, intermediate_budgets).
+        """
+        from simopt.ask_tell import solve_steps
+        return solve_steps(self, problem)
+
     def check_crn_across_solns(self):
         """Check solver factor crn_across_solns.
 
@@ -250,8 +274,13 @@ class Problem(object):
                 Default initial solution from which solvers start.
             budget : int
                 Max number of replications (fn evals) for a solver to take.
+            time_budget : float, optional
+                Max seconds spent in ``simulate`` for a solver to take
+                (0 to count replications only).
     specifications : dict
         Details of each factor (for GUI, data validation, and defaults).
+    simulation_time : float
+        Seconds spent in ``simulate`` since the clock was last reset.
 
     Parameters
     ----------
@@ -273,6 +302,7 @@ class Problem(object):
             if key not in model_fixed_factors:
                 model_fixed_factors[key] = self.model_default_factors[key]
         self.model_fixed_factors = model_fixed_factors
+        self.simulation_time = 0.0
         # super().__init__()
 
     def __eq__(self, other: "Problem") -> bool:
@@ -329,6 +359,97 @@ class Problem(object):
         """
         return self.factors["budget"] > 0
 
+    def check_time_budget(self):
+        """Check if time budget is nonnegative.
+
+        Returns
+        -------
+        bool
+            True if time budget is nonnegative, otherwise False.
+        """
+        return self.factors["time_budget"] >= 0
+
+    def time_budget_mode(self) -> bool:
+        """Check if solvers are limited by the time spent simulating.
+
+        Returns
+        -------
+        bool
+            True if a positive time budget is set, otherwise False.
+        """
+        return self.factors.get("time_budget", 0) > 0
+
+    def reset_clock(self):
+        """Reset the time spent simulating, e.g., at the start of a macroreplication.
+        """
+        self.simulation_time = 0.0
+
+    def time_budget_exhausted(self) -> bool:
+        """Check if the time budget (if any) has run out.
+
+        Returns
+        -------
+        bool
+            True if in time-budget mode and the time spent simulating
+            reached the time budget, otherwise False.
+        """
+        return self.time_budget_mode() and self.simulation_time >= self.factors["time_budget"]
+
+    def budget_stamp(self, expended_budget: float) -> float:
+        """Budget at which a solver recommends a solution, on the axis of
+        the problem's budget.
+
+        Parameters
+        ----------
+        expended_budget : float
+            Replication budget expended by the solver.
+
+        Returns
+        -------
+        float
+            Seconds spent simulating in time-budget mode, otherwise `expended_budget`.
+        """
+        if self.time_budget_mode():
+            return self.simulation_time
+        return expended_budget
+
+    def budget_limit(self) -> float:
+        """Max budget on the axis of intermediate budgets.
+
+        Returns
+        -------
+        float
+            Time budget (in seconds) in time-budget mode, otherwise the
+            replication budget.
+        """
+        if self.time_budget_mode():
+            return self.factors["time_budget"]
+        return self.factors["budget"]
+
+    def effective_budget(self, expended_budget: float, elapsed_time: float | None = None) -> float:
+        """Replication budget for a solver to size its parameters by,
+        e.g., gain sequences or tuning budgets.
+
+        Parameters
+        ----------
+        expended_budget : float
+            Replication budget expended by the solver so far.
+        elapsed_time : float, optional
+            Seconds spent simulating `expended_budget` (default: ``simulation_time``).
+
+        Returns
+        -------
+        float
+            In time-budget mode, `expended_budget` extrapolated to the whole
+            time budget at the rate simulated so far (capped by the replication
+            budget), otherwise the replication budget.
+        """
+        if elapsed_time is None:
+            elapsed_time = self.simulation_time
+        if self.time_budget_mode() and elapsed_time > 0:
+            return min(self.factors["budget"], expended_budget * self.factors["time_budget"] / elapsed_time)
+        return self.factors["budget"]
+
     def check_problem_factor(self, factor_name: str) -> bool:
         """Determine if the setting of a problem factor is permissible.
 
@@ -596,6 +717,15 @@ class Problem(object):
         Gradients of objective function and stochastic constraint LHSs
         are temporarily commented out. Under development.
 
+        If profiling is on (see ``profiling.start_profiling``), the time spent
+        in replications, storage padding, RNG advances, and summary statistics
+        is recorded.
+
+        The wall-clock time of each call is added to ``simulation_time``,
+        which is the clock of the time budget (see ``time_budget_mode``).
+        If progress reporting is on (see ``progress.start_reporting``), each
+        call is recorded.
+
         Parameters
         ----------
         solution : ``base.Solution``
@@ -603,42 +733,118 @@ class Problem(object):
         m : int, default=1
             Number of replications to simulate at `x`.
         """
+        profiler = profiling.active_profiler
+        tic_simulate = time.perf_counter()
         if m < 1:
             print('--* Error: Number of replications must be at least 1. ')
             print('--* Aborting. ')
         else:
             # Pad numpy arrays if necessary.
             if solution.n_reps + m > solution.storage_size:
+                if profiler is not None:
+                    tic = time.perf_counter()
                 solution.pad_storage(m)
-            # Set the decision factors of the model.
-            self.model.factors.update(solution.decision_factors)
-            for _ in range(m):
-                # Generate one replication at x.
-                responses, gradients = self.model.replicate(solution.rng_list)
-                # Convert gradient subdictionaries to vectors mapping to decision variables.
-                if self.gradient_available:
-                    vector_gradients = {keys: self.factor_dict_to_vector_gradients(gradient_dict) for (keys, gradient_dict) in gradients.items()}
-                    # vector_gradients = {keys: self.factor_dict_to_vector(gradient_dict) for (keys, gradient_dict) in gradients.items()}
-                # Convert responses and gradients to objectives and gradients and add
-                # to those of deterministic components of objectives.
-                solution.objectives[solution.n_reps] = [sum(pairs) for pairs in zip(self.response_dict_to_objectives(responses), solution.det_objectives)]
-                if self.gradient_available:
-                    # print(self.response_dict_to_objectives_gradients(vector_gradients))
-                    # print(solution.det_objectives_gradients)
-                    solution.objectives_gradients[solution.n_reps] = [[sum(pairs) for pairs in zip(stoch_obj, det_obj)] for stoch_obj, det_obj in zip(self.response_dict_to_objectives_gradients(vector_gradients), solution.det_objectives_gradients)]
-                    # solution.objectives_gradients[solution.n_reps] = [[sum(pairs) for pairs in zip(stoch_obj, det_obj)] for stoch_obj, det_obj in zip(self.response_dict_to_objectives(vector_gradients), solution.det_objectives_gradients)]
-                if self.n_stochastic_constraints > 0:
-                    # Convert responses and gradients to stochastic constraints and gradients and add
-                    # to those of deterministic components of stochastic constraints.
-                    solution.stoch_constraints[solution.n_reps] = [sum(pairs) for pairs in zip(self.response_dict_to_stoch_constraints(responses), solution.det_stoch_constraints)]
-                    # solution.stoch_constraints_gradients[solution.n_reps] = [[sum(pairs) for pairs in zip(stoch_stoch_cons, det_stoch_cons)] for stoch_stoch_cons, det_stoch_cons in zip(self.response_dict_to_stoch_constraints(vector_gradients), solution.det_stoch_constraints_gradients)]
-                # Increment counter.
-                solution.n_reps += 1
-                # Advance rngs to start of next subsubstream.
-                for rng in solution.rng_list:
-                    rng.advance_subsubstream()
+                if profiler is not None:
+                    profiler.add("Solution.pad_storage", time.perf_counter() - tic)
+            if self.model.batch_available and not self.gradient_available and self.n_stochastic_constraints == 0:
+                # Generate all m replications at x in one call.
+                if profiler is not None:
+                    tic = time.perf_counter()
+                # The decision factors are passed along; the model's factors are not changed.
+                responses = self.model.replicate_batch_at(solution.decision_factors, solution.rng_list, m)
+                if profiler is not None:
+                    profiler.add(f"{self.model.name}.replicate_batch", time.perf_counter() - tic)
+                objectives = np.column_stack(self.response_dict_to_objectives(responses))
+                solution.objectives[solution.n_reps:solution.n_reps + m] = objectives + np.array(solution.det_objectives)
+                solution.n_reps += m
+            else:
+                self.simulate_one_at_a_time(solution, m, profiler)
             # Update summary statistics.
+            if profiler is not None:
+                tic = time.perf_counter()
             solution.recompute_summary_statistics()
+            if profiler is not None:
+                profiler.add("Solution.recompute_summary_statistics", time.perf_counter() - tic)
+        elapsed = time.perf_counter() - tic_simulate
+        self.simulation_time += elapsed
+        if profiler is not None:
+            profiler.add(f"{self.name}.simulate", elapsed)
+        if progress.active_reporter is not None and m >= 1:
+            progress.active_reporter.record(m, self.simulation_time)
+
+    def simulate_one_at_a_time(self, solution: "Solution", m: int, profiler: "profiling.Profiler" = None):
+        """Simulate `m` replications at solution `x` by calling ``Model.replicate``
+        once per replication.
+
+        Parameters
+        ----------
+        solution : ``base.Solution``
+            Solution to evalaute, with storage for `m` more replications.
+        m : int
+            Number of replications to simulate at `x`.
+        profiler : ``profiling.Profiler``, optional
+            Profiler recording the time spent in replications and RNG advances.
+        """
+        for _ in range(m):
+            # Generate one replication at x.
+            if profiler is not None:
+                tic = time.perf_counter()
+            responses, gradients = self.model.replicate_at(solution.decision_factors, solution.rng_list)
+            if profiler is not None:
+                profiler.add(f"{self.model.name}.replicate", time.perf_counter() - tic)
+            # Convert gradient subdictionaries to vectors mapping to decision variables.
+            if self.gradient_available:
+                vector_gradients = {keys: self.factor_dict_to_vector_gradients(gradient_dict) for (keys, gradient_dict) in gradients.items()}
+                # vector_gradients = {keys: self.factor_dict_to_vector(gradient_dict) for (keys, gradient_dict) in gradients.items()}
+            # Convert responses and gradients to objectives and gradients and add
+            # to those of deterministic components of objectives.
+            solution.objectives[solution.n_reps] = [sum(pairs) for pairs in zip(self.response_dict_to_objectives(responses), solution.det_objectives)]
+            if self.gradient_available:
+                # print(self.response_dict_to_objectives_gradients(vector_gradients))
+                # print(solution.det_objectives_gradients)
+                solution.objectives_gradients[solution.n_reps] = [[sum(pairs) for pairs in zip(stoch_obj, det_obj)] for stoch_obj, det_obj in zip(self.response_dict_to_objectives_gradients(vector_gradients), solution.det_objectives_gradients)]
+                # solution.objectives_gradients[solution.n_reps] = [[sum(pairs) for pairs in zip(stoch_obj, det_obj)] for stoch_obj, det_obj in zip(self.response_dict_to_objectives(vector_gradients), solution.det_objectives_gradients)]
+            if self.n_stochastic_constraints > 0:
+                # Convert responses and gradients to stochastic constraints and gradients and add
+                # to those of deterministic components of stochastic constraints.
+                solution.stoch_constraints[solution.n_reps] = [sum(pairs) for pairs in zip(self.response_dict_to_stoch_constraints(responses), solution.det_stoch_constraints)]
+                # solution.stoch_constraints_gradients[solution.n_reps] = [[sum(pairs) for pairs in zip(stoch_stoch_cons, det_stoch_cons)] for stoch_stoch_cons, det_stoch_cons in zip(self.response_dict_to_stoch_constraints(vector_gradients), solution.det_stoch_constraints_gradients)]
+            # Increment counter.
+            solution.n_reps += 1
+            # Advance rngs to start of next subsubstream.
+            if profiler is not None:
+                tic = time.perf_counter()
+            for rng in solution.rng_list:
+                rng.advance_subsubstream()
+            if profiler is not None:
+                profiler.add("Solution.advance_rngs", time.perf_counter() - tic)
+
+    def simulate_shots(self, solution: "Solution", total_shots: int) -> int:
+        """Simulate enough replications at solution `x` to take at least
+        `total_shots` shots (see ``Model.shots_per_replication``).
+
+        Notes
+        -----
+        All replications are requested in one call to ``simulate``, so models
+        that run replications in batches (e.g., one backend job) can choose
+        the job structure.
+
+        Parameters
+        ----------
+        solution : ``base.Solution``
+            Solution to evalaute.
+        total_shots : int
+            Number of shots requested.
+
+        Returns
+        -------
+        int
+            Number of replications simulated.
+        """
+        shots = self.model.shots_per_replication()
+        m = max(1, -(-total_shots // shots))
+        self.simulate(solution, m)
+        return m
 
     def simulate_up_to(self, solutions: "Solution", n_reps: int):
         """Simulate a set of solutions up to a given number of replications.
@@ -675,12 +881,16 @@ class Model(object):
         Details of each factor (for GUI, data validation, and defaults).
     check_factor_list : dict
         Switch case for checking factor simulatability.
+    batch_available : bool
+        True if the model implements ``replicate_batch``, otherwise False.
 
     Parameters
     ----------
     fixed_factors : dict
         Dictionary of user-specified model factors.
     """
+    batch_available = False
+
     def __init__(self, fixed_factors: dict):
         # Set factors of the simulation model.
         # Fill in missing factors with default values.
@@ -774,6 +984,123 @@ class Model(object):
         """
         raise NotImplementedError
 
+    def replicate_at(self, factors: dict, rng_list: list["MRG32k3a"]) -> tuple[dict, dict]:
+        """Simulate a single replication with some factors set to given values,
+        without changing the model's factors.
+
+        Notes
+        -----
+        The default runs ``replicate`` on a shallow copy of the model with its
+        own ``factors`` dict. Models can override this method to read the
+        factors directly. Either way, concurrent calls at different factor
+        values (e.g., from threads) do not interfere, as long as ``replicate``
+        does not change the model.
+
+        Parameters
+        ----------
+        factors : dict
+            Values of factors that differ from the model's factors, e.g., the
+            decision factors of a solution.
+        rng_list : list [``mrg32k3a.mrg32k3a.MRG32k3a``]
+            RNGs for model to use when simulating a replication.
+
+        Returns
+        -------
+        responses : dict
+            Performance measures of interest.
+        gradients : dict [dict]
+            Gradient estimate for each response.
+        """
+        model = shallow_copy(self)
+        model.factors = {**self.factors, **factors}
+        return model.replicate(rng_list)
+
+    def shots_per_replication(self) -> int:
+        """Return the number of elementary samples (shots) averaged in one
+        replication, e.g., of a quantum circuit; 1 unless the model has such
+        a fidelity factor.
+
+        Returns
+        -------
+        int
+            Number of shots per replication.
+        """
+        return 1
+
+    def replicate_batch(self, rng_list: list["MRG32k3a"], m: int) -> dict:
+        """Simulate `m` replications for the current model factors at once.
+
+        Notes
+        -----
+        Replication `i` must use the random numbers found at the start of the
+        `i`-th subsubstream of each RNG, and the RNGs must be left at the start
+        of the subsubstream following the last replication. This gives the
+        same results (and CRN) as `m` calls to ``replicate`` with the RNGs
+        advanced to the next subsubstream after each call.
+
+        Parameters
+        ----------
+        rng_list : list [``mrg32k3a.mrg32k3a.MRG32k3a``]
+            RNGs for model to use when simulating the replications.
+        m : int
+            Number of replications to simulate.
+
+        Returns
+        -------
+        responses : dict [str, ``numpy.ndarray``]
+            Performance measures of interest, one entry per replication.
+        """
+        raise NotImplementedError
+
+    def replicate_batch_at(self, factors: dict, rng_list: list["MRG32k3a"], m: int) -> dict:
+        """Simulate `m` replications at once with some factors set to given
+        values, without changing the model's factors (see ``replicate_at``).
+
+        Parameters
+        ----------
+        factors : dict
+            Values of factors that differ from the model's factors.
+        rng_list : list [``mrg32k3a.mrg32k3a.MRG32k3a``]
+            RNGs for model to use when simulating the replications.
+        m : int
+            Number of replications to simulate.
+
+        Returns
+        -------
+        responses : dict [str, ``numpy.ndarray``]
+            Performance measures of interest, one entry per replication.
+        """
+        model = shallow_copy(self)
+        model.factors = {**self.factors, **factors}
+        return model.replicate_batch(rng_list, m)
+
+
+def clone_rng(rng: "MRG32k3a") -> "MRG32k3a":
+    """Copy a random-number generator much faster than ``deepcopy``.
+
+    Notes
+    -----
+    Only the stream-substream-subsubstream indices are copied. The current
+    state and the starts of the current stream, substream, and subsubstream
+    are shared with `rng`: ``MRG32k3a`` replaces (never modifies) them when it
+    generates numbers or advances, so the clone behaves exactly like a deep
+    copy and stops sharing them the first time either generator advances.
+
+    Parameters
+    ----------
+    rng : ``mrg32k3a.mrg32k3a.MRG32k3a``
+        Generator to copy.
+
+    Returns
+    -------
+    ``mrg32k3a.mrg32k3a.MRG32k3a``
+        Independent generator in the same state as `rng`.
+    """
+    clone = rng.__class__.__new__(rng.__class__)
+    clone.__dict__.update(rng.__dict__)
+    clone.s_ss_sss_index = list(rng.s_ss_sss_index)
+    return clone
+
 
 class Solution(object):
     """Base class for solutions represented as vectors of decision variables
@@ -816,6 +1143,13 @@ class Solution(object):
         Gradient estimates of stochastic constraints from each replication;
         # replications x # stochastic constraints x dimension.
 
+    Notes
+    -----
+    Attributes are declared in ``__slots__`` (no per-instance ``__dict__``),
+    since solvers keep many solutions, e.g., all visited points. Gradient
+    storage is only allocated if the problem provides gradients (otherwise
+    ``objectives_gradients`` is None). Summary statistics are set by
+    ``recompute_summary_statistics``.
 
     Parameters
     ----------
@@ -824,6 +1158,14 @@ class Solution(object):
     problem : ``base.Problem``
         Problem to which `x` is a solution.
     """
+    __slots__ = ("x", "dim", "decision_factors", "rng_list", "n_reps",
+                 "det_objectives", "det_objectives_gradients", "det_stoch_constraints", "det_stoch_constraints_gradients",
+                 "storage_size", "objectives", "objectives_gradients", "stoch_constraints", "stoch_constraints_gradients",
+                 "objectives_mean", "objectives_var", "objectives_stderr", "objectives_cov",
+                 "objectives_gradients_mean", "objectives_gradients_var", "objectives_gradients_stderr", "objectives_gradients_cov",
+                 "stoch_constraints_mean", "stoch_constraints_var", "stoch_constraints_stderr", "stoch_constraints_cov",
+                 "stoch_constraints_gradients_mean", "stoch_constraints_gradients_var", "stoch_constraints_gradients_stderr", "stoch_constraints_gradients_cov")
+
     def __init__(self, x: tuple, problem: "Problem"):
         super().__init__()
         self.x = x
@@ -836,7 +1178,10 @@ class Solution(object):
         self.storage_size = init_size
         # Raw data.
         self.objectives = np.zeros((init_size, problem.n_objectives))
-        self.objectives_gradients = np.zeros((init_size, problem.n_objectives, problem.dim))
+        if problem.gradient_available:
+            self.objectives_gradients = np.zeros((init_size, problem.n_objectives, problem.dim))
+        else:
+            self.objectives_gradients = None
         if problem.n_stochastic_constraints > 0:
             self.stoch_constraints = np.zeros((init_size, problem.n_stochastic_constraints))
             self.stoch_constraints_gradients = np.zeros((init_size, problem.n_stochastic_constraints, problem.dim))
@@ -861,6 +1206,30 @@ class Solution(object):
         # self.stoch_constraints_gradients_stderr = np.full((problem.n_stochastic_constraints, problem.dim), np.nan)
         # self.stoch_constraints_gradients_cov = np.full((problem.n_stochastic_constraints, problem.dim, problem.dim), np.nan)
 
+    def __setstate__(self, state: dict | tuple):
+        """Restore a pickled solution.
+
+        Notes
+        -----
+        Accepts the ``(None, slots)`` state of solutions pickled with
+        ``__slots__`` and the ``__dict__`` state of solutions pickled before.
+        Entries that are not attributes of ``Solution`` are ignored.
+
+        Parameters
+        ----------
+        state : dict or tuple
+            Attribute names and values, or a tuple of a dict (or None) and a
+            dict of slot names and values.
+        """
+        if isinstance(state, tuple):
+            instance_dict, slots = state
+            state = {**(instance_dict or {}), **(slots or {})}
+        for name, value in state.items():
+            try:
+                setattr(self, name, value)
+            except AttributeError:
+                pass
+
     def attach_rngs(self, rng_list: list["MRG32k3a"], copy: bool = True):
         """Attach a list of random-number generators to the solution.
 
@@ -869,10 +1238,11 @@ class Solution(object):
         rng_list : list [``mrg32k3a.mrg32k3a.MRG32k3a``]
             List of random-number generators used to run simulation replications.
         copy : bool, default=True
-            True if we want to copy the ``mrg32k3a.mrg32k3a.MRG32k3a`` objects, otherwise False.
+            True if we want to copy the ``mrg32k3a.mrg32k3a.MRG32k3a`` objects
+            (see ``clone_rng``), otherwise False.
         """
         if copy:
-            self.rng_list = [deepcopy(rng) for rng in rng_list]
+            self.rng_list = [clone_rng(rng) for rng in rng_list]
         else:
             self.rng_list = rng_list
 
@@ -892,7 +1262,8 @@ class Solution(object):
         pad_size = int(np.ceil(m / base_pad_size)) * base_pad_size
         self.storage_size += pad_size
         self.objectives = np.concatenate((self.objectives, np.zeros((pad_size, n_objectives))))
-        self.objectives_gradients = np.concatenate((self.objectives_gradients, np.zeros((pad_size, n_objectives, self.dim))))
+        if self.objectives_gradients is not None:
+            self.objectives_gradients = np.concatenate((self.objectives_gradients, np.zeros((pad_size, n_objectives, self.dim))))
         if self.stoch_constraints is not None:
             n_stochastic_constraints = len(self.det_stoch_constraints)
             self.stoch_constraints = np.concatenate((self.stoch_constraints, np.zeros((pad_size, n_stochastic_constraints))))
@@ -911,8 +1282,9 @@ class Solution(object):
             self.objectives_var = np.var(self.objectives[:self.n_reps], axis=0, ddof=1)
             self.objectives_stderr = np.std(self.objectives[:self.n_reps], axis=0, ddof=1) / np.sqrt(self.n_reps)
             self.objectives_cov = np.cov(self.objectives[:self.n_reps], rowvar=False, ddof=1)
-        self.objectives_gradients_mean = np.mean(self.objectives_gradients[:self.n_reps], axis=0)
-        if self.n_reps > 1:
+        if self.objectives_gradients is not None:
+            self.objectives_gradients_mean = np.mean(self.objectives_gradients[:self.n_reps], axis=0)
+        if self.objectives_gradients is not None and self.n_reps > 1:
             self.objectives_gradients_var = np.var(self.objectives_gradients[:self.n_reps], axis=0, ddof=1)
             self.objectives_gradients_stderr = np.std(self.objectives_gradients[:self.n_reps], axis=0, ddof=1) / np.sqrt(self.n_reps)
             self.objectives_gradients_cov = np.array([np.cov(self.objectives_gradients[:self.n_reps, obj], rowvar=False, ddof=1) for obj in range(len(self.det_objectives))])
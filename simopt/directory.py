@@ -6,45 +6,73 @@ Provide dictionary directories listing solvers, problems, and models.
 """
 from __future__ import annotations
 
-# import solvers
-from simopt.solvers.astrodfonemodel import ASTRODF1M
-from simopt.solvers.astrodftwomodel import ASTRODF2M
-from simopt.solvers.vmiastrodf import VMIASTRODF
-from simopt.solvers.neldmdq import NelderMeadQ
-from simopt.solvers.spsaq import SPSAQ
-
-# import models and problems
-from simopt.models.maxcut import MaxCutMinEnergy, MAXCUT
-from simopt.models.synthetic import SYNTHETIC, SYNTHETIC_MIN
+import importlib
+from collections.abc import Mapping
 
 # Import base
 from simopt.base import Model, Problem, Solver
 
+
+class LazyDirectory(Mapping):
+    """Read-only directory mapping abbreviated names to classes that are
+    imported the first time they are looked up.
+
+    Notes
+    -----
+    Entries are stored as ``"module:Class"`` strings, so listing the names
+    in a directory does not import any solver or model (and therefore
+    none of their heavy dependencies, e.g., qiskit for MAXCUT).
+
+    Parameters
+    ----------
+    entries : dict [str, str]
+        Names mapped to ``"module:Class"`` import paths.
+    """
+    def __init__(self, entries: dict[str, str]):
+        self.entries = dict(entries)
+        self._loaded = {}
+
+    def __getitem__(self, name: str) -> type:
+        if name not in self._loaded:
+            module_name, class_name = self.entries[name].split(":")
+            self._loaded[name] = getattr(importlib.import_module(module_name), class_name)
+        return self._loaded[name]
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.entries
+
+
 # directory dictionaries
-solver_directory: dict[str, "Solver"] = {
-    "VMIASTRODF": VMIASTRODF,
-    "ASTRODF1M": ASTRODF1M,
-    "ASTRODF2M": ASTRODF2M,
-    "NELDMDQ": NelderMeadQ,
-    "SPSAQ": SPSAQ
-}
+solver_directory: dict[str, "Solver"] = LazyDirectory({
+    "VMIASTRODF": "simopt.solvers.vmiastrodf:VMIASTRODF",
+    "ASTRODF1M": "simopt.solvers.astrodfonemodel:ASTRODF1M",
+    "ASTRODF2M": "simopt.solvers.astrodftwomodel:ASTRODF2M",
+    "NELDMDQ": "simopt.solvers.neldmdq:NelderMeadQ",
+    "SPSAQ": "simopt.solvers.spsaq:SPSAQ"
+})
 
-solver_unabbreviated_directory: dict[str, "Solver"] = {
-}
+solver_unabbreviated_directory: dict[str, "Solver"] = LazyDirectory({
+})
 
-problem_directory: dict[str, "Problem"] = {
-    "MAXCUT-1": MaxCutMinEnergy,
-    "SYN-1": SYNTHETIC_MIN
-}
+problem_directory: dict[str, "Problem"] = LazyDirectory({
+    "MAXCUT-1": "simopt.models.maxcut:MaxCutMinEnergy",
+    "SYN-1": "simopt.models.synthetic:SYNTHETIC_MIN"
+})
 
-problem_unabbreviated_directory: dict[str, "Problem"] = {
-}
-model_directory: dict[str, "Model"] = {
-    "MAXCUT": MAXCUT,
-    "SYN": SYNTHETIC
-}
-model_unabbreviated_directory: dict[str, "Model"] = {
-}
+problem_unabbreviated_directory: dict[str, "Problem"] = LazyDirectory({
+})
+model_directory: dict[str, "Model"] = LazyDirectory({
+    "MAXCUT": "simopt.models.maxcut:MAXCUT",
+    "SYN": "simopt.models.synthetic:SYNTHETIC"
+})
+model_unabbreviated_directory: dict[str, "Model"] = LazyDirectory({
+})
 model_problem_unabbreviated_directory: dict[str, str] = {
     "Min Deterministic Function + Noise (SUCG)": "EXAMPLE",
     "Max Profit for Continuous Newsvendor (SBCG)": "CNTNEWS",
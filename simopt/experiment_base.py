@@ -8,21 +8,19 @@ for reading/writing data and plotting.
 from __future__ import annotations
 
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
-from scipy.stats import norm
 import pickle
+import copy
 import importlib
-import ast
 import time
 import os
 import csv
+import json
 import itertools
 from typing import Union
 from mrg32k3a.mrg32k3a import MRG32k3a
-from multiprocessing import Pool
+from multiprocessing import Pool, shared_memory
 
+from simopt import profiling, progress, nolhs
 from simopt.base import Solution, Solver, Problem
 from simopt.directory import solver_directory, problem_directory, model_directory
 
@@ -150,6 +148,7 @@ class Curve(object):
         handle : list [``matplotlib.lines.Line2D``]
             Curve handle, to use when creating legends.
         """
+        import matplotlib.pyplot as plt
         if curve_type == "regular":
             linestyle = "-"
             linewidth = 2
@@ -316,6 +315,11 @@ class ProblemSolver(object):
         Sequences of intermediate budgets from each macroreplication.
     timings : list [float]
         Runtimes (in seconds) for each macroreplication.
+    profile : bool
+        True if the solver runs are profiled, otherwise False.
+    profiler : ``profiling.Profiler``
+        Timings of replications, solution bookkeeping, and solver phases
+        aggregated over all macroreplications (None if not profiled).
     n_postreps : int
         Number of postreplications to take at each recommended solution.
     crn_across_budget : bool
@@ -324,8 +328,19 @@ class ProblemSolver(object):
     crn_across_macroreps : bool
         True if CRN used for post-replications at solutions recommended on
         different macroreplications, otherwise False.
-    all_post_replicates : list [list [list]]
-        All post-replicates from all solutions from all macroreplications.
+    se_tol : float
+        Target standard error of the estimated objective at each recommended
+        solution (None if every solution gets `n_postreps`).
+    max_postreps : int
+        Max number of postreplications at each recommended solution if
+        `se_tol` is given.
+    all_n_postreps : list [``numpy.ndarray``]
+        Number of postreplications taken at each solution from each
+        macroreplication.
+    all_post_replicates : list [``numpy.ndarray``]
+        All post-replicates from all solutions from all macroreplications
+        (one budget x postrep array per macroreplication, or a list of
+        arrays of different lengths if `se_tol` is given).
     all_est_objectives : numpy array [numpy array]
         Estimated objective values of all solutions from all macroreplications.
     n_postreps_init_opt : int
@@ -346,6 +361,9 @@ class ProblemSolver(object):
         one for each macroreplication.
     progress_curves : list [``experiment_base.Curve``]
         Progress curves, one for each macroreplication.
+    precision_checkpoints : list [dict]
+        Number of macroreplications, CI, and CI half-width at each
+        checkpoint of ``run_to_precision``.
 
     Parameters
     ----------
@@ -433,7 +451,7 @@ class ProblemSolver(object):
             error_str += "Gradient-based solver does not have access to gradient for this problem.\n"
         return error_str
 
-    def run(self, n_macroreps: int):
+    def run(self, n_macroreps: int, profile: bool = False, show_progress: bool = False, heartbeat_file: Union[str, None] = None):
         """Run n_macroreps of the solver on the problem.
 
         Notes
@@ -445,6 +463,15 @@ class ProblemSolver(object):
         ----------
         n_macroreps : int
             Number of macroreplications of the solver to run on the problem.
+        profile : bool, default=False
+            True if the time spent in replications, solution bookkeeping, and
+            solver phases is to be recorded, otherwise False.
+        show_progress : bool, default=False
+            True if a status line with the budget spent, throughput, and ETA
+            is to be refreshed while running, otherwise False.
+        heartbeat_file : str, optional
+            Path of a JSON file refreshed with the progress of each
+            macroreplication while running (see ``progress.ProgressMonitor``).
         """
         print("Running Solver", self.solver.name, "on Problem", self.problem.name + ".")
 
@@ -453,6 +480,8 @@ class ProblemSolver(object):
         self.all_recommended_xs = [None] * n_macroreps
         self.all_intermediate_budgets = [None] * n_macroreps
         self.timings = [None] * n_macroreps
+        self.profile = profile
+        self.profiler = profiling.Profiler() if profile else None
 
         # Create, initialize, and attach random number generators
         #     Stream 0: reserved for taking post-replications
@@ -469,26 +498,187 @@ class ProblemSolver(object):
         rng_list = [MRG32k3a(s_ss_sss_index=[2, i + 1, 0]) for i in range(3)]
         self.solver.attach_rngs(rng_list)
 
+        self.run_macroreps(range(n_macroreps), show_progress, heartbeat_file)
+
+        # Save ProblemSolver object to .pickle file.
+        self.record_experiment_results()
+
+    def run_macroreps(self, mreps: range, show_progress: bool = False, heartbeat_file: Union[str, None] = None):
+        """Run the macroreplications with the given indices in parallel and
+        store their results at those indices.
+
+        Parameters
+        ----------
+        mreps : range
+            Indices of the macroreplications to run.
+        show_progress : bool, default=False
+            True if a status line with the budget spent, throughput, and ETA
+            is to be refreshed while running, otherwise False.
+        heartbeat_file : str, optional
+            Path of a JSON file refreshed with the progress of each
+            macroreplication while running (see ``progress.ProgressMonitor``).
+        """
         # Start a timer
         self.function_start = time.time()
 
+        # Optionally monitor the progress of the workers.
+        monitor = None
+        if show_progress or heartbeat_file is not None:
+            monitor = progress.ProgressMonitor(f"{self.solver.name} on {self.problem.name}", [self.problem.budget_limit()] * len(mreps), mreps, status_line=show_progress, heartbeat_file=heartbeat_file)
+            self.progress_channel = monitor.channel
+
         print("Starting macroreplications in parallel")
         with Pool() as process_pool:
             # Start the macroreplications in parallel (async)
-            result = process_pool.map_async(self.run_multithread, range(n_macroreps))
+            result = process_pool.map_async(self.run_multithread, mreps)
             # Wait for the results to be returned (or 1 second)
             while (not result.ready()):
                 # Update status bar here
+                if monitor is not None:
+                    monitor.poll()
                 result.wait(1)
+            if monitor is not None:
+                monitor.close()
+                del self.progress_channel
 
             # Grab all the data out of the result
-            for mrep in range(n_macroreps):
-                self.all_recommended_xs[mrep], self.all_intermediate_budgets[mrep], self.timings[mrep] = result.get()[mrep]
-        print("Finished running {} macroreplications in {} seconds.".format(n_macroreps, round(time.time() - self.function_start, 3)))
+            for index, mrep in enumerate(mreps):
+                self.all_recommended_xs[mrep], self.all_intermediate_budgets[mrep], self.timings[mrep], mrep_profiler = result.get()[index]
+                if self.profiler is not None:
+                    self.profiler.merge(mrep_profiler)
+        print("Finished running {} macroreplications in {} seconds.".format(len(mreps), round(time.time() - self.function_start, 3)))
 
         # Delete stuff we don't need to save
         del self.function_start
 
+    def add_macroreps(self, n_macroreps: int, show_progress: bool = False, heartbeat_file: Union[str, None] = None):
+        """Run `n_macroreps` more macroreplications of the solver on the problem.
+
+        Notes
+        -----
+        The new macroreplications use the next macroreplication streams, so
+        running M macroreplications and then adding N gives the same results
+        as running M + N at once. If the experiment was post-replicated, the
+        new macroreplications are post-replicated with the same settings;
+        post-normalization results are deleted.
+
+        Parameters
+        ----------
+        n_macroreps : int
+            Number of macroreplications to add.
+        show_progress : bool, default=False
+            True if a status line with the budget spent, throughput, and ETA
+            is to be refreshed while running, otherwise False.
+        heartbeat_file : str, optional
+            Path of a JSON file refreshed with the progress of each
+            macroreplication while running (see ``progress.ProgressMonitor``).
+        """
+        if not self.check_run():
+            self.run(n_macroreps, show_progress=show_progress, heartbeat_file=heartbeat_file)
+            return
+        print(f"Adding {n_macroreps} macroreplications of Solver {self.solver.name} on Problem {self.problem.name}.")
+        mreps = range(self.n_macroreps, self.n_macroreps + n_macroreps)
+        self.n_macroreps += n_macroreps
+        self.all_recommended_xs += [None] * n_macroreps
+        self.all_intermediate_budgets += [None] * n_macroreps
+        self.timings += [None] * n_macroreps
+        # Attach the same solver RNGs as ``run``.
+        self.solver.attach_rngs([MRG32k3a(s_ss_sss_index=[2, i + 1, 0]) for i in range(3)])
+        self.run_macroreps(mreps, show_progress, heartbeat_file)
+        if self.check_postreplicate():
+            self.all_post_replicates += [None] * n_macroreps
+            self.all_est_objectives += [None] * n_macroreps
+            self.all_n_postreps = getattr(self, "all_n_postreps", [None] * (self.n_macroreps - n_macroreps)) + [None] * n_macroreps
+            self.post_replicate_macroreps(mreps)
+        self.clear_postnorm()
+
+        # Save ProblemSolver object to .pickle file.
+        self.record_experiment_results()
+
+    def run_to_precision(self, n_macroreps: int, max_macroreps: int, target_halfwidth: float, n_postreps: int, wave_size: int = 5, metric: str = "terminal", conf_level: float = 0.95, n_bootstraps: int = 200, crn_across_budget: bool = True, crn_across_macroreps: bool = False, se_tol: Union[float, None] = None, max_postreps: Union[int, None] = None, show_progress: bool = False, heartbeat_file: Union[str, None] = None):
+        """Run and post-replicate macroreplications of the solver on the
+        problem in waves until the bootstrap CI of the mean performance is
+        narrow enough.
+
+        Notes
+        -----
+        After running and post-replicating `n_macroreps`, a bootstrap CI of
+        the mean performance over the macroreplications (see
+        ``racing_metrics``) is computed at each checkpoint. While its
+        half-width exceeds `target_halfwidth`, another wave of `wave_size`
+        macroreplications is added (see ``add_macroreps``), up to
+        `max_macroreps`. The macroreplications and bootstrap samples use
+        the usual RNG streams, so the final count is reproducible. The
+        checkpoints are stored in ``precision_checkpoints``.
+
+        Parameters
+        ----------
+        n_macroreps : int
+            Min number of macroreplications of the solver to run on the problem.
+        max_macroreps : int
+            Max number of macroreplications of the solver to run on the problem.
+        target_halfwidth : float
+            Target half-width of the CI of the mean performance.
+        n_postreps : int
+            Number of postreplications to take at each recommended solution
+            (min number if `se_tol` is given).
+        wave_size : int, default=5
+            Number of macroreplications added between checkpoints.
+        metric : str, default="terminal"
+            Performance of a macroreplication:
+                "terminal" : estimated objective at the final recommended solution;
+
+                "area" : area under the estimated objective curve, with the
+                budget normalized to [0, 1].
+        conf_level : float, default=0.95
+            Confidence level of the bootstrap CIs; in (0, 1).
+        n_bootstraps : int, default=200
+            Number of bootstrap samples per CI.
+        crn_across_budget : bool, default=True
+            True if CRN used for post-replications at solutions recommended at different times,
+            otherwise False.
+        crn_across_macroreps : bool, default=False
+            True if CRN used for post-replications at solutions recommended on different
+            macroreplications, otherwise False.
+        se_tol : float, optional
+            Target standard error of the estimated objective at each
+            recommended solution (see ``post_replicate``).
+        max_postreps : int, optional
+            Max number of postreplications at each recommended solution if
+            `se_tol` is given.
+        show_progress : bool, default=False
+            True if a status line with the budget spent, throughput, and ETA
+            is to be refreshed while running, otherwise False.
+        heartbeat_file : str, optional
+            Path of a JSON file refreshed with the progress of each
+            macroreplication while running (see ``progress.ProgressMonitor``).
+        """
+        if metric not in ("terminal", "area"):
+            print('--* Error: Precision metric must be "terminal" or "area". ')
+            print('--* Aborting. ')
+            return
+        if target_halfwidth <= 0 or n_macroreps < 2 or max_macroreps < n_macroreps or wave_size < 1:
+            print('--* Error: The target half-width must be positive, with at least 2 macroreplications, max_macroreps >= n_macroreps, and a positive wave size. ')
+            print('--* Aborting. ')
+            return
+        self.clear_run()
+        self.run(n_macroreps, show_progress=show_progress, heartbeat_file=heartbeat_file)
+        self.post_replicate(n_postreps, crn_across_budget, crn_across_macroreps, se_tol=se_tol, max_postreps=max_postreps)
+        # Stream 1 is dedicated to bootstrapping.
+        bootstrap_rng = MRG32k3a(s_ss_sss_index=[1, 0, 0])
+        self.precision_checkpoints = []
+        while True:
+            lower_bound, upper_bound = racing_conf_int(racing_metrics(self, metric), bootstrap_rng, n_bootstraps, conf_level)
+            halfwidth = (upper_bound - lower_bound) / 2
+            self.precision_checkpoints.append({"n_macroreps": self.n_macroreps,
+                                               "conf_int": (lower_bound, upper_bound),
+                                               "halfwidth": halfwidth
+                                               })
+            print(f"{self.n_macroreps} macroreplications of {self.solver.name} on {self.problem.name}: CI half-width {halfwidth:.6g} (target {target_halfwidth}).")
+            if halfwidth <= target_halfwidth or self.n_macroreps >= max_macroreps:
+                break
+            self.add_macroreps(min(wave_size, max_macroreps - self.n_macroreps), show_progress=show_progress, heartbeat_file=heartbeat_file)
+
         # Save ProblemSolver object to .pickle file.
         self.record_experiment_results()
 
@@ -503,19 +693,42 @@ class ProblemSolver(object):
         # Set progenitor_rngs and rng_list for solver.
         self.solver.solution_progenitor_rngs = progenitor_rngs
         self.solver.rng_list = solver_rngs
+        self.solver.macrorep = mrep
+
+        # Optionally time replications and solver phases.
+        profiler = None
+        if getattr(self, "profile", False):
+            profiler = profiling.start_profiling()
+            profiling.instrument_solver(self.solver)
+
+        # Optionally publish the progress to the parent.
+        channel = getattr(self, "progress_channel", None)
+        if channel is not None:
+            progress.start_reporting(channel, mrep, self.problem.budget_limit(), self.solver.factors.get("overhead_burden", 0), self.problem.time_budget_mode())
+            progress.instrument_solver(self.solver)
 
         # print([rng.s_ss_sss_index for rng in progenitor_rngs])
         # Run the solver on the problem.
+        self.problem.reset_clock()
         tic = time.perf_counter()
         recommended_solns, intermediate_budgets = self.solver.solve(problem=self.problem)
         toc = time.perf_counter()
         runtime = toc - tic
         print(f"Macroreplication {mrep + 1}: Finished Solver {self.solver.name} on Problem {self.problem.name} in {runtime:0.4f} seconds.")
 
+        if channel is not None:
+            progress.uninstrument_solver(self.solver)
+            progress.stop_reporting()
+
+        if profiler is not None:
+            profiling.uninstrument_solver(self.solver)
+            profiling.stop_profiling()
+            profiler.add(f"{self.solver.name}.solve", runtime)
+
         # Trim the recommended solutions and intermediate budgets
         recommended_solns, intermediate_budgets = trim_solver_results(problem=self.problem, recommended_solns=recommended_solns, intermediate_budgets=intermediate_budgets)
-        # Return tuple (rec_solns, int_budgets, runtime)
-        return ([solution.x for solution in recommended_solns], intermediate_budgets, runtime)
+        # Return tuple (rec_solns, int_budgets, runtime, profiler)
+        return ([solution.x for solution in recommended_solns], intermediate_budgets, runtime, profiler)
 
     def check_run(self) -> bool:
         """Check if the experiment has been run.
@@ -531,59 +744,149 @@ class ProblemSolver(object):
             ran = True
         return ran
 
-    def post_replicate(self, n_postreps: int, crn_across_budget: bool = True, crn_across_macroreps: bool = False):
+    def post_replicate(self, n_postreps: int, crn_across_budget: bool = True, crn_across_macroreps: bool = False, show_progress: bool = False, heartbeat_file: Union[str, None] = None, se_tol: Union[float, None] = None, max_postreps: Union[int, None] = None):
         """Run postreplications at solutions recommended by the solver.
 
+        Notes
+        -----
+        If `se_tol` is given, each recommended solution first gets
+        `n_postreps` postreplications and then more, in batches of at most
+        as many as it has, until the standard error of its estimated
+        objective is at most `se_tol` or it has `max_postreps`. The extra
+        postreplications continue the solution's RNGs, so the counts and
+        results are reproducible. ``all_n_postreps`` then records the count
+        at each solution and ``all_post_replicates`` holds one array per
+        solution.
+
         Parameters
         ----------
         n_postreps : int
-            Number of postreplications to take at each recommended solution.
+            Number of postreplications to take at each recommended solution
+            (min number if `se_tol` is given).
         crn_across_budget : bool, default=True
             True if CRN used for post-replications at solutions recommended at different times,
             otherwise False.
         crn_across_macroreps : bool, default=False
             True if CRN used for post-replications at solutions recommended on different
             macroreplications, otherwise False.
+        show_progress : bool, default=False
+            True if a status line with the replications taken, throughput,
+            and ETA is to be refreshed while running, otherwise False.
+        heartbeat_file : str, optional
+            Path of a JSON file refreshed with the progress of each
+            macroreplication while running (see ``progress.ProgressMonitor``).
+        se_tol : float, optional
+            Target standard error of the estimated objective at each
+            recommended solution.
+        max_postreps : int, optional
+            Max number of postreplications at each recommended solution if
+            `se_tol` is given (default: 10 * `n_postreps`).
         """
-        print("Setting up {} postreplications for {} macroreplications of {} on {}.".format(n_postreps, self.n_macroreps, self.solver.name, self.problem.name))
+        if se_tol is not None:
+            if max_postreps is None:
+                max_postreps = 10 * n_postreps
+            if se_tol <= 0 or n_postreps < 2 or max_postreps < n_postreps:
+                print('--* Error: The standard error tolerance must be positive, with at least 2 postreplications and max_postreps >= n_postreps. ')
+                print('--* Aborting. ')
+                return
+            print("Setting up {} to {} postreplications (standard error tolerance {}) for {} macroreplications of {} on {}.".format(n_postreps, max_postreps, se_tol, self.n_macroreps, self.solver.name, self.problem.name))
+        else:
+            print("Setting up {} postreplications for {} macroreplications of {} on {}.".format(n_postreps, self.n_macroreps, self.solver.name, self.problem.name))
 
         self.n_postreps = n_postreps
         self.crn_across_budget = crn_across_budget
         self.crn_across_macroreps = crn_across_macroreps
+        self.se_tol = se_tol
+        self.max_postreps = max_postreps if se_tol is not None else None
         # Initialize variables
-        self.all_post_replicates = [None] * self.n_macroreps
-        for mrep in range(self.n_macroreps):
-            self.all_post_replicates[mrep] = [] * len(self.all_intermediate_budgets[mrep])
         self.timings = [None] * self.n_macroreps
+        self.all_post_replicates = [None] * self.n_macroreps
+        self.all_est_objectives = [None] * self.n_macroreps
+        self.all_n_postreps = [None] * self.n_macroreps
+        self.post_replicate_macroreps(range(self.n_macroreps), show_progress, heartbeat_file)
 
-        self.function_start = time.time()
+        # Save ProblemSolver object to .pickle file.
+        self.record_experiment_results()
 
-        print("Starting postreplications in parallel")
-        with Pool() as process_pool:
-            # Start the macroreplications in parallel (async)
-            result = process_pool.map_async(self.post_replicate_multithread, range(self.n_macroreps))
-            # Wait for the results to be returned (or 1 second)
-            while (not result.ready()):
-                # Update status bar here
-                result.wait(1)
+    def post_replicate_macroreps(self, mreps: range, show_progress: bool = False, heartbeat_file: Union[str, None] = None):
+        """Run postreplications (with the settings of ``post_replicate``) at
+        solutions recommended on the macroreplications with the given indices,
+        and store their results at those indices.
 
-            # Grab all the data out of the result
-            for mrep in range(self.n_macroreps):
-                self.all_post_replicates[mrep], self.timings[mrep] = result.get()[mrep]
+        Parameters
+        ----------
+        mreps : range
+            Indices of the macroreplications to post-replicate.
+        show_progress : bool, default=False
+            True if a status line with the replications taken, throughput,
+            and ETA is to be refreshed while running, otherwise False.
+        heartbeat_file : str, optional
+            Path of a JSON file refreshed with the progress of each
+            macroreplication while running (see ``progress.ProgressMonitor``).
+        """
+        # Workers write the post-replicates into a shared (mrep x budget x postrep)
+        # array, padded with NaN where a macroreplication has fewer budgets
+        # (or a solution fewer postreplications).
+        n_budgets = [len(self.all_intermediate_budgets[mrep]) for mrep in mreps]
+        adaptive = getattr(self, "se_tol", None) is not None
+        shape = (len(mreps), max(n_budgets), self.max_postreps if adaptive else self.n_postreps)
+        shared_array = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * np.dtype(float).itemsize, 1))
+        self.shared_post_replicates = {"name": shared_array.name, "shape": shape, "first": mreps[0]}
 
-            # # The all post replicates is tricky because it is a dictionary of lists of lists
-            # # We need to convert it to a list of lists of lists
-            # self.all_post_replicates = [self.all_post_replicates[i] for i in range(len(self.all_post_replicates.keys()))]
-            # Store estimated objective for each macrorep for each budget.
-            self.all_est_objectives = [[np.mean(self.all_post_replicates[mrep][budget_index]) for budget_index in range(len(self.all_intermediate_budgets[mrep]))] for mrep in range(self.n_macroreps)]
-        print("Finished running {} postreplications in {} seconds.".format(self.n_macroreps, round(time.time() - self.function_start, 3)))
+        self.function_start = time.time()
+
+        # Optionally monitor the progress of the workers.
+        monitor = None
+        if show_progress or heartbeat_file is not None:
+            monitor = progress.ProgressMonitor(f"Postreplications of {self.solver.name} on {self.problem.name}", [n_budget * self.n_postreps for n_budget in n_budgets], mreps, status_line=show_progress, heartbeat_file=heartbeat_file)
+            self.progress_channel = monitor.channel
+
+        print("Starting postreplications in parallel")
+        post_replicates = np.ndarray(shape, dtype=float, buffer=shared_array.buf)
+        post_replicates.fill(np.nan)
+        try:
+            with Pool() as process_pool:
+                # Start the macroreplications in parallel (async)
+                result = process_pool.map_async(self.post_replicate_multithread, mreps)
+                # Wait for the results to be returned (or 1 second)
+                while (not result.ready()):
+                    # Update status bar here
+                    if monitor is not None:
+                        monitor.poll()
+                    result.wait(1)
+                if monitor is not None:
+                    monitor.close()
+
+                # Grab the runtimes and postreplication counts out of the result
+                n_postreps = []
+                for index, mrep in enumerate(mreps):
+                    _, self.timings[mrep], mrep_n_postreps = result.get()[index]
+                    n_postreps.append(mrep_n_postreps)
+        finally:
+            del self.shared_post_replicates
+            if monitor is not None:
+                del self.progress_channel
+            shared_array.unlink()
+        # Copy the post-replicates out of the shared block before releasing it.
+        post_replicates = np.array(post_replicates)
+        shared_array.close()
+        # Store estimated objective for each macrorep for each budget.
+        for index, mrep in enumerate(mreps):
+            self.all_n_postreps[mrep] = n_postreps[index]
+        if adaptive:
+            for index, mrep in enumerate(mreps):
+                self.all_post_replicates[mrep] = [post_replicates[index, budget_index, :n_postreps[index][budget_index]] for budget_index in range(n_budgets[index])]
+                self.all_est_objectives[mrep] = np.array([np.mean(row) for row in self.all_post_replicates[mrep]])
+        else:
+            est_objectives = post_replicates.mean(axis=-1)
+            for index, mrep in enumerate(mreps):
+                self.all_post_replicates[mrep] = post_replicates[index, :n_budgets[index]]
+                self.all_est_objectives[mrep] = est_objectives[index, :n_budgets[index]]
+        print("Finished running {} postreplications in {} seconds.".format(len(mreps), round(time.time() - self.function_start, 3)))
 
         # Delete stuff we don't need to save
         del self.function_start
 
-        # Save ProblemSolver object to .pickle file.
-        self.record_experiment_results()
-
     def post_replicate_multithread(self, mrep: int) -> tuple:
         print(f"Macroreplication {mrep + 1}: Starting postreplications for {self.solver.name} on {self.problem.name}.")
         # Create RNG list for the macroreplication.
@@ -593,10 +896,20 @@ class ProblemSolver(object):
         else:
             baseline_rngs = [MRG32k3a(s_ss_sss_index=[0, self.problem.model.n_rngs * (mrep + 1) + rng_index, 0]) for rng_index in range(self.problem.model.n_rngs)]
 
+        # Optionally publish the progress to the parent.
+        channel = getattr(self, "progress_channel", None)
+        if channel is not None:
+            progress.start_reporting(channel, mrep, len(self.all_intermediate_budgets[mrep]) * self.n_postreps)
+
         tic = time.perf_counter()
 
-        # Create an empty list for each budget
-        post_replicates = []
+        # Create a row of post-replicates for each budget
+        se_tol = getattr(self, "se_tol", None)
+        if se_tol is None:
+            post_replicates = np.empty((len(self.all_intermediate_budgets[mrep]), self.n_postreps))
+        else:
+            post_replicates = np.full((len(self.all_intermediate_budgets[mrep]), self.max_postreps), np.nan)
+        n_postreps = np.empty(len(self.all_intermediate_budgets[mrep]), dtype=int)
         # Loop over all recommended solutions.
         for budget_index in range(len(self.all_intermediate_budgets[mrep])):
             x = self.all_recommended_xs[mrep][budget_index]
@@ -609,14 +922,29 @@ class ProblemSolver(object):
             else:
                 fresh_soln.attach_rngs(rng_list=baseline_rngs, copy=False)
             self.problem.simulate(solution=fresh_soln, m=self.n_postreps)
+            if se_tol is not None:
+                # Add postreplications until the standard error is small enough,
+                # at most doubling the count at a time.
+                while fresh_soln.n_reps < self.max_postreps and fresh_soln.objectives_stderr[0] > se_tol:
+                    n_required = int(np.ceil(fresh_soln.objectives_var[0] / se_tol**2))
+                    self.problem.simulate(solution=fresh_soln, m=max(1, min(n_required - fresh_soln.n_reps, fresh_soln.n_reps, self.max_postreps - fresh_soln.n_reps)))
             # Store results
-            post_replicates.append(list(fresh_soln.objectives[:fresh_soln.n_reps][:, 0]))  # 0 <- assuming only one objective
+            n_postreps[budget_index] = fresh_soln.n_reps
+            post_replicates[budget_index, :fresh_soln.n_reps] = fresh_soln.objectives[:fresh_soln.n_reps, 0]  # 0 <- assuming only one objective
         toc = time.perf_counter()
         runtime = toc - tic
         print(f"\t{mrep + 1}: Finished in {round(runtime, 3)} seconds")
-
-        # Return tuple (post_replicates, runtime)
-        return (post_replicates, runtime)
+        if channel is not None:
+            progress.stop_reporting()
+
+        # Write the results into the shared array of the parent (if any),
+        # rather than returning them through the pool.
+        shared = getattr(self, "shared_post_replicates", None)
+        if shared is not None:
+            write_shared_rows(shared, mrep - shared.get("first", 0), post_replicates)
+            post_replicates = None
+        # Return tuple (post_replicates, runtime, n_postreps)
+        return (post_replicates, runtime, n_postreps)
 
     def check_postreplicate(self) -> bool:
         """Check if the experiment has been postreplicated.
@@ -692,7 +1020,8 @@ class ProblemSolver(object):
         bootstrap_rng.advance_subsubstream()
         # Bootstrap within each bootstrapped macroreplication.
         # Option 1: Simpler (default) CRN scheme, which makes for faster code.
-        if self.crn_across_budget and not self.crn_across_macroreps:
+        # Not used if solutions have different numbers of postreplications.
+        if self.crn_across_budget and not self.crn_across_macroreps and getattr(self, "se_tol", None) is None:
             for idx in range(self.n_macroreps):
                 mrep = bs_mrep_idxs[idx]
                 # Inner-level bootstrapping over intermediate recommended solutions.
@@ -713,7 +1042,7 @@ class ProblemSolver(object):
                         est_objectives.append(np.mean([self.all_post_replicates[mrep][budget][postrep] for postrep in bs_postrep_idxs]))
                 # Record objective or progress curve.
                 if normalize:
-                    frac_intermediate_budgets = [budget / self.problem.factors["budget"] for budget in self.all_intermediate_budgets[mrep]]
+                    frac_intermediate_budgets = [budget / self.problem.budget_limit() for budget in self.all_intermediate_budgets[mrep]]
                     norm_est_objectives = [(est_objective - bs_optimal_obj_val) / bs_initial_opt_gap for est_objective in est_objectives]
                     new_progress_curve = Curve(x_vals=frac_intermediate_budgets, y_vals=norm_est_objectives)
                     bootstrap_curves.append(new_progress_curve)
@@ -736,7 +1065,8 @@ class ProblemSolver(object):
                     # ... else solution other than x0 or x*.
                     else:
                         # Uniformly resample N postreps (with replacement) from 0, 1, ..., N-1.
-                        bs_postrep_idxs = bootstrap_rng.choices(range(self.n_postreps), k=self.n_postreps)
+                        n_postreps = len(self.all_post_replicates[mrep][budget])
+                        bs_postrep_idxs = bootstrap_rng.choices(range(n_postreps), k=n_postreps)
                         # Compute the mean of the resampled postreplications.
                         est_objectives.append(np.mean([self.all_post_replicates[mrep][budget][postrep] for postrep in bs_postrep_idxs]))
                         # Reset subsubstream if using CRN across budgets.
@@ -752,7 +1082,7 @@ class ProblemSolver(object):
                     bootstrap_rng.advance_subsubstream()
                 # Record objective or progress curve.
                 if normalize:
-                    frac_intermediate_budgets = [budget / self.problem.factors["budget"] for budget in self.all_intermediate_budgets[mrep]]
+                    frac_intermediate_budgets = [budget / self.problem.budget_limit() for budget in self.all_intermediate_budgets[mrep]]
                     norm_est_objectives = [(est_objective - bs_optimal_obj_val) / bs_initial_opt_gap for est_objective in est_objectives]
                     new_progress_curve = Curve(x_vals=frac_intermediate_budgets, y_vals=norm_est_objectives)
                     bootstrap_curves.append(new_progress_curve)
@@ -766,7 +1096,9 @@ class ProblemSolver(object):
         """
         attributes = ["n_macroreps",
                       "all_recommended_xs",
-                      "all_intermediate_budgets"]
+                      "all_intermediate_budgets",
+                      "racing_stopped",
+                      "precision_checkpoints"]
         for attribute in attributes:
             try:
                 delattr(self, attribute)
@@ -780,6 +1112,9 @@ class ProblemSolver(object):
         attributes = ["n_postreps",
                       "crn_across_budget",
                       "crn_across_macroreps",
+                      "se_tol",
+                      "max_postreps",
+                      "all_n_postreps",
                       "all_post_replicates",
                       "all_est_objectives"]
         for attribute in attributes:
@@ -865,7 +1200,9 @@ class ProblemSolver(object):
             # Display macroreplication information.
             file.write(f"{self.n_macroreps} macroreplications were run.\n")
             # If results have been postreplicated, list the number of post-replications.
-            if self.check_postreplicate():
+            if self.check_postreplicate() and getattr(self, "se_tol", None) is not None:
+                file.write(f"{self.n_postreps} to {self.max_postreps} postreplications were run at each recommended solution, targeting a standard error of {self.se_tol}.\n\n")
+            elif self.check_postreplicate():
                 file.write(f"{self.n_postreps} postreplications were run at each recommended solution.\n\n")
             # If post-normalized, state initial solution (x0) and proxy optimal solution (x_star)
             # and how many replications were taken of them (n_postreps_init_opt).
@@ -889,6 +1226,11 @@ class ProblemSolver(object):
                     if self.check_postreplicate():
                         file.write(f"\tEstimated Objective: {round(self.all_est_objectives[mrep][budget], 4)}\n")
                 # file.write(f"\tThe time taken to complete this macroreplication was {round(self.timings[mrep], 2)} s.\n")
+            # Display profiling results aggregated over macroreplications.
+            if getattr(self, "profiler", None) is not None:
+                file.write("\nProfile (all macroreplications):\n")
+                for line in self.profiler.report():
+                    file.write(f"\t{line}\n")
         file.close()
 
 class ProblemSolverIT(object):
@@ -918,8 +1260,9 @@ class ProblemSolverIT(object):
     crn_across_macroreps : bool
         True if CRN used for post-replications at solutions recommended on
         different macroreplications, otherwise False.
-    all_post_replicates : list [list [list]]
-        All post-replicates from all solutions from all macroreplications.
+    all_post_replicates : list [``numpy.ndarray``]
+        All post-replicates from all solutions from all macroreplications
+        (one budget x postrep array per macroreplication).
     all_est_objectives : numpy array [numpy array]
         Estimated objective values of all solutions from all macroreplications.
     n_postreps_init_opt : int
@@ -1100,9 +1443,11 @@ class ProblemSolverIT(object):
         # Set progenitor_rngs and rng_list for solver.
         self.solver.solution_progenitor_rngs = progenitor_rngs
         self.solver.rng_list = solver_rngs
+        self.solver.macrorep = mrep
 
         # print([rng.s_ss_sss_index for rng in progenitor_rngs])
         # Run the solver on the problem.
+        self.problem.reset_clock()
         tic = time.perf_counter()
         recommended_solns, intermediate_budgets = self.solver.solve(problem=self.problem)
         toc = time.perf_counter()
@@ -1152,31 +1497,41 @@ class ProblemSolverIT(object):
         self.crn_across_budget = crn_across_budget
         self.crn_across_macroreps = crn_across_macroreps
         # Initialize variables
-        self.all_post_replicates = [None] * self.n_macroreps
-        for mrep in range(self.n_macroreps):
-            self.all_post_replicates[mrep] = [] * len(self.all_intermediate_budgets[mrep])
         self.timings = [None] * self.n_macroreps
+        # Workers write the post-replicates into a shared (mrep x budget x postrep)
+        # array, padded with NaN where a macroreplication has fewer budgets.
+        n_budgets = [len(self.all_intermediate_budgets[mrep]) for mrep in range(self.n_macroreps)]
+        shape = (self.n_macroreps, max(n_budgets), n_postreps)
+        shared_array = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * np.dtype(float).itemsize, 1))
+        self.shared_post_replicates = {"name": shared_array.name, "shape": shape}
 
         self.function_start = time.time()
 
         print("Starting postreplications in parallel")
-        with Pool(processes=7) as process_pool:
-            # Start the macroreplications in parallel (async)
-            result = process_pool.map_async(self.post_replicate_multithread, range(self.n_macroreps))
-            # Wait for the results to be returned (or 1 second)
-            while (not result.ready()):
-                # Update status bar here
-                result.wait(1)
-
-            # Grab all the data out of the result
-            for mrep in range(self.n_macroreps):
-                self.all_post_replicates[mrep], self.timings[mrep] = result.get()[mrep]
-
-            # # The all post replicates is tricky because it is a dictionary of lists of lists
-            # # We need to convert it to a list of lists of lists
-            # self.all_post_replicates = [self.all_post_replicates[i] for i in range(len(self.all_post_replicates.keys()))]
-            # Store estimated objective for each macrorep for each budget.
-            self.all_est_objectives = [[np.mean(self.all_post_replicates[mrep][budget_index]) for budget_index in range(len(self.all_intermediate_budgets[mrep]))] for mrep in range(self.n_macroreps)]
+        post_replicates = np.ndarray(shape, dtype=float, buffer=shared_array.buf)
+        post_replicates.fill(np.nan)
+        try:
+            with Pool(processes=7) as process_pool:
+                # Start the macroreplications in parallel (async)
+                result = process_pool.map_async(self.post_replicate_multithread, range(self.n_macroreps))
+                # Wait for the results to be returned (or 1 second)
+                while (not result.ready()):
+                    # Update status bar here
+                    result.wait(1)
+
+                # Grab the runtimes out of the result
+                for mrep in range(self.n_macroreps):
+                    _, self.timings[mrep] = result.get()[mrep]
+        finally:
+            del self.shared_post_replicates
+            shared_array.unlink()
+        # Copy the post-replicates out of the shared block before releasing it.
+        post_replicates = np.array(post_replicates)
+        shared_array.close()
+        # Store estimated objective for each macrorep for each budget.
+        est_objectives = post_replicates.mean(axis=-1)
+        self.all_post_replicates = [post_replicates[mrep, :n_budgets[mrep]] for mrep in range(self.n_macroreps)]
+        self.all_est_objectives = [est_objectives[mrep, :n_budgets[mrep]] for mrep in range(self.n_macroreps)]
         print("Finished running {} postreplications in {} seconds.".format(self.n_macroreps, round(time.time() - self.function_start, 3)))
 
         # Delete stuff we don't need to save
@@ -1196,8 +1551,8 @@ class ProblemSolverIT(object):
 
         tic = time.perf_counter()
 
-        # Create an empty list for each budget
-        post_replicates = []
+        # Create a row of post-replicates for each budget
+        post_replicates = np.empty((len(self.all_intermediate_budgets[mrep]), self.n_postreps))
         # Loop over all recommended solutions.
         for budget_index in range(len(self.all_intermediate_budgets[mrep])):
             x = self.all_recommended_xs[mrep][budget_index]
@@ -1211,11 +1566,17 @@ class ProblemSolverIT(object):
                 fresh_soln.attach_rngs(rng_list=baseline_rngs, copy=False)
             self.problem.simulate(solution=fresh_soln, m=self.n_postreps)
             # Store results
-            post_replicates.append(list(fresh_soln.objectives[:fresh_soln.n_reps][:, 0]))  # 0 <- assuming only one objective
+            post_replicates[budget_index] = fresh_soln.objectives[:fresh_soln.n_reps, 0]  # 0 <- assuming only one objective
         toc = time.perf_counter()
         runtime = toc - tic
         print(f"\t{mrep + 1}: Finished in {round(runtime, 3)} seconds")
 
+        # Write the results into the shared array of the parent (if any),
+        # rather than returning them through the pool.
+        shared = getattr(self, "shared_post_replicates", None)
+        if shared is not None:
+            write_shared_rows(shared, mrep - shared.get("first", 0), post_replicates)
+            post_replicates = None
         # Return tuple (post_replicates, runtime)
         return (post_replicates, runtime)
 
@@ -1314,7 +1675,7 @@ class ProblemSolverIT(object):
                         est_objectives.append(np.mean([self.all_post_replicates[mrep][budget][postrep] for postrep in bs_postrep_idxs]))
                 # Record objective or progress curve.
                 if normalize:
-                    frac_intermediate_budgets = [budget / self.problem.factors["budget"] for budget in self.all_intermediate_budgets[mrep]]
+                    frac_intermediate_budgets = [budget / self.problem.budget_limit() for budget in self.all_intermediate_budgets[mrep]]
                     norm_est_objectives = [(est_objective - bs_optimal_obj_val) / bs_initial_opt_gap for est_objective in est_objectives]
                     new_progress_curve = Curve(x_vals=frac_intermediate_budgets, y_vals=norm_est_objectives)
                     bootstrap_curves.append(new_progress_curve)
@@ -1353,7 +1714,7 @@ class ProblemSolverIT(object):
                     bootstrap_rng.advance_subsubstream()
                 # Record objective or progress curve.
                 if normalize:
-                    frac_intermediate_budgets = [budget / self.problem.factors["budget"] for budget in self.all_intermediate_budgets[mrep]]
+                    frac_intermediate_budgets = [budget / self.problem.budget_limit() for budget in self.all_intermediate_budgets[mrep]]
                     norm_est_objectives = [(est_objective - bs_optimal_obj_val) / bs_initial_opt_gap for est_objective in est_objectives]
                     new_progress_curve = Curve(x_vals=frac_intermediate_budgets, y_vals=norm_est_objectives)
                     bootstrap_curves.append(new_progress_curve)
@@ -1493,9 +1854,36 @@ class ProblemSolverIT(object):
         file.close()
 
 
+def write_shared_rows(shared: dict, mrep: int, rows: np.ndarray):
+    """Write the rows of one macroreplication into a shared (mrep x row x column) array.
+
+    Parameters
+    ----------
+    shared : dict
+        "name" of the ``multiprocessing.shared_memory.SharedMemory`` block
+        and "shape" of the float array stored in it.
+    mrep : int
+        Index of the macroreplication in the shared array.
+    rows : ``numpy.ndarray``
+        Rows to write, starting with the first row of the macroreplication.
+    """
+    block = shared_memory.SharedMemory(name=shared["name"])
+    try:
+        array = np.ndarray(shared["shape"], dtype=float, buffer=block.buf)
+        array[mrep, :rows.shape[0]] = rows
+        del array
+    finally:
+        block.close()
+
+
 def trim_solver_results(problem: "Problem", recommended_solns: list["Solution"], intermediate_budgets: list[int]) -> tuple[list["Solution"], list[int]]:
     """Trim solutions recommended by solver after problem's max budget.
 
+    Notes
+    -----
+    Intermediate budgets are replications or, in time-budget mode, seconds
+    spent simulating (see ``base.Problem.budget_limit``).
+
     Parameters
     ----------
     problem : ``base.Problem``
@@ -1513,16 +1901,16 @@ def trim_solver_results(problem: "Problem", recommended_solns: list["Solution"],
         Intermediate budgets at which solver recommended different solutions after trimming.
     """
     # Remove solutions corresponding to intermediate budgets exceeding max budget.
-    invalid_idxs = [idx for idx, element in enumerate(intermediate_budgets) if element > problem.factors["budget"]]
+    invalid_idxs = [idx for idx, element in enumerate(intermediate_budgets) if element > problem.budget_limit()]
     for invalid_idx in sorted(invalid_idxs, reverse=True):
         del recommended_solns[invalid_idx]
         del intermediate_budgets[invalid_idx]
     # If no solution is recommended at the final budget,
     # re-recommend the latest recommended solution.
     # (Necessary for clean plotting of progress curves.)
-    if intermediate_budgets[-1] < problem.factors["budget"]:
+    if intermediate_budgets[-1] < problem.budget_limit():
         recommended_solns.append(recommended_solns[-1])
-        intermediate_budgets.append(problem.factors["budget"])
+        intermediate_budgets.append(problem.budget_limit())
     return recommended_solns, intermediate_budgets
 
 def trim_solver_results_it(iteration_num: list[int], problem: "Problem", recommended_solns: list["Solution"], intermediate_budgets: list[int]) -> tuple[list["Solution"], list[int]]:
@@ -1545,16 +1933,16 @@ def trim_solver_results_it(iteration_num: list[int], problem: "Problem", recomme
         Intermediate budgets at which solver recommended different solutions after trimming.
     """
     # Remove solutions corresponding to intermediate budgets exceeding max budget.
-    invalid_idxs = [idx for idx, element in enumerate(intermediate_budgets) if element > problem.factors["budget"]]
+    invalid_idxs = [idx for idx, element in enumerate(intermediate_budgets) if element > problem.budget_limit()]
     for invalid_idx in sorted(invalid_idxs, reverse=True):
         del recommended_solns[invalid_idx]
         del intermediate_budgets[invalid_idx]
     # If no solution is recommended at the final budget,
     # re-recommend the latest recommended solution.
     # (Necessary for clean plotting of progress curves.)
-    if intermediate_budgets[-1] < problem.factors["budget"]:
+    if intermediate_budgets[-1] < problem.budget_limit():
         recommended_solns.append(recommended_solns[-1])
-        intermediate_budgets.append(problem.factors["budget"])
+        intermediate_budgets.append(problem.budget_limit())
     return recommended_solns, intermediate_budgets
 
 def read_experiment_results(file_name_path: str) -> "ProblemSolver":
@@ -1679,7 +2067,7 @@ def post_normalize(experiments: list["ProblemSolver"], n_postreps_init_opt: int,
             best_est_objectives[experiment_idx] = np.max(exp_best_est_objectives)
         best_experiment_idx = np.argmax(best_est_objectives)
         best_experiment = experiments[best_experiment_idx]
-        best_exp_best_est_objectives = np.zeros(experiment.n_macroreps)
+        best_exp_best_est_objectives = np.zeros(best_experiment.n_macroreps)
         for mrep in range(best_experiment.n_macroreps):
             best_exp_best_est_objectives[mrep] = np.max(best_experiment.problem.minmax[0] * np.array(best_experiment.all_est_objectives[mrep]))
         best_mrep = np.argmax(best_exp_best_est_objectives)
@@ -1720,7 +2108,7 @@ def post_normalize(experiments: list["ProblemSolver"], n_postreps_init_opt: int,
             experiment.objective_curves.append(Curve(x_vals=experiment.all_intermediate_budgets[mrep], y_vals=est_objectives))
             # Normalize by initial optimality gap.
             norm_est_objectives = [(est_objective - opt_obj_val) / initial_opt_gap for est_objective in est_objectives]
-            frac_intermediate_budgets = [budget / experiment.problem.factors["budget"] for budget in experiment.all_intermediate_budgets[mrep]]
+            frac_intermediate_budgets = [budget / experiment.problem.budget_limit() for budget in experiment.all_intermediate_budgets[mrep]]
             experiment.progress_curves.append(Curve(x_vals=frac_intermediate_budgets, y_vals=norm_est_objectives))
         # Save ProblemSolver object to .pickle file.
         experiment.record_experiment_results()
@@ -1948,6 +2336,7 @@ def compute_bootstrap_CI(observations: list, conf_level: float, bias_correction:
     bs_CI_upper_bound : float
         Upper bound of bootstrap CI.
     """
+    from scipy.stats import norm
     # Compute bootstrapping confidence interval via percentile method.
     # See Efron (1981) "Nonparameteric Standard Errors and Confidence Intervals."
     if bias_correction:
@@ -1977,6 +2366,7 @@ def plot_bootstrap_CIs(bs_CI_lower_bounds: "Curve", bs_CI_upper_bounds: "Curve",
     color_str : str, default="C0"
         String indicating line color, e.g., "C0", "C1", etc.
     """
+    import matplotlib.pyplot as plt
     bs_CI_lower_bounds.plot(color_str=color_str, curve_type="conf_bound")
     bs_CI_upper_bounds.plot(color_str=color_str, curve_type="conf_bound")
     # Shade space between curves.
@@ -2004,6 +2394,7 @@ def report_max_halfwidth(curve_pairs: list[list["Curve"]], normalize: bool, conf
     difference : bool
         True if the plot is for difference profiles, otherwise False.
     """
+    import matplotlib.pyplot as plt
     # Compute max halfwidth of bootstrap confidence intervals.
     min_lower_bound = np.inf
     max_upper_bound = -np.inf
@@ -2083,6 +2474,7 @@ def plot_progress_curves(experiments: list["ProblemSolver"], plot_type: str, bet
     file_list : list [str]
         List compiling path names for plots produced.
     """
+    import matplotlib.pyplot as plt
     # Check if problems are the same with the same x0 and x*.
     check_common_problem_and_reference(experiments)
     file_list = []
@@ -2094,7 +2486,7 @@ def plot_progress_curves(experiments: list["ProblemSolver"], plot_type: str, bet
                    solver_name="SOLVER SET",
                    problem_name=ref_experiment.problem.name,
                    normalize=normalize,
-                   budget=ref_experiment.problem.factors["budget"],
+                   budget=ref_experiment.problem.budget_limit(),
                    beta=beta
                    )
         solver_curve_handles = []
@@ -2159,7 +2551,7 @@ def plot_progress_curves(experiments: list["ProblemSolver"], plot_type: str, bet
                        solver_name=experiment.solver.name,
                        problem_name=experiment.problem.name,
                        normalize=normalize,
-                       budget=experiment.problem.factors["budget"],
+                       budget=experiment.problem.budget_limit(),
                        beta=beta
                        )
             if plot_type == "all":
@@ -2244,6 +2636,7 @@ def plot_progress_curves_it(experiments: list["ProblemSolver"], plot_type: str,
     file_list : list [str]
         List compiling path names for plots produced.
     """
+    import matplotlib.pyplot as plt
     # Check if problems are the same with the same x0 and x*.
     check_common_problem_and_reference(experiments)
     file_list = []
@@ -2321,7 +2714,7 @@ def plot_progress_curves_it(experiments: list["ProblemSolver"], plot_type: str,
                        solver_name=experiment.solver.name,
                        problem_name=experiment.problem.name,
                        normalize=normalize,
-                       budget=experiment.problem.factors["budget"],
+                       budget=experiment.problem.budget_limit(),
                        beta=beta
                        )
             if plot_type == "all":
@@ -2395,6 +2788,7 @@ def plot_solvability_cdfs(experiments: list["ProblemSolver"], solve_tol: float =
     file_list : list [str]
         List compiling path names for plots produced.
     """
+    import matplotlib.pyplot as plt
     # Check if problems are the same with the same x0 and x*.
     check_common_problem_and_reference(experiments)
     file_list = []
@@ -2501,6 +2895,7 @@ def plot_area_scatterplots(experiments: list[list[ProblemSolver]], all_in_one: b
     file_list : list [str]
         List compiling path names for plots produced.
     """
+    import matplotlib.pyplot as plt
     file_list = []
     # Set up plot.
     n_solvers = len(experiments)
@@ -2653,6 +3048,7 @@ def plot_solvability_profiles(experiments: list[list["ProblemSolver"]], plot_typ
     file_list : list [str]
         List compiling path names for plots produced.
     """
+    import matplotlib.pyplot as plt
     file_list = []
     # Set up plot.
     n_solvers = len(experiments)
@@ -2924,6 +3320,9 @@ def plot_terminal_progress(experiments: list["ProblemSolver"], plot_type: str =
     file_list : list [str]
         List compiling path names for plots produced.
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    import pandas as pd
     # Check if problems are the same with the same x0 and x*.
     check_common_problem_and_reference(experiments)
     file_list = []
@@ -2935,7 +3334,7 @@ def plot_terminal_progress(experiments: list["ProblemSolver"], plot_type: str =
                    solver_name="SOLVER SET",
                    problem_name=ref_experiment.problem.name,
                    normalize=normalize,
-                   budget=ref_experiment.problem.factors["budget"]
+                   budget=ref_experiment.problem.budget_limit()
                    )
         # solver_curve_handles = []
         if normalize:
@@ -2967,7 +3366,7 @@ def plot_terminal_progress(experiments: list["ProblemSolver"], plot_type: str =
                        solver_name=experiment.solver.name,
                        problem_name=experiment.problem.name,
                        normalize=normalize,
-                       budget=experiment.problem.factors["budget"]
+                       budget=experiment.problem.budget_limit()
                        )
             if normalize:
                 terminal_data = [experiment.progress_curves[mrep].y_vals[-1] for mrep in range(experiment.n_macroreps)]
@@ -3009,6 +3408,7 @@ def plot_terminal_scatterplots(experiments: list[list["ProblemSolver"]], all_in_
     file_list : list [str]
         List compiling path names for plots produced.
     """
+    import matplotlib.pyplot as plt
     file_list = []
     # Set up plot.
     n_solvers = len(experiments)
@@ -3104,6 +3504,7 @@ def setup_plot(plot_type: str, solver_name: str = "SOLVER SET", problem_name: st
     solve_tol : float, optional
         Relative optimality gap definining when a problem is solved; in (0, 1].
     """
+    import matplotlib.pyplot as plt
     plt.figure()
     # Set up axes and axis labels.
     if normalize:
@@ -3218,6 +3619,7 @@ def save_plot(solver_name: str, problem_name: str, plot_type: str, normalize: bo
     path_name : str
         Path name pointing to location where plot will be saved.
     """
+    import matplotlib.pyplot as plt
     # Form string name for plot filename.
     if plot_type == "all":
         plot_name = "all_prog_curves"
@@ -3489,6 +3891,10 @@ class ProblemsSolvers(object):
     def run(self, n_macroreps: int):
         """Run `n_macroreps` of each solver on each problem.
 
+        Notes
+        -----
+        Problem-solver pairs stopped by ``race`` are not run again.
+
         Parameters
         ----------
         n_macroreps : int
@@ -3499,28 +3905,37 @@ class ProblemsSolvers(object):
                 experiment = self.experiments[solver_idx][problem_idx]
                 # If the problem-solver pair has not been run in this way before,
                 # run it now and save result to .pickle file.
-                if (getattr(experiment, "n_macroreps", None) != n_macroreps):
+                if (getattr(experiment, "n_macroreps", None) != n_macroreps and not getattr(experiment, "racing_stopped", False)):
                     print(f"Running {n_macroreps} macro-replications of {experiment.solver.name} on {experiment.problem.name}.")
                     experiment.clear_run()
                     experiment.run(n_macroreps)
         # Save ProblemsSolvers object to .pickle file.
         self.record_group_experiment_results()
 
-    def post_replicate(self, n_postreps: int, crn_across_budget: bool = True, crn_across_macroreps: bool = False):
+    def post_replicate(self, n_postreps: int, crn_across_budget: bool = True, crn_across_macroreps: bool = False, se_tol: Union[float, None] = None, max_postreps: Union[int, None] = None):
         """For each problem-solver pair, run postreplications at solutions
         recommended by the solver on each macroreplication.
 
         Parameters
         ----------
         n_postreps : int
-            Number of postreplications to take at each recommended solution.
+            Number of postreplications to take at each recommended solution
+            (min number if `se_tol` is given).
         crn_across_budget : bool, default=True
             True if CRN used for post-replications at solutions recommended at different times,
             otherwise False.
         crn_across_macroreps : bool, default=False
             True if CRN used for post-replications at solutions recommended on different
             macroreplications, otherwise False.
+        se_tol : float, optional
+            Target standard error of the estimated objective at each
+            recommended solution (see ``ProblemSolver.post_replicate``).
+        max_postreps : int, optional
+            Max number of postreplications at each recommended solution if
+            `se_tol` is given (default: 10 * `n_postreps`).
         """
+        if se_tol is not None and max_postreps is None:
+            max_postreps = 10 * n_postreps
         for solver_index in range(self.n_solvers):
             for problem_index in range(self.n_problems):
                 experiment = self.experiments[solver_index][problem_index]
@@ -3528,10 +3943,123 @@ class ProblemsSolvers(object):
                 # post-process it now.
                 if (getattr(experiment, "n_postreps", None) != n_postreps
                         or getattr(experiment, "crn_across_budget", None) != crn_across_budget
-                        or getattr(experiment, "crn_across_macroreps", None) != crn_across_macroreps):
+                        or getattr(experiment, "crn_across_macroreps", None) != crn_across_macroreps
+                        or getattr(experiment, "se_tol", None) != se_tol
+                        or getattr(experiment, "max_postreps", None) != (max_postreps if se_tol is not None else None)):
                     print(f"Post-processing {experiment.solver.name} on {experiment.problem.name}.")
                     experiment.clear_postreplicate()
-                    experiment.post_replicate(n_postreps, crn_across_budget, crn_across_macroreps)
+                    experiment.post_replicate(n_postreps, crn_across_budget, crn_across_macroreps, se_tol=se_tol, max_postreps=max_postreps)
+        # Save ProblemsSolvers object to .pickle file.
+        self.record_group_experiment_results()
+
+    def race(self, n_macroreps: int, n_postreps: int, wave_size: int = 5, min_macroreps: int = 10, metric: str = "terminal", conf_level: float = 0.95, n_bootstraps: int = 200, crn_across_budget: bool = True, crn_across_macroreps: bool = False):
+        """Run up to `n_macroreps` of each solver on each problem in waves,
+        stopping solvers that are statistically dominated on a problem.
+
+        Notes
+        -----
+        On each problem, every solver first runs (and post-replicates)
+        `min_macroreps` macroreplications, so no solver is judged on fewer;
+        bootstrap CIs of a mean over a handful of heavy-tailed performances
+        are unreliable. At each checkpoint, a bootstrap CI of the mean
+        performance over the macroreplications run so far is computed for
+        each of the k remaining solvers (see ``racing_metrics``), at level
+        1 - (1 - `conf_level`) / k. Solvers whose CI lies entirely below the
+        CI of another solver are stopped (``racing_stopped`` is set on their
+        experiments) and the others run another wave of `wave_size`
+        macroreplications, until they reach `n_macroreps`.
+
+        By the Bonferroni inequality, all k CIs of a checkpoint cover their
+        means with probability at least `conf_level` (up to the bootstrap's
+        approximation), and a solver can only be stopped wrongly if one of
+        them does not, so the error rate per checkpoint is at most
+        1 - `conf_level`. Over c checkpoints of a problem it is at most
+        c * (1 - `conf_level`); larger waves mean fewer checkpoints.
+
+        Stopped experiments keep their macroreplications; ``run`` and
+        ``post_replicate`` with the same settings do not redo them, so the
+        usual post-normalization and plots can follow. The checkpoints are
+        between waves of macroreplications: each macroreplication runs with
+        the full budget, since solvers adapt to the budget and their
+        recommendations during a run are not visible from outside.
+
+        Parameters
+        ----------
+        n_macroreps : int
+            Max number of macroreplications of each solver on each problem.
+        n_postreps : int
+            Number of postreplications to take at each recommended solution.
+        wave_size : int, default=5
+            Number of macroreplications added per solver between checkpoints.
+        min_macroreps : int, default=10
+            Min number of macroreplications of every solver before the first
+            checkpoint; at least 5.
+        metric : str, default="terminal"
+            Performance of a macroreplication:
+                "terminal" : estimated objective at the final recommended solution;
+
+                "area" : area under the estimated objective curve, with the
+                budget normalized to [0, 1].
+        conf_level : float, default=0.95
+            Simultaneous confidence level of the bootstrap CIs at each checkpoint; in (0, 1).
+        n_bootstraps : int, default=200
+            Number of bootstrap samples per CI.
+        crn_across_budget : bool, default=True
+            True if CRN used for post-replications at solutions recommended at different times,
+            otherwise False.
+        crn_across_macroreps : bool, default=False
+            True if CRN used for post-replications at solutions recommended on different
+            macroreplications, otherwise False.
+        """
+        if metric not in ("terminal", "area"):
+            print('--* Error: Racing metric must be "terminal" or "area". ')
+            print('--* Aborting. ')
+            return
+        if min_macroreps < 5 or wave_size < 1:
+            print('--* Error: Racing needs at least 5 macroreplications before the first checkpoint and a positive wave size. ')
+            print('--* Aborting. ')
+            return
+        self.racing_results = {}
+        for problem_idx in range(self.n_problems):
+            experiments = [self.experiments[solver_idx][problem_idx] for solver_idx in range(self.n_solvers)]
+            # Stream 1 is dedicated to bootstrapping (substream 0 is used by ``bootstrap_procedure``).
+            bootstrap_rng = MRG32k3a(s_ss_sss_index=[1, problem_idx + 1, 0])
+            contenders = list(range(self.n_solvers))
+            checkpoints = []
+            for solver_idx in contenders:
+                experiment = experiments[solver_idx]
+                print(f"Racing {experiment.solver.name} on {experiment.problem.name}: running {min(min_macroreps, n_macroreps)} macro-replications.")
+                experiment.clear_run()
+                experiment.run(min(min_macroreps, n_macroreps))
+                experiment.post_replicate(n_postreps, crn_across_budget, crn_across_macroreps)
+            while True:
+                # Compare the solvers at this checkpoint, with Bonferroni-adjusted CIs.
+                ci_level = 1 - (1 - conf_level) / len(contenders)
+                conf_ints = {}
+                for solver_idx in contenders:
+                    performances = racing_metrics(experiments[solver_idx], metric)
+                    conf_ints[solver_idx] = racing_conf_int(performances, bootstrap_rng, n_bootstraps, ci_level)
+                best_lower_bound = max(lower_bound for lower_bound, _ in conf_ints.values())
+                dominated = [solver_idx for solver_idx in contenders if conf_ints[solver_idx][1] < best_lower_bound]
+                checkpoints.append({"n_macroreps": {self.solver_names[solver_idx]: experiments[solver_idx].n_macroreps for solver_idx in contenders},
+                                    "ci_level": ci_level,
+                                    "conf_ints": {self.solver_names[solver_idx]: conf_ints[solver_idx] for solver_idx in contenders},
+                                    "stopped": [self.solver_names[solver_idx] for solver_idx in dominated]
+                                    })
+                for solver_idx in dominated:
+                    experiments[solver_idx].racing_stopped = True
+                    experiments[solver_idx].record_experiment_results()
+                    print(f"Racing on {self.problem_names[problem_idx]}: stopping {self.solver_names[solver_idx]} after {experiments[solver_idx].n_macroreps} macro-replications.")
+                contenders = [solver_idx for solver_idx in contenders if solver_idx not in dominated]
+                # Run another wave of the remaining solvers.
+                unfinished = [solver_idx for solver_idx in contenders if experiments[solver_idx].n_macroreps < n_macroreps]
+                if len(unfinished) == 0:
+                    break
+                for solver_idx in unfinished:
+                    experiments[solver_idx].add_macroreps(min(wave_size, n_macroreps - experiments[solver_idx].n_macroreps))
+            self.racing_results[self.problem_names[problem_idx]] = {"contenders": [self.solver_names[solver_idx] for solver_idx in contenders],
+                                                                    "checkpoints": checkpoints
+                                                                    }
         # Save ProblemsSolvers object to .pickle file.
         self.record_group_experiment_results()
 
@@ -3697,6 +4225,60 @@ class ProblemsSolvers(object):
                     csv_writer.writerow(print_list)
 
 
+def racing_metrics(experiment: "ProblemSolver", metric: str = "terminal") -> np.ndarray:
+    """Compute the performance of each macroreplication of a post-replicated
+    experiment, oriented so that larger is better.
+
+    Parameters
+    ----------
+    experiment : ``experiment_base.ProblemSolver``
+        Post-replicated problem-solver pair.
+    metric : str, default="terminal"
+        "terminal" for the estimated objective at the final recommended
+        solution, or "area" for the area under the estimated objective curve
+        (budget normalized to [0, 1]).
+
+    Returns
+    -------
+    ``numpy.ndarray``
+        Performance of each macroreplication times the problem's minmax.
+    """
+    performances = []
+    for mrep in range(experiment.n_macroreps):
+        est_objectives = experiment.all_est_objectives[mrep]
+        if metric == "terminal":
+            performances.append(est_objectives[-1])
+        else:
+            frac_intermediate_budgets = [budget / experiment.problem.budget_limit() for budget in experiment.all_intermediate_budgets[mrep]]
+            performances.append(Curve(x_vals=frac_intermediate_budgets, y_vals=est_objectives).compute_area_under_curve())
+    return experiment.problem.minmax[0] * np.array(performances)
+
+
+def racing_conf_int(performances: np.ndarray, bootstrap_rng: "MRG32k3a", n_bootstraps: int, conf_level: float) -> tuple[float, float]:
+    """Construct a bootstrap CI for the mean performance over macroreplications.
+
+    Parameters
+    ----------
+    performances : ``numpy.ndarray``
+        Performance of each macroreplication.
+    bootstrap_rng : ``mrg32k3a.mrg32k3a.MRG32k3a``
+        Random number generator to use for bootstrapping.
+    n_bootstraps : int
+        Number of bootstrap samples.
+    conf_level : float
+        Confidence level of the CI; in (0, 1).
+
+    Returns
+    -------
+    tuple [float, float]
+        Lower and upper bound of the CI.
+    """
+    n_macroreps = len(performances)
+    bootstrap_means = [np.mean(performances[bootstrap_rng.choices(range(n_macroreps), k=n_macroreps)]) for _ in range(n_bootstraps)]
+    bootstrap_rng.advance_subsubstream()
+    return compute_bootstrap_CI(bootstrap_means, conf_level=conf_level, bias_correction=False)
+
+
 def read_group_experiment_results(file_name_path: str) -> "ProblemsSolvers":
     """Read in ``experiment_base.ProblemsSolvers`` object from .pickle file.
 
@@ -3819,9 +4401,9 @@ def create_design(name: str, factor_headers: list[str], factor_settings_filename
     fixed_factors : dict
         dict of fixed factor values that are different that defaults.
     n_stacks : int, default = 1
-        number of stacks for ruby calculation.
+        number of stacked NOLH designs.
     design_type : str, default = 'nolhs'
-        design type for ruby calculation.
+        design type (only 'nolhs' is supported).
     cross_design_factors : dict, default = None
         dict of lists of values of factors to include in cross design.
 
@@ -3842,84 +4424,205 @@ def create_design(name: str, factor_headers: list[str], factor_settings_filename
     if cross_design_factors is None:
         cross_design_factors = {}
 
-    print('design object', design_object)
-    # Create solver factor design from .txt file of factor settings.
-    # Hard-coded for a single-stack NOLHS.
-    command = f"stack_{design_type}.rb -s {n_stacks} ./data_farming_experiments/{factor_settings_filename}.txt > ./data_farming_experiments/{factor_settings_filename}_design.txt"
-    os.system(command)
-    # Append design to base filename.
-    design_filename = f"{factor_settings_filename}_design"
-    # design_filename =  "astrodf_testing_design" # hard coded for now because can't find file location
-
-    # Read in design matrix from .txt file. Result is a pandas DataFrame.
-    design_table = pd.read_csv(f"./data_farming_experiments/{design_filename}.txt", header=None, delimiter="\t", encoding="utf-8")
-
-    # Create design csv file from design table.
-    csv_filename = f"./data_farming_experiments/{design_filename}.csv"
-
-    design_table.columns = factor_headers  # Add factor headers names to dt.
-
-    for factor in design_object.specifications:  # Add default values to str dict for unspecified factors.
+    if design_type != 'nolhs':
+        print(f'--* Error: Design type {design_type} is not supported. ')
+        print('--* Aborting. ')
+        return []
+    # Create factor design from .txt file of factor settings ("low high decimals" per factor).
+    lows, highs, decimals = nolhs.read_factor_settings(f"./data_farming_experiments/{factor_settings_filename}.txt")
+    design = nolhs.stack_nolhs(len(factor_headers), n_stacks)
+    columns = nolhs.scale_design(design, lows, highs, decimals)
+    # Convert each column to the datatype of its factor.
+    design_columns = {}
+    for factor, column in zip(factor_headers, columns):
+        factor_datatype = design_object.specifications[factor].get("datatype")
+        design_columns[factor] = [factor_datatype(value) for value in column.tolist()]
+    n_design_points = design.shape[0]
+
+    for factor in design_object.specifications:  # Add default values for unspecified factors.
         default = design_object.specifications[factor].get("default")
         if factor not in fixed_factors and factor not in factor_headers:
             fixed_factors[factor] = default
-            print('fixed factors', fixed_factors)
 
-    print('design table before fixed', design_table)
-    # Add fixed factors to dt.
-    for factor in fixed_factors:
-        design_table[factor] = str(fixed_factors[factor])  # Change to string to ensure correct addition of tuples & list data types.
+    # Add cross design factors: repeat the design for every combination of their values.
+    cross_factor_names = list(cross_design_factors.keys())
+    combinations = list(itertools.product(*(cross_design_factors[opt] for opt in cross_factor_names)))
 
-    # Add cross design factors to design table.
-    if len(cross_design_factors) != 0:
-        # num_cross = 0 # number of times cross design is run
+    # Create list of dicts of factor values for each dp.
+    design_list = []
+    for combination in combinations:
+        combination_dict = dict(zip(cross_factor_names, combination))
+        for dp in range(n_design_points):
+            dp_factors = {factor: design_columns[factor][dp] for factor in factor_headers}
+            # Copy so design points do not share mutable values (e.g., lists).
+            for factor in fixed_factors:
+                dp_factors[factor] = copy.deepcopy(fixed_factors[factor])
+            dp_factors.update(copy.deepcopy(combination_dict))
+            design_list.append(dp_factors)
+
+    # Record the design in a .csv file.
+    csv_filename = f"./data_farming_experiments/{factor_settings_filename}_design.csv"
+    with open(csv_filename, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        factor_names = list(design_list[0].keys()) if len(design_list) > 0 else list(factor_headers)
+        writer.writerow(['Design #'] + factor_names + ['Name', 'Design Type', 'Number Stacks'])
+        for dp, dp_factors in enumerate(design_list):
+            writer.writerow([dp] + [dp_factors[factor] for factor in factor_names] + [design_object.name, design_type, n_stacks])
 
-        # Create combination of categorical factor options.
-        cross_factor_names = list(cross_design_factors.keys())
-        combinations = itertools.product(*(cross_design_factors[opt] for opt in cross_factor_names))
+    return design_list
 
-        new_design_table = pd.DataFrame()  # Temp empty value.
-        for combination in combinations:
-            combination_dict = dict(zip(cross_factor_names, combination))  # Dictionary containing current combination of cross design factor values.
-            working_design_table = design_table.copy()
 
-            for factor in combination_dict:
-                str_factor_val = str(combination_dict[factor])
-                working_design_table[factor] = str_factor_val
+def run_design_task(task: tuple) -> dict:
+    """Run one macroreplication of one design point on one problem (or solver).
 
-            new_design_table = pd.concat([new_design_table, working_design_table], ignore_index=True)
+    Parameters
+    ----------
+    task : tuple
+        (design point index, design point factors, design type, name of the
+        designed solver or problem, name of its partner, macroreplication
+        index, number of postreplications at the final solution).
 
-        design_table = new_design_table
-    # Create list of solver or problem objects for each dp using design_table.
-    design_list = []
-    dp_dict = design_table.to_dict(orient='list')  # Creates dictonary of table to convert values to proper datatypes.
-    for dp in range(len(design_table)):
-        dp_factors = {}
-        for factor in dp_dict:
-            factor_datatype = design_object.specifications[factor].get("datatype")
-            factor_str = dp_dict[factor][dp]  # Get factor value for each factor within current design point.
-            # Set factor values to corret type.
-            if factor_datatype == int or float:
-                factor_val = factor_datatype(factor_str)
-            if factor_datatype == list:
-                factor_val = ast.literal_eval(factor_str)
-            if factor_datatype == tuple:
-                # tuple_str = tuple(factor_str[1:-1].split(","))
-                factor_val = ast.literal_eval(factor_str)
-            if factor_datatype == bool:
-                if factor_str == 'True':
-                    factor_val = True
-                else:
-                    factor_val = False
-            dp_factors[factor] = factor_val
-        design_list.append(dp_factors)
+    Returns
+    -------
+    result : dict
+        One row of the task table (see ``run_design``).
+    """
+    dp_index, dp_factors, design_type, name, partner_name, mrep, n_postreps = task
+    if design_type == "solver":
+        experiment = ProblemSolver(solver_name=name, problem_name=partner_name, solver_fixed_factors=dp_factors)
+    else:
+        # Split the design factors into problem and model factors.
+        problem_specifications = problem_directory[name]().specifications
+        problem_factors = {factor: value for factor, value in dp_factors.items() if factor in problem_specifications}
+        model_factors = {factor: value for factor, value in dp_factors.items() if factor not in problem_specifications}
+        experiment = ProblemSolver(solver_name=partner_name, problem_name=name, problem_fixed_factors=problem_factors, model_fixed_factors=model_factors)
+    # Attach the same solver RNGs as ``ProblemSolver.run``.
+    experiment.solver.attach_rngs([MRG32k3a(s_ss_sss_index=[2, i + 1, 0]) for i in range(3)])
+    recommended_xs, intermediate_budgets, runtime, _ = experiment.run_multithread(mrep)
+    terminal_objective = np.nan
+    if n_postreps > 0:
+        # Estimate the objective at the final solution with common random numbers
+        # across design points and macroreplications.
+        final_soln = Solution(recommended_xs[-1], experiment.problem)
+        final_soln.attach_rngs([MRG32k3a(s_ss_sss_index=[0, rng_index, 0]) for rng_index in range(experiment.problem.model.n_rngs)], copy=False)
+        experiment.problem.simulate(solution=final_soln, m=n_postreps)
+        terminal_objective = final_soln.objectives_mean[0]
+    return {"DesignPt#": dp_index, "Partner": partner_name, "MacroRep#": mrep, "Runtime": runtime,
+            "Final Budget": intermediate_budgets[-1], "Final Solution": str(tuple(recommended_xs[-1])),
+            "Terminal Objective": terminal_objective}
+
+
+def run_design(design_list: list[dict], name: str, partner_names: list[str], n_macroreps: int, design_type: str = "solver", n_postreps: int = 0, output_filename: str = "design_results", n_processes: Union[int, None] = None, resume: bool = True) -> dict:
+    """Run every design point of a solver (or problem) design on a list of
+    problems (or solvers) in parallel.
 
-    # Add design information to table.
-    design_table.insert(0, 'Design #', range(len(design_table)))
-    design_table['Name'] = design_object.name
-    design_table['Design Type'] = design_type
-    design_table['Number Stacks'] = str(n_stacks)
+    Notes
+    -----
+    Each (design point, partner, macroreplication) is a separate task in a
+    process pool. Results are appended to ``./experiments/logs/{output_filename}_tasks.csv``
+    as tasks finish; with `resume`, tasks already in that file are skipped.
+    The settings of the run are stored next to it in ``{output_filename}_tasks.json``,
+    and a run whose design, partners or postreplications differ refuses to resume.
+    Macroreplication `mrep` uses the same RNG streams as in ``ProblemSolver.run``,
+    so results do not depend on the order in which tasks run.
 
-    design_table.to_csv(csv_filename, mode='w', header=True, index=False)
+    Parameters
+    ----------
+    design_list : list [dict]
+        Factors of each design point, e.g., from ``create_design``.
+    name : str
+        Name of the designed solver (or problem).
+    partner_names : list [str]
+        Names of problems (or solvers) to pair with every design point.
+    n_macroreps : int
+        Number of macroreplications of each pair.
+    design_type : str, default="solver"
+        "solver" if the design is over solver factors, "problem" if over problem and model factors.
+    n_postreps : int, default=0
+        Number of postreplications taken at each final solution (none if 0).
+    output_filename : str, default="design_results"
+        Name of .csv files in ./experiments/logs.
+    n_processes : int, optional
+        Number of worker processes (default: all CPUs).
+    resume : bool, default=True
+        True if tasks recorded by an earlier run are to be skipped, otherwise False.
 
-    return design_list
+    Returns
+    -------
+    summary : dict [str, list]
+        Columns of the summary table, one row per design point and partner.
+    """
+    if design_type not in ("solver", "problem"):
+        print('--* Error: Design type must be "solver" or "problem". ')
+        print('--* Aborting. ')
+        return {}
+    file_path = "./experiments/logs/"
+    if not os.path.exists(file_path):
+        os.makedirs(file_path)
+    tasks_filename = f"{file_path}{output_filename}_tasks.csv"
+    fingerprint_filename = f"{file_path}{output_filename}_tasks.json"
+    task_headers = ["DesignPt#", "Partner", "MacroRep#", "Runtime", "Final Budget", "Final Solution", "Terminal Objective"]
+    # Settings that recorded tasks depend on. More macroreplications may be
+    # added on resume, but nothing else may change.
+    fingerprint = json.loads(json.dumps({"name": name, "design_type": design_type, "partner_names": list(partner_names),
+                                         "n_postreps": n_postreps, "design_list": design_list}, default=str))
+    # Find tasks completed by an earlier run.
+    completed = set()
+    if resume and os.path.exists(tasks_filename):
+        recorded_fingerprint = None
+        if os.path.exists(fingerprint_filename):
+            with open(fingerprint_filename) as fingerprint_file:
+                recorded_fingerprint = json.load(fingerprint_file)
+        if recorded_fingerprint != fingerprint:
+            mismatched = "all settings" if recorded_fingerprint is None else ", ".join(key for key in fingerprint if recorded_fingerprint.get(key) != fingerprint[key])
+            print(f'--* Error: Recorded tasks in {tasks_filename} were run with different settings ({mismatched}). ')
+            print('--* Use a different output_filename or resume=False. ')
+            print('--* Aborting. ')
+            return {}
+        with open(tasks_filename, newline="") as tasks_file:
+            for row in csv.DictReader(tasks_file):
+                completed.add((int(row["DesignPt#"]), row["Partner"], int(row["MacroRep#"])))
+    else:
+        with open(tasks_filename, mode="w", newline="") as tasks_file:
+            csv.writer(tasks_file).writerow(task_headers)
+        with open(fingerprint_filename, mode="w") as fingerprint_file:
+            json.dump(fingerprint, fingerprint_file, indent=1)
+    tasks = [(dp_index, dp_factors, design_type, name, partner_name, mrep, n_postreps)
+             for dp_index, dp_factors in enumerate(design_list)
+             for partner_name in partner_names
+             for mrep in range(n_macroreps)
+             if (dp_index, partner_name, mrep) not in completed]
+    print(f"Running {len(tasks)} tasks ({len(completed)} already completed).")
+    tic = time.time()
+    # Append each result as soon as its task finishes.
+    with Pool(processes=n_processes) as process_pool, open(tasks_filename, mode="a", newline="") as tasks_file:
+        writer = csv.DictWriter(tasks_file, fieldnames=task_headers)
+        for n_done, result in enumerate(process_pool.imap_unordered(run_design_task, tasks), start=1):
+            writer.writerow(result)
+            tasks_file.flush()
+            print(f"Finished task {n_done} of {len(tasks)} (design point {result['DesignPt#']}, {result['Partner']}, macroreplication {result['MacroRep#'] + 1}).")
+    print(f"Finished running {len(tasks)} tasks in {round(time.time() - tic, 3)} seconds.")
+
+    # Summarize the macroreplications of each design point and partner.
+    with open(tasks_filename, newline="") as tasks_file:
+        rows = list(csv.DictReader(tasks_file))
+    factor_names = list(design_list[0].keys()) if len(design_list) > 0 else []
+    summary = {column: [] for column in ["DesignPt#"] + factor_names + ["Partner", "MacroReps", "Mean Runtime", "Mean Final Budget", "Mean Terminal Objective", "Std Terminal Objective"]}
+    for dp_index, dp_factors in enumerate(design_list):
+        for partner_name in partner_names:
+            pair_rows = [row for row in rows if int(row["DesignPt#"]) == dp_index and row["Partner"] == partner_name]
+            terminal_objectives = np.array([float(row["Terminal Objective"]) for row in pair_rows])
+            summary["DesignPt#"].append(dp_index)
+            for factor in factor_names:
+                summary[factor].append(dp_factors[factor])
+            summary["Partner"].append(partner_name)
+            summary["MacroReps"].append(len(pair_rows))
+            summary["Mean Runtime"].append(np.mean([float(row["Runtime"]) for row in pair_rows]) if pair_rows else np.nan)
+            summary["Mean Final Budget"].append(np.mean([float(row["Final Budget"]) for row in pair_rows]) if pair_rows else np.nan)
+            summary["Mean Terminal Objective"].append(np.mean(terminal_objectives) if pair_rows else np.nan)
+            summary["Std Terminal Objective"].append(np.std(terminal_objectives, ddof=1) if len(pair_rows) > 1 else np.nan)
+    with open(f"{file_path}{output_filename}.csv", mode="w", newline="") as output_file:
+        csv_writer = csv.writer(output_file)
+        csv_writer.writerow(list(summary.keys()))
+        csv_writer.writerows(zip(*summary.values()))
+    return summary
@@ -8,13 +8,9 @@ for reading/writing data and plotting.
 from __future__ import annotations
 
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
-from scipy.stats import norm
 import pickle
+import copy
 import importlib
-import ast
 import time
 import os
 import csv
@@ -23,6 +19,7 @@ from typing import Union
 from mrg32k3a.mrg32k3a import MRG32k3a
 from multiprocessing import Pool
 
+from simopt import nolhs
 from simopt.base import Solution, Solver, Problem
 from simopt.directory import solver_directory, problem_directory, model_directory
 
@@ -150,6 +147,7 @@ class Curve(object):
         handle : list [``matplotlib.lines.Line2D``]
             Curve handle, to use when creating legends.
         """
+        import matplotlib.pyplot as plt
         if curve_type == "regular":
             linestyle = "-"
             linewidth = 2
@@ -507,9 +505,11 @@ class ProblemSolver(object):
         # Set progenitor_rngs and rng_list for solver.
         self.solver.solution_progenitor_rngs = progenitor_rngs
         self.solver.rng_list = solver_rngs
+        self.solver.macrorep = mrep
 
         # print([rng.s_ss_sss_index for rng in progenitor_rngs])
         # Run the solver on the problem.
+        self.problem.reset_clock()
         tic = time.perf_counter()
         recommended_solns, intermediate_budgets = self.solver.solve(problem=self.problem)
         toc = time.perf_counter()
@@ -717,7 +717,7 @@ class ProblemSolver(object):
                         est_objectives.append(np.mean([self.all_post_replicates[mrep][budget][postrep] for postrep in bs_postrep_idxs]))
                 # Record objective or progress curve.
                 if normalize:
-                    frac_intermediate_budgets = [budget / self.problem.factors["budget"] for budget in self.all_intermediate_budgets[mrep]]
+                    frac_intermediate_budgets = [budget / self.problem.budget_limit() for budget in self.all_intermediate_budgets[mrep]]
                     norm_est_objectives = [(est_objective - bs_optimal_obj_val) / bs_initial_opt_gap for est_objective in est_objectives]
                     new_progress_curve = Curve(x_vals=frac_intermediate_budgets, y_vals=norm_est_objectives)
                     bootstrap_curves.append(new_progress_curve)
@@ -756,7 +756,7 @@ class ProblemSolver(object):
                     bootstrap_rng.advance_subsubstream()
                 # Record objective or progress curve.
                 if normalize:
-                    frac_intermediate_budgets = [budget / self.problem.factors["budget"] for budget in self.all_intermediate_budgets[mrep]]
+                    frac_intermediate_budgets = [budget / self.problem.budget_limit() for budget in self.all_intermediate_budgets[mrep]]
                     norm_est_objectives = [(est_objective - bs_optimal_obj_val) / bs_initial_opt_gap for est_objective in est_objectives]
                     new_progress_curve = Curve(x_vals=frac_intermediate_budgets, y_vals=norm_est_objectives)
                     bootstrap_curves.append(new_progress_curve)
@@ -899,6 +899,11 @@ class ProblemSolver(object):
 def trim_solver_results(problem: "Problem", recommended_solns: list["Solution"], intermediate_budgets: list[int]) -> tuple[list["Solution"], list[int]]:
     """Trim solutions recommended by solver after problem's max budget.
 
+    Notes
+    -----
+    Intermediate budgets are replications or, in time-budget mode, seconds
+    spent simulating (see ``base.Problem.budget_limit``).
+
     Parameters
     ----------
     problem : ``base.Problem``
@@ -916,16 +921,16 @@ def trim_solver_results(problem: "Problem", recommended_solns: list["Solution"],
         Intermediate budgets at which solver recommended different solutions after trimming.
     """
     # Remove solutions corresponding to intermediate budgets exceeding max budget.
-    invalid_idxs = [idx for idx, element in enumerate(intermediate_budgets) if element > problem.factors["budget"]]
+    invalid_idxs = [idx for idx, element in enumerate(intermediate_budgets) if element > problem.budget_limit()]
     for invalid_idx in sorted(invalid_idxs, reverse=True):
         del recommended_solns[invalid_idx]
         del intermediate_budgets[invalid_idx]
     # If no solution is recommended at the final budget,
     # re-recommend the latest recommended solution.
     # (Necessary for clean plotting of progress curves.)
-    if intermediate_budgets[-1] < problem.factors["budget"]:
+    if intermediate_budgets[-1] < problem.budget_limit():
         recommended_solns.append(recommended_solns[-1])
-        intermediate_budgets.append(problem.factors["budget"])
+        intermediate_budgets.append(problem.budget_limit())
     return recommended_solns, intermediate_budgets
 
 
@@ -1092,7 +1097,7 @@ def post_normalize(experiments: list["ProblemSolver"], n_postreps_init_opt: int,
             experiment.objective_curves.append(Curve(x_vals=experiment.all_intermediate_budgets[mrep], y_vals=est_objectives))
             # Normalize by initial optimality gap.
             norm_est_objectives = [(est_objective - opt_obj_val) / initial_opt_gap for est_objective in est_objectives]
-            frac_intermediate_budgets = [budget / experiment.problem.factors["budget"] for budget in experiment.all_intermediate_budgets[mrep]]
+            frac_intermediate_budgets = [budget / experiment.problem.budget_limit() for budget in experiment.all_intermediate_budgets[mrep]]
             experiment.progress_curves.append(Curve(x_vals=frac_intermediate_budgets, y_vals=norm_est_objectives))
         # Save ProblemSolver object to .pickle file.
         experiment.record_experiment_results()
@@ -1320,6 +1325,7 @@ def compute_bootstrap_CI(observations: list, conf_level: float, bias_correction:
     bs_CI_upper_bound : float
         Upper bound of bootstrap CI.
     """
+    from scipy.stats import norm
     # Compute bootstrapping confidence interval via percentile method.
     # See Efron (1981) "Nonparameteric Standard Errors and Confidence Intervals."
     if bias_correction:
@@ -1349,6 +1355,7 @@ def plot_bootstrap_CIs(bs_CI_lower_bounds: "Curve", bs_CI_upper_bounds: "Curve",
     color_str : str, default="C0"
         String indicating line color, e.g., "C0", "C1", etc.
     """
+    import matplotlib.pyplot as plt
     bs_CI_lower_bounds.plot(color_str=color_str, curve_type="conf_bound")
     bs_CI_upper_bounds.plot(color_str=color_str, curve_type="conf_bound")
     # Shade space between curves.
@@ -1376,6 +1383,7 @@ def report_max_halfwidth(curve_pairs: list[list["Curve"]], normalize: bool, conf
     difference : bool
         True if the plot is for difference profiles, otherwise False.
     """
+    import matplotlib.pyplot as plt
     # Compute max halfwidth of bootstrap confidence intervals.
     min_lower_bound = np.inf
     max_upper_bound = -np.inf
@@ -1455,6 +1463,7 @@ def plot_progress_curves(experiments: list["ProblemSolver"], plot_type: str, bet
     file_list : list [str]
         List compiling path names for plots produced.
     """
+    import matplotlib.pyplot as plt
     # Check if problems are the same with the same x0 and x*.
     check_common_problem_and_reference(experiments)
     file_list = []
@@ -1466,7 +1475,7 @@ def plot_progress_curves(experiments: list["ProblemSolver"], plot_type: str, bet
                    solver_name="SOLVER SET",
                    problem_name=ref_experiment.problem.name,
                    normalize=normalize,
-                   budget=ref_experiment.problem.factors["budget"],
+                   budget=ref_experiment.problem.budget_limit(),
                    beta=beta
                    )
         solver_curve_handles = []
@@ -1531,7 +1540,7 @@ def plot_progress_curves(experiments: list["ProblemSolver"], plot_type: str, bet
                        solver_name=experiment.solver.name,
                        problem_name=experiment.problem.name,
                        normalize=normalize,
-                       budget=experiment.problem.factors["budget"],
+                       budget=experiment.problem.budget_limit(),
                        beta=beta
                        )
             if plot_type == "all":
@@ -1606,6 +1615,7 @@ def plot_solvability_cdfs(experiments: list["ProblemSolver"], solve_tol: float =
     file_list : list [str]
         List compiling path names for plots produced.
     """
+    import matplotlib.pyplot as plt
     # Check if problems are the same with the same x0 and x*.
     check_common_problem_and_reference(experiments)
     file_list = []
@@ -1712,6 +1722,7 @@ def plot_area_scatterplots(experiments: list[list[ProblemSolver]], all_in_one: b
     file_list : list [str]
         List compiling path names for plots produced.
     """
+    import matplotlib.pyplot as plt
     file_list = []
     # Set up plot.
     n_solvers = len(experiments)
@@ -1864,6 +1875,7 @@ def plot_solvability_profiles(experiments: list[list["ProblemSolver"]], plot_typ
     file_list : list [str]
         List compiling path names for plots produced.
     """
+    import matplotlib.pyplot as plt
     file_list = []
     # Set up plot.
     n_solvers = len(experiments)
@@ -2135,6 +2147,9 @@ def plot_terminal_progress(experiments: list["ProblemSolver"], plot_type: str =
     file_list : list [str]
         List compiling path names for plots produced.
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    import pandas as pd
     # Check if problems are the same with the same x0 and x*.
     check_common_problem_and_reference(experiments)
     file_list = []
@@ -2146,7 +2161,7 @@ def plot_terminal_progress(experiments: list["ProblemSolver"], plot_type: str =
                    solver_name="SOLVER SET",
                    problem_name=ref_experiment.problem.name,
                    normalize=normalize,
-                   budget=ref_experiment.problem.factors["budget"]
+                   budget=ref_experiment.problem.budget_limit()
                    )
         # solver_curve_handles = []
         if normalize:
@@ -2178,7 +2193,7 @@ def plot_terminal_progress(experiments: list["ProblemSolver"], plot_type: str =
                        solver_name=experiment.solver.name,
                        problem_name=experiment.problem.name,
                        normalize=normalize,
-                       budget=experiment.problem.factors["budget"]
+                       budget=experiment.problem.budget_limit()
                        )
             if normalize:
                 terminal_data = [experiment.progress_curves[mrep].y_vals[-1] for mrep in range(experiment.n_macroreps)]
@@ -2220,6 +2235,7 @@ def plot_terminal_scatterplots(experiments: list[list["ProblemSolver"]], all_in_
     file_list : list [str]
         List compiling path names for plots produced.
     """
+    import matplotlib.pyplot as plt
     file_list = []
     # Set up plot.
     n_solvers = len(experiments)
@@ -2315,6 +2331,7 @@ def setup_plot(plot_type: str, solver_name: str = "SOLVER SET", problem_name: st
     solve_tol : float, optional
         Relative optimality gap definining when a problem is solved; in (0, 1].
     """
+    import matplotlib.pyplot as plt
     plt.figure()
     # Set up axes and axis labels.
     if normalize:
@@ -2430,6 +2447,7 @@ def save_plot(solver_name: str, problem_name: str, plot_type: str, normalize: bo
     path_name : str
         Path name pointing to location where plot will be saved.
     """
+    import matplotlib.pyplot as plt
     # Form string name for plot filename.
     if plot_type == "all":
         plot_name = "all_prog_curves"
@@ -3031,9 +3049,9 @@ def create_design(name: str, factor_headers: list[str], factor_settings_filename
     fixed_factors : dict
         dict of fixed factor values that are different that defaults.
     n_stacks : int, default = 1
-        number of stacks for ruby calculation.
+        number of stacked NOLH designs.
     design_type : str, default = 'nolhs'
-        design type for ruby calculation.
+        design type (only 'nolhs' is supported).
     cross_design_factors : dict, default = None
         dict of lists of values of factors to include in cross design.
 
@@ -3054,84 +3072,49 @@ def create_design(name: str, factor_headers: list[str], factor_settings_filename
     if cross_design_factors is None:
         cross_design_factors = {}
 
-    print('design object', design_object)
-    # Create solver factor design from .txt file of factor settings.
-    # Hard-coded for a single-stack NOLHS.
-    command = f"stack_{design_type}.rb -s {n_stacks} ./data_farming_experiments/{factor_settings_filename}.txt > ./data_farming_experiments/{factor_settings_filename}_design.txt"
-    os.system(command)
-    # Append design to base filename.
-    design_filename = f"{factor_settings_filename}_design"
-    # design_filename =  "astrodf_testing_design" # hard coded for now because can't find file location
-
-    # Read in design matrix from .txt file. Result is a pandas DataFrame.
-    design_table = pd.read_csv(f"./data_farming_experiments/{design_filename}.txt", header=None, delimiter="\t", encoding="utf-8")
-
-    # Create design csv file from design table.
-    csv_filename = f"./data_farming_experiments/{design_filename}.csv"
-
-    design_table.columns = factor_headers  # Add factor headers names to dt.
-
-    for factor in design_object.specifications:  # Add default values to str dict for unspecified factors.
+    if design_type != 'nolhs':
+        print(f'--* Error: Design type {design_type} is not supported. ')
+        print('--* Aborting. ')
+        return []
+    # Create factor design from .txt file of factor settings ("low high decimals" per factor).
+    lows, highs, decimals = nolhs.read_factor_settings(f"./data_farming_experiments/{factor_settings_filename}.txt")
+    design = nolhs.stack_nolhs(len(factor_headers), n_stacks)
+    columns = nolhs.scale_design(design, lows, highs, decimals)
+    # Convert each column to the datatype of its factor.
+    design_columns = {}
+    for factor, column in zip(factor_headers, columns):
+        factor_datatype = design_object.specifications[factor].get("datatype")
+        design_columns[factor] = [factor_datatype(value) for value in column.tolist()]
+    n_design_points = design.shape[0]
+
+    for factor in design_object.specifications:  # Add default values for unspecified factors.
         default = design_object.specifications[factor].get("default")
         if factor not in fixed_factors and factor not in factor_headers:
             fixed_factors[factor] = default
-            print('fixed factors', fixed_factors)
-
-    print('design table before fixed', design_table)
-    # Add fixed factors to dt.
-    for factor in fixed_factors:
-        design_table[factor] = str(fixed_factors[factor])  # Change to string to ensure correct addition of tuples & list data types.
 
-    # Add cross design factors to design table.
-    if len(cross_design_factors) != 0:
-        # num_cross = 0 # number of times cross design is run
+    # Add cross design factors: repeat the design for every combination of their values.
+    cross_factor_names = list(cross_design_factors.keys())
+    combinations = list(itertools.product(*(cross_design_factors[opt] for opt in cross_factor_names)))
 
-        # Create combination of categorical factor options.
-        cross_factor_names = list(cross_design_factors.keys())
-        combinations = itertools.product(*(cross_design_factors[opt] for opt in cross_factor_names))
-
-        new_design_table = pd.DataFrame()  # Temp empty value.
-        for combination in combinations:
-            combination_dict = dict(zip(cross_factor_names, combination))  # Dictionary containing current combination of cross design factor values.
-            working_design_table = design_table.copy()
-
-            for factor in combination_dict:
-                str_factor_val = str(combination_dict[factor])
-                working_design_table[factor] = str_factor_val
-
-            new_design_table = pd.concat([new_design_table, working_design_table], ignore_index=True)
-
-        design_table = new_design_table
-    # Create list of solver or problem objects for each dp using design_table.
+    # Create list of dicts of factor values for each dp.
     design_list = []
-    dp_dict = design_table.to_dict(orient='list')  # Creates dictonary of table to convert values to proper datatypes.
-    for dp in range(len(design_table)):
-        dp_factors = {}
-        for factor in dp_dict:
-            factor_datatype = design_object.specifications[factor].get("datatype")
-            factor_str = dp_dict[factor][dp]  # Get factor value for each factor within current design point.
-            # Set factor values to corret type.
-            if factor_datatype == int or float:
-                factor_val = factor_datatype(factor_str)
-            if factor_datatype == list:
-                factor_val = ast.literal_eval(factor_str)
-            if factor_datatype == tuple:
-                # tuple_str = tuple(factor_str[1:-1].split(","))
-                factor_val = ast.literal_eval(factor_str)
-            if factor_datatype == bool:
-                if factor_str == 'True':
-                    factor_val = True
-                else:
-                    factor_val = False
-            dp_factors[factor] = factor_val
-        design_list.append(dp_factors)
-
-    # Add design information to table.
-    design_table.insert(0, 'Design #', range(len(design_table)))
-    design_table['Name'] = design_object.name
-    design_table['Design Type'] = design_type
-    design_table['Number Stacks'] = str(n_stacks)
-
-    design_table.to_csv(csv_filename, mode='w', header=True, index=False)
+    for combination in combinations:
+        combination_dict = dict(zip(cross_factor_names, combination))
+        for dp in range(n_design_points):
+            dp_factors = {factor: design_columns[factor][dp] for factor in factor_headers}
+            # Copy so design points do not share mutable values (e.g., lists).
+            for factor in fixed_factors:
+                dp_factors[factor] = copy.deepcopy(fixed_factors[factor])
+            dp_factors.update(copy.deepcopy(combination_dict))
+            design_list.append(dp_factors)
+
+    # Record the design in a .csv file.
+    csv_filename = f"./data_farming_experiments/{factor_settings_filename}_design.csv"
+    with open(csv_filename, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        factor_names = list(design_list[0].keys()) if len(design_list) > 0 else list(factor_headers)
+        writer.writerow(['Design #'] + factor_names + ['Name', 'Design Type', 'Number Stacks'])
+        for dp, dp_factors in enumerate(design_list):
+            writer.writerow([dp] + [dp_factors[factor] for factor in factor_names] + [design_object.name, design_type, n_stacks])
 
     return design_list
@@ -6,14 +6,310 @@ Max-Cut Problem using QAOA
 """
 from __future__ import annotations
 
+import threading
+
 import numpy as np
 import networkx as nx
-from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, execute, Aer
 from mrg32k3a.mrg32k3a import MRG32k3a
 
 from simopt.base import Model, Problem
 
 
+class QAOAStatevector(object):
+    """Statevector simulator of the QAOA circuit for Max-Cut.
+
+    Notes
+    -----
+    Simulates the same circuit as the ``"qasm_simulator"`` backend of
+    ``MAXCUT`` (Hadamard layer, then `p` cost and mixer layers) in
+    O(p * N * 2^N) time. Amplitudes are indexed as in qiskit, i.e., bit `i`
+    of the index is the value of qubit `i`. All buffers are allocated once,
+    so repeated evaluations do not allocate arrays of size 2^N.
+
+    Attributes
+    ----------
+    n_qubits : int
+        Number of qubits (nodes of the graph).
+    edges : list [tuple [int]]
+        Edges of the graph.
+    n_edges : int
+        Number of edges of the graph.
+    cut_sizes : ``numpy.ndarray``
+        Number of cut edges for each of the 2^N bitstrings.
+    costs : ``numpy.ndarray``
+        Weight of each edge in the cost operator.
+    cost_levels : ``numpy.ndarray``
+        Distinct eigenvalues of the cost operator sum_e cost_e Z_i Z_j.
+    level_index : ``numpy.ndarray``
+        Index into ``cost_levels`` for each of the 2^N bitstrings.
+    state : ``numpy.ndarray``
+        Amplitudes of the current state.
+    scratch : ``numpy.ndarray``
+        Work buffer of 2^N complex numbers.
+
+    Parameters
+    ----------
+    edges : list [tuple [int]]
+        Edges of the graph, with nodes labeled 0, ..., N - 1.
+    n_qubits : int
+        Number of nodes of the graph.
+    costs : list [float], optional
+        Weight of each edge in the cost operator (default 1 for every edge).
+    """
+    def __init__(self, edges: list, n_qubits: int, costs: list = None):
+        self.n_qubits = n_qubits
+        self.edges = [tuple(edge) for edge in edges]
+        self.n_edges = len(edges)
+        index = np.arange(2**n_qubits, dtype=np.int64)
+        self.cut_sizes = np.zeros(2**n_qubits, dtype=np.uint8 if self.n_edges < 256 else np.int64)
+        for i, j in edges:
+            self.cut_sizes += (((index >> i) ^ (index >> j)) & 1).astype(self.cut_sizes.dtype)
+        if costs is None:
+            # Z_i Z_j = -1 on cut edges, so bitstrings with c cut edges have eigenvalue |E| - 2c.
+            self.costs = np.ones(self.n_edges)
+            self.cost_levels = self.n_edges - 2.0 * np.arange(self.n_edges + 1)
+            self.level_index = self.cut_sizes
+        else:
+            self.costs = np.array(costs, dtype=float)
+            diagonal = np.zeros(2**n_qubits)
+            for (i, j), cost in zip(edges, self.costs):
+                diagonal += cost * (1 - 2 * (((index >> i) ^ (index >> j)) & 1))
+            self.cost_levels, self.level_index = np.unique(diagonal, return_inverse=True)
+            del diagonal
+        del index
+        self.state = np.empty(2**n_qubits, dtype=complex)
+        self.scratch = np.empty(2**n_qubits, dtype=complex)
+
+    def evolve(self, beta: np.ndarray, gamma: np.ndarray, shift: tuple = None) -> np.ndarray:
+        """Compute the state prepared by the QAOA circuit.
+
+        Parameters
+        ----------
+        beta : ``numpy.ndarray``
+            Mixer angles, one per layer.
+        gamma : ``numpy.ndarray``
+            Cost angles, one per layer.
+        shift : tuple, optional
+            (kind, layer, gate, delta): add delta to the angle of a single
+            gate, namely edge `gate` of the cost layer (kind "cost") or
+            qubit `gate` of the mixer layer (kind "mixer").
+
+        Returns
+        -------
+        ``numpy.ndarray``
+            Amplitudes (the ``state`` buffer, overwritten by the next call).
+        """
+        n = self.n_qubits
+        state = self.state
+        state.fill(1 / np.sqrt(2**n))
+        for layer in range(len(beta)):
+            # Cost layer: each edge contributes exp(-i gamma cost_e Z_i Z_j), and the
+            # cost operator takes few distinct values, so look the phases up.
+            phases = np.exp(-1j * gamma[layer] * self.cost_levels)
+            np.take(phases, self.level_index, out=self.scratch)
+            state *= self.scratch
+            if shift is not None and shift[:2] == ("cost", layer):
+                # Extra phase exp(-i delta cost_e Z_i Z_j) on the shifted edge.
+                i, j = self.edges[shift[2]]
+                tensor = state.reshape((2,) * n)
+                for bit_i in range(2):
+                    for bit_j in range(2):
+                        index = [slice(None)] * n
+                        index[n - 1 - i] = bit_i
+                        index[n - 1 - j] = bit_j
+                        tensor[tuple(index)] *= np.exp(-1j * shift[3] * self.costs[shift[2]] * (1 if bit_i == bit_j else -1))
+            # Mixer layer: rx(2 beta) = cos(beta) I - i sin(beta) X on every qubit.
+            for qubit in range(n):
+                angle = beta[layer]
+                if shift is not None and shift[:3] == ("mixer", layer, qubit):
+                    angle += shift[3]
+                c = np.cos(angle)
+                ms = -1j * np.sin(angle)
+                view = state.reshape(2**(n - qubit - 1), 2, 2**qubit)
+                a0 = view[:, 0, :]
+                a1 = view[:, 1, :]
+                t0, t1 = (half.reshape(a0.shape) for half in self.scratch.reshape(2, -1))
+                np.multiply(a0, c, out=t0)
+                np.multiply(a1, ms, out=t1)
+                t0 += t1
+                np.multiply(a1, c, out=t1)
+                np.multiply(a0, ms, out=a1)
+                a1 += t1
+                a0[...] = t0
+        return state
+
+    def probabilities(self, beta: np.ndarray, gamma: np.ndarray, shift: tuple = None) -> np.ndarray:
+        """Compute the probabilities of measuring each bitstring.
+
+        Parameters
+        ----------
+        beta : ``numpy.ndarray``
+            Mixer angles, one per layer.
+        gamma : ``numpy.ndarray``
+            Cost angles, one per layer.
+        shift : tuple, optional
+            Shifted gate (see ``evolve``).
+
+        Returns
+        -------
+        ``numpy.ndarray``
+            Probabilities (a view of the ``scratch`` buffer, overwritten by
+            the next call).
+        """
+        probabilities = self.scratch.view(np.float64)[:2**self.n_qubits]
+        np.abs(self.evolve(beta, gamma, shift), out=probabilities)
+        np.square(probabilities, out=probabilities)
+        return probabilities
+
+    def sample_cut_sizes(self, beta: np.ndarray, gamma: np.ndarray, u: np.ndarray, shift: tuple = None) -> np.ndarray:
+        """Measure the QAOA state once for each uniform in `u`.
+
+        Parameters
+        ----------
+        beta : ``numpy.ndarray``
+            Mixer angles, one per layer.
+        gamma : ``numpy.ndarray``
+            Cost angles, one per layer.
+        u : ``numpy.ndarray``
+            Standard uniform variates, one per shot.
+        shift : tuple, optional
+            Shifted gate (see ``evolve``).
+
+        Returns
+        -------
+        ``numpy.ndarray``
+            Number of cut edges of each measured bitstring.
+        """
+        cumulative = self.probabilities(beta, gamma, shift)
+        np.cumsum(cumulative, out=cumulative)
+        # Invert the cumulative distribution (normalized against rounding error).
+        outcomes = np.searchsorted(cumulative, np.asarray(u) * cumulative[-1], side="right")
+        return self.cut_sizes[np.minimum(outcomes, len(cumulative) - 1)]
+
+
+# Statevector simulator for the most recent graph in each thread (its buffers
+# are reused, so threads must not share it).
+statevector_cache = threading.local()
+
+
+def get_statevector(edges: list, n_qubits: int) -> QAOAStatevector:
+    """Return a statevector simulator for a graph, reusing the cached one
+    when the graph has not changed.
+
+    Parameters
+    ----------
+    edges : list [tuple [int]]
+        Edges of the graph, with nodes labeled 0, ..., N - 1.
+    n_qubits : int
+        Number of nodes of the graph.
+
+    Returns
+    -------
+    ``QAOAStatevector``
+        Simulator for the graph.
+    """
+    edges = [tuple(edge) for edge in edges]
+    statevector = getattr(statevector_cache, "statevector", None)
+    if statevector is None or statevector.n_qubits != n_qubits or statevector.edges != edges:
+        # Free the old buffers before allocating new ones.
+        statevector = statevector_cache.statevector = None
+        statevector = statevector_cache.statevector = QAOAStatevector(edges, n_qubits)
+    return statevector
+
+
+def get_qaoa_circuit(G: nx.Graph, beta: np.ndarray, gamma: np.ndarray, shift: tuple = None) -> "QuantumCircuit":
+    """Build the measured QAOA circuit for Max-Cut.
+
+    Parameters
+    ----------
+    G : ``networkx.Graph``
+        Graph to cut.
+    beta : ``numpy.ndarray``
+        Mixer angles, one per layer.
+    gamma : ``numpy.ndarray``
+        Cost angles, one per layer.
+    shift : tuple, optional
+        Gate whose angle is shifted: (kind, layer, gate, shift) with kind
+        "mixer" (gate = node) or "cost" (gate = edge index).
+
+    Returns
+    -------
+    ``qiskit.QuantumCircuit``
+        Circuit ending in a measurement of every qubit.
+    """
+    from qiskit import QuantumCircuit
+
+    def append_zz_term(qc, q1, q2, gamma):
+        qc.cx(q1, q2)
+        qc.rz(2 * gamma, q2)
+        qc.cx(q1, q2)
+
+    def get_cost_operator_circuit(G, gamma, shift=None):
+        N = G.number_of_nodes()
+        qc = QuantumCircuit(N, N)
+        for k, (i, j) in enumerate(G.edges()):
+            if shift is not None and shift[2] == k:
+                append_zz_term(qc, i, j, gamma + shift[3])
+            else:
+                append_zz_term(qc, i, j, gamma)
+        return qc
+
+    def append_x_term(qc, q1, beta):
+        qc.rx(2 * beta, q1)
+
+    def get_mixer_operator_circuit(G, beta, shift=None):
+        N = G.number_of_nodes()
+        qc = QuantumCircuit(N, N)
+        for n in G.nodes():
+            if shift is not None and shift[2] == n:
+                append_x_term(qc, n, beta + shift[3])
+            else:
+                append_x_term(qc, n, beta)
+        return qc
+
+    assert (len(beta) == len(gamma))
+    p = len(beta)  # infering number of QAOA steps from the parameters passed
+    N = G.number_of_nodes()
+    qc = QuantumCircuit(N, N)
+    # apply a layer of Hadamards
+    qc.h(range(N))
+    # apply p alternating operators
+    for i in range(p):
+        qc = qc.compose(get_cost_operator_circuit(G, gamma[i], shift if shift is not None and shift[:2] == ("cost", i) else None))
+        qc = qc.compose(get_mixer_operator_circuit(G, beta[i], shift if shift is not None and shift[:2] == ("mixer", i) else None))
+
+    # measure the result
+    qc.barrier(range(N))
+    qc.measure(range(N), range(N))
+    return qc
+
+
+def maxcut_obj(x: str, G: nx.Graph) -> int:
+    """Compute minus the number of edges cut by a bitstring (qubit `i` is character `i`)."""
+    cut = 0
+    for i, j in G.edges():
+        if x[i] != x[j]:
+            # the edge is cut
+            cut -= 1
+    return cut
+
+
+def compute_maxcut_energy(counts: dict, G: nx.Graph) -> float:
+    """Average the Max-Cut objective over measured bitstrings."""
+    energy = 0
+    total_counts = 0
+    for meas, meas_count in counts.items():
+        obj_for_meas = maxcut_obj(meas, G)
+        energy += obj_for_meas * meas_count
+        total_counts += meas_count
+    return energy / total_counts
+
+
+def invert_counts(counts: dict) -> dict:
+    """Reverse the bitstrings of qiskit counts, so qubit `i` is character `i`."""
+    return {k[::-1]: v for k, v in counts.items()}
+
+
 class MAXCUT(Model):
     """
     A model that simulates QAOA to solve Max-Cut problem
@@ -65,11 +361,35 @@ class MAXCUT(Model):
                 "description": "edges",
                 "datatype": list,
                 "default": [[0,1],[0,2],[1,4],[2,3],[2,5],[3,5]]
+            },
+            "backend": {
+                "description": "simulator: 'qasm_simulator' (qiskit Aer) or 'qaoa_numpy' (NumPy statevector)",
+                "datatype": str,
+                "default": "qasm_simulator"
+            },
+            "parameter_shift": {
+                "description": "estimate the gradient of the energy by the parameter-shift rule",
+                "datatype": bool,
+                "default": False
+            },
+            "shots": {
+                "description": "number of shots averaged in each replication",
+                "datatype": int,
+                "default": 5
+            },
+            "aer_single_job": {
+                "description": "run a batch of replications on Aer as one job of m * shots shots seeded once (results match single replications in distribution only)",
+                "datatype": bool,
+                "default": False
             }
         }
         self.check_factor_list = {
             "theta": self.check_theta,
-            "p": self.check_p
+            "p": self.check_p,
+            "backend": self.check_backend,
+            "parameter_shift": self.check_parameter_shift,
+            "shots": self.check_shots,
+            "aer_single_job": self.check_aer_single_job
         }
         # Set factors of the simulation model.
         super().__init__(fixed_factors)
@@ -80,6 +400,24 @@ class MAXCUT(Model):
     def check_p(self):
         return self.factors["p"] > 0
 
+    def check_backend(self):
+        return self.factors["backend"] in ("qasm_simulator", "qaoa_numpy")
+
+    def check_parameter_shift(self):
+        return isinstance(self.factors["parameter_shift"], bool)
+
+    def check_shots(self):
+        return self.factors["shots"] > 0
+
+    def check_aer_single_job(self):
+        return isinstance(self.factors["aer_single_job"], bool)
+
+    # Replications without gradients are run in batches (see replicate_batch_at).
+    batch_available = True
+
+    def shots_per_replication(self) -> int:
+        return self.factors["shots"]
+
     def replicate(self, rng_list: list["MRG32k3a"]) -> tuple[dict, dict]:
         """
         Simulate a single replication for the current model factors.
@@ -94,91 +432,178 @@ class MAXCUT(Model):
         responses : dict
             performance measures of interest
             "energy" = energy
+        gradients : dict of dicts
+            gradient estimates for each response (if "parameter_shift" is True)
+        """
+        return self.replicate_at({}, rng_list)
+
+    def replicate_at(self, factors: dict, rng_list: list["MRG32k3a"]) -> tuple[dict, dict]:
+        """
+        Simulate a single replication with some factors (e.g., theta) set to
+        given values, without changing the model's factors.
+
+        Arguments
+        ---------
+        factors : dict
+            values of factors that differ from the model's factors
+        rng_list : list of mrg32k3a.mrg32k3a.MRG32k3a objects
+            rngs for model to use when simulating a replication
+
+        Returns
+        -------
+        responses : dict
+            performance measures of interest
+            "energy" = energy
+        gradients : dict of dicts
+            gradient estimates for each response (if "parameter_shift" is True)
         """
         # Designate separate random number generators.
         # Outputs will be coupled when generating demand.
         X_rng = rng_list[0]
+        factors = {**self.factors, **factors}
 
-        p = self.factors["p"]
-        edges =self.factors["edges"]
+        p = factors["p"]
+        edges =factors["edges"]
 
         G = nx.Graph()
         G.add_edges_from(edges) 
-        
 
-        def append_zz_term(qc, q1, q2, gamma):
-            qc.cx(q1, q2)
-            qc.rz(2 * gamma, q2)
-            qc.cx(q1, q2)
+        theta = np.array(factors["theta"])
+        beta = theta[:p]
+        gamma = theta[p:]
+        shots = factors["shots"]
+
+        def draw_shifts():
+            # Parameter-shift rule: the gate exp(-i a P) with a = gamma (cost, P = Z_i Z_j)
+            # or a = beta (mixer, P = X_i) has d<H>/da = <H>(a + pi/4) - <H>(a - pi/4).
+            # Each parameter is shared by all gates of its layer, so one gate is
+            # drawn at random and its derivative is scaled by the number of gates
+            # (an unbiased estimate from 2 shifted circuits per parameter).
+            shifts = []
+            n_gates = []
+            for kind, n_layer_gates in (("mixer", G.number_of_nodes()), ("cost", G.number_of_edges())):
+                for layer in range(p):
+                    gate = min(int(X_rng.random() * n_layer_gates), n_layer_gates - 1)
+                    shifts += [(kind, layer, gate, np.pi / 4), (kind, layer, gate, -np.pi / 4)]
+                    n_gates.append(n_layer_gates)
+            return shifts, n_gates
+
+        def shift_gradients(energies, n_gates):
+            # Energies of the circuits from draw_shifts(), in order (+, -) per parameter.
+            theta_gradient = tuple(n * (energies[2 * k] - energies[2 * k + 1]) for k, n in enumerate(n_gates))
+            return {"energy": {"theta": theta_gradient}}
+
+        if factors["backend"] == "qaoa_numpy":
+            statevector = get_statevector(list(G.edges()), G.number_of_nodes())
+            cut_sizes = statevector.sample_cut_sizes(beta, gamma, [X_rng.random() for _ in range(shots)])
+            responses = {"energy": -np.mean(cut_sizes)}
+            gradients = {}
+            if factors["parameter_shift"]:
+                shifts, n_gates = draw_shifts()
+                energies = [-np.mean(statevector.sample_cut_sizes(beta, gamma, [X_rng.random() for _ in range(shots)], shift)) for shift in shifts]
+                gradients = shift_gradients(energies, n_gates)
+            return responses, gradients
+
+        from qiskit import execute, Aer
 
-        def get_cost_operator_circuit(G, gamma):
-            N = G.number_of_nodes()
-            qc = QuantumCircuit(N, N)
-            for i, j in G.edges():
-                append_zz_term(qc, i, j, gamma)
-            return qc
+        backend = Aer.get_backend('qasm_simulator')
+        qc = get_qaoa_circuit(G, beta, gamma)
 
-        def append_x_term(qc, q1, beta):
-            qc.rx(2 * beta, q1)
+        seed = X_rng.poissonvariate(200)
+        if not factors["parameter_shift"]:
+            counts = execute(qc, backend, seed_simulator=seed, shots = shots).result().get_counts()
+            energy = compute_maxcut_energy(invert_counts(counts), G)
+            gradients = {}
+        else:
+            # Submit the circuit and all shifted circuits as one job.
+            shifts, n_gates = draw_shifts()
+            circuits = [qc] + [get_qaoa_circuit(G, beta, gamma, shift) for shift in shifts]
+            result = execute(circuits, backend, seed_simulator=seed, shots = shots).result()
+            energies = [compute_maxcut_energy(invert_counts(result.get_counts(k)), G) for k in range(len(circuits))]
+            energy = energies[0]
+            gradients = shift_gradients(energies[1:], n_gates)
 
-        def get_mixer_operator_circuit(G, beta):
-            N = G.number_of_nodes()
-            qc = QuantumCircuit(N, N)
-            for n in G.nodes():
-                append_x_term(qc, n, beta)
-            return qc
-
-        def get_qaoa_circuit(G, beta, gamma):
-            assert (len(beta) == len(gamma))
-            p = len(beta)  # infering number of QAOA steps from the parameters passed
-            N = G.number_of_nodes()
-            qc = QuantumCircuit(N, N)
-            # apply a layer of Hadamards
-            qc.h(range(N))
-            # apply p alternating operators
-            for i in range(p):
-                qc = qc.compose(get_cost_operator_circuit(G, gamma[i]))
-                qc = qc.compose(get_mixer_operator_circuit(G, beta[i]))
-
-            # measure the result
-            qc.barrier(range(N))
-            qc.measure(range(N), range(N))
-            return qc
-
-        def maxcut_obj(x, G):
-            cut = 0
-            for i, j in G.edges():
-                if x[i] != x[j]:
-                    # the edge is cut
-                    cut -= 1
-            return cut
-
-        theta = np.array(self.factors["theta"])
+        responses = {"energy": energy}
+        return responses, gradients
 
-        backend = Aer.get_backend('qasm_simulator')
-        beta = theta[:p]
-        gamma = theta[p:]
-        qc = get_qaoa_circuit(G, beta, gamma)
+    def replicate_batch(self, rng_list: list["MRG32k3a"], m: int) -> dict:
+        return self.replicate_batch_at({}, rng_list, m)
 
-        counts = execute(qc, backend, seed_simulator=X_rng.poissonvariate(200), shots = 5).result().get_counts()
+    def replicate_batch_at(self, factors: dict, rng_list: list["MRG32k3a"], m: int) -> dict:
+        """
+        Simulate m replications of shots shots each and return the energy of
+        each replication (without gradients).
+
+        Notes
+        -----
+        With the "qaoa_numpy" backend, the state is evolved once and the
+        results equal those of m calls to ``replicate_at``. With the Aer
+        backend, each replication is a job seeded from its own subsubstream,
+        as in ``replicate_at``, so the results are the same too. If
+        "aer_single_job" is True, the m * shots shots are instead one job
+        seeded from the first replication's subsubstream: results then
+        match the single replications in distribution only and depend on
+        how replications are grouped into batches.
 
-        def compute_maxcut_energy(counts, G):
-            energy = 0
-            total_counts = 0
-            for meas, meas_count in counts.items():
-                obj_for_meas = maxcut_obj(meas, G)
-                energy += obj_for_meas * meas_count
-                total_counts += meas_count
-            return energy / total_counts
+        Arguments
+        ---------
+        factors : dict
+            values of factors that differ from the model's factors
+        rng_list : list of mrg32k3a.mrg32k3a.MRG32k3a objects
+            rngs for model to use when simulating the replications
+        m : int
+            number of replications
 
-        def invert_counts(counts):
-            return {k[::-1]: v for k, v in counts.items()}
+        Returns
+        -------
+        responses : dict
+            "energy" = energy of each replication (numpy.ndarray)
+        """
+        X_rng = rng_list[0]
+        factors = {**self.factors, **factors}
+        p = factors["p"]
+        G = nx.Graph()
+        G.add_edges_from(factors["edges"])
+        theta = np.array(factors["theta"])
+        beta = theta[:p]
+        gamma = theta[p:]
+        shots = factors["shots"]
 
-        energy = compute_maxcut_energy(invert_counts(counts), G)
+        if factors["backend"] == "qaoa_numpy":
+            # Draw the uniforms of each replication from its own subsubstream.
+            u = []
+            for _ in range(m):
+                u += [X_rng.random() for _ in range(shots)]
+                X_rng.advance_subsubstream()
+            statevector = get_statevector(list(G.edges()), G.number_of_nodes())
+            cut_sizes = statevector.sample_cut_sizes(beta, gamma, u).reshape(m, shots)
+            return {"energy": -np.mean(cut_sizes, axis=1)}
 
-        responses = {"energy": energy}
-        gradients = {}
-        return responses, gradients
+        from qiskit import execute, Aer
+
+        backend = Aer.get_backend('qasm_simulator')
+        qc = get_qaoa_circuit(G, beta, gamma)
+        if not factors["aer_single_job"]:
+            # One job per replication, seeded from its own subsubstream.
+            energies = np.empty(m)
+            for k in range(m):
+                seed = X_rng.poissonvariate(200)
+                counts = execute(qc, backend, seed_simulator=seed, shots=shots).result().get_counts()
+                energies[k] = compute_maxcut_energy(invert_counts(counts), G)
+                X_rng.advance_subsubstream()
+            return {"energy": energies}
+        seed = X_rng.poissonvariate(200)
+        for _ in range(m):
+            X_rng.advance_subsubstream()
+        memory = execute(qc, backend, seed_simulator=seed, shots=m * shots, memory=True).result().get_memory()
+        # Objective of each shot (bitstrings are reversed so qubit i is character i).
+        objectives = {}
+        shot_energies = np.empty(m * shots)
+        for k, meas in enumerate(memory):
+            if meas not in objectives:
+                objectives[meas] = maxcut_obj(meas[::-1], G)
+            shot_energies[k] = objectives[meas]
+        return {"energy": np.mean(shot_energies.reshape(m, shots), axis=1)}
 
 
 """
@@ -237,6 +662,8 @@ class MaxCutMinEnergy(Problem):
                 default initial solution from which solvers start
             budget : int > 0
                 max number of replications (fn evals) for a solver to take
+            time_budget : float >= 0
+                max seconds spent simulating for a solver to take (0 = off)
     specifications : dict
         details of each factor (for GUI, data validation, and defaults)
 
@@ -281,15 +708,23 @@ class MaxCutMinEnergy(Problem):
                 "description": "max # of replications for a solver to take",
                 "datatype": int,
                 "default": 5000
+            },
+            "time_budget": {
+                "description": "max seconds spent simulating for a solver to take (0 to count replications only)",
+                "datatype": (int, float),
+                "default": 0.0
             }
         }
         self.check_factor_list = {
             "initial_solution": self.check_initial_solution,
-            "budget": self.check_budget
+            "budget": self.check_budget,
+            "time_budget": self.check_time_budget
         }
         super().__init__(fixed_factors, model_fixed_factors)
         # Instantiate model with fixed factors and over-riden defaults.
         self.model = MAXCUT(self.model_fixed_factors)
+        # Gradient estimates are available if the model computes them.
+        self.gradient_available = self.model.factors["parameter_shift"]
         self.dim = len(self.factors["initial_solution"])
         self.lower_bounds = (-np.inf,) * self.dim
         self.upper_bounds = (np.inf,) * self.dim
@@ -349,6 +784,24 @@ class MaxCutMinEnergy(Problem):
         objectives = (response_dict["energy"],)
         return objectives
 
+    def response_dict_to_objectives_gradients(self, response_dict):
+        """
+        Convert a dictionary with response keys to a vector
+        of gradients.
+
+        Arguments
+        ---------
+        response_dict : dictionary
+            dictionary with response keys and associated gradient vectors
+
+        Returns
+        -------
+        objectives_gradients : tuple
+            vector of gradients of objectives
+        """
+        objectives_gradients = (response_dict["energy"],)
+        return objectives_gradients
+
     def get_random_solution(self, rand_sol_rng):
         """
         Generate a random solution for starting or restarting solvers.
@@ -0,0 +1,248 @@
+"""
+Summary
+-------
+Energy and variance landscapes of QAOA for Max-Cut over a grid of
+parameters theta = (beta, gamma), for figures.
+
+The grid is evaluated in vectorized chunks of exact statevector
+probabilities times a table of cut values, optionally split across
+processes, and cached as .npz files keyed by (edges, costs, p, grid,
+bit order).
+
+Bitstrings are indexed as in qiskit (qubit `i` is bit `i`) and node `i`
+is qubit `i`, as in ``MAXCUT``. Figure 7 was first drawn from qiskit
+count strings without inverting them, which reads node `i` from qubit
+N - 1 - i; ``reverse_bits`` reproduces that convention.
+"""
+from __future__ import annotations
+
+import os
+import hashlib
+from multiprocessing import Pool
+
+import numpy as np
+import networkx as nx
+
+
+def theta_grid(axes: list) -> np.ndarray:
+    """Form the Cartesian product of grids of each parameter.
+
+    Parameters
+    ----------
+    axes : list [``numpy.ndarray``]
+        Values of each of the 2p parameters (beta_1, ..., beta_p, gamma_1, ..., gamma_p).
+
+    Returns
+    -------
+    ``numpy.ndarray``
+        Array of shape (n_points, 2p), with the first parameter varying slowest,
+        so results reshape to ``[len(axis) for axis in axes]``.
+    """
+    mesh = np.meshgrid(*axes, indexing="ij")
+    return np.column_stack([values.ravel() for values in mesh])
+
+
+def cut_values(edges: list, costs: list, n_qubits: int) -> np.ndarray:
+    """Compute the Max-Cut objective of every bitstring.
+
+    Notes
+    -----
+    A cut edge with cost c contributes -(c + 1) / 2, i.e., -1 for unit costs
+    as in ``MAXCUT``.
+
+    Parameters
+    ----------
+    edges : list [tuple [int]]
+        Edges of the graph, with nodes labeled 0, ..., N - 1.
+    costs : list [float]
+        Cost of each edge.
+    n_qubits : int
+        Number of nodes of the graph.
+
+    Returns
+    -------
+    ``numpy.ndarray``
+        Objective of each of the 2^N bitstrings (qubit `i` is bit `i`).
+    """
+    index = np.arange(2**n_qubits, dtype=np.int64)
+    values = np.zeros(2**n_qubits)
+    for (i, j), cost in zip(edges, costs):
+        values -= (cost + 1) / 2 * (((index >> i) ^ (index >> j)) & 1)
+    return values
+
+
+def cost_level_table(edges: list, costs: list, n_qubits: int) -> tuple[np.ndarray, np.ndarray]:
+    """Find the distinct eigenvalues of the cost operator sum_e cost_e Z_i Z_j.
+
+    Notes
+    -----
+    Same as ``cost_levels`` and ``level_index`` of ``QAOAStatevector``,
+    without allocating its statevector buffers.
+
+    Parameters
+    ----------
+    edges : list [tuple [int]]
+        Edges of the graph, with nodes labeled 0, ..., N - 1.
+    costs : list [float]
+        Cost of each edge.
+    n_qubits : int
+        Number of nodes of the graph.
+
+    Returns
+    -------
+    cost_levels : ``numpy.ndarray``
+        Distinct eigenvalues of the cost operator.
+    level_index : ``numpy.ndarray``
+        Index into `cost_levels` for each of the 2^N bitstrings.
+    """
+    index = np.arange(2**n_qubits, dtype=np.int64)
+    diagonal = np.zeros(2**n_qubits)
+    for (i, j), cost in zip(edges, np.array(costs, dtype=float)):
+        diagonal += cost * (1 - 2 * (((index >> i) ^ (index >> j)) & 1))
+    return np.unique(diagonal, return_inverse=True)
+
+
+def evaluate_chunk(edges: list, costs: list, n_qubits: int, p: int, thetas: np.ndarray, reverse_bits: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the exact mean and variance of the Max-Cut objective of the
+    QAOA state at several parameter values at once.
+
+    Parameters
+    ----------
+    edges : list [tuple [int]]
+        Edges of the graph, with nodes labeled 0, ..., N - 1.
+    costs : list [float]
+        Cost of each edge.
+    n_qubits : int
+        Number of nodes of the graph.
+    p : int
+        Number of QAOA layers.
+    thetas : ``numpy.ndarray``
+        Array of shape (n_points, 2p) of parameters (beta, gamma).
+    reverse_bits : bool, default=False
+        True if node `i` of the objective is read from qubit N - 1 - i, otherwise False.
+
+    Returns
+    -------
+    energies : ``numpy.ndarray``
+        Expected objective at each point.
+    variances : ``numpy.ndarray``
+        Variance of the objective at each point.
+    """
+    cost_levels, level_index = cost_level_table(edges, costs, n_qubits)
+    if reverse_bits:
+        values = cut_values([(n_qubits - 1 - i, n_qubits - 1 - j) for i, j in edges], costs, n_qubits)
+    else:
+        values = cut_values(edges, costs, n_qubits)
+    n_points = thetas.shape[0]
+    states = np.full((n_points, 2**n_qubits), 1 / np.sqrt(2**n_qubits), dtype=complex)
+    for layer in range(p):
+        beta = thetas[:, layer]
+        gamma = thetas[:, p + layer]
+        # Cost layer: look up the phases of the distinct eigenvalues at every point.
+        phases = np.exp(-1j * gamma[:, np.newaxis] * cost_levels[np.newaxis, :])
+        states *= np.take(phases, level_index, axis=1)
+        # Mixer layer: rx(2 beta) on every qubit, batched over points.
+        c = np.cos(beta)[:, np.newaxis, np.newaxis]
+        ms = -1j * np.sin(beta)[:, np.newaxis, np.newaxis]
+        for qubit in range(n_qubits):
+            view = states.reshape(n_points, 2**(n_qubits - qubit - 1), 2, 2**qubit)
+            a0 = view[:, :, 0, :].copy()
+            a1 = view[:, :, 1, :]
+            view[:, :, 0, :] = c * a0 + ms * a1
+            view[:, :, 1, :] = ms * a0 + c * a1
+    probabilities = np.abs(states)**2
+    energies = probabilities @ values
+    variances = probabilities @ values**2 - energies**2
+    return energies, variances
+
+
+def cache_key(edges: list, costs: list, p: int, grid: np.ndarray, reverse_bits: bool = False) -> str:
+    """Hash the inputs of a landscape.
+
+    Parameters
+    ----------
+    edges : list [tuple [int]]
+        Edges of the graph.
+    costs : list [float]
+        Cost of each edge.
+    p : int
+        Number of QAOA layers.
+    grid : ``numpy.ndarray``
+        Array of shape (n_points, 2p) of parameters.
+    reverse_bits : bool, default=False
+        True if node `i` of the objective is read from qubit N - 1 - i, otherwise False.
+
+    Returns
+    -------
+    str
+        Hex digest identifying the landscape.
+    """
+    digest = hashlib.sha1()
+    digest.update(repr(([tuple(edge) for edge in edges], [float(cost) for cost in costs], p, reverse_bits)).encode())
+    digest.update(np.ascontiguousarray(grid, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def evaluate_landscape(edges: list, costs: list = None, p: int = 1, grid: np.ndarray = None, chunk_size: int = None, processes: int = None, cache_dir: str = None, reverse_bits: bool = False) -> dict:
+    """Compute the energy and variance landscapes of QAOA for Max-Cut.
+
+    Parameters
+    ----------
+    edges : list [tuple [int]]
+        Edges of the graph, with nodes labeled 0, ..., N - 1.
+    costs : list [float], optional
+        Cost of each edge (default 1 for every edge).
+    p : int, default=1
+        Number of QAOA layers.
+    grid : ``numpy.ndarray``
+        Array of shape (n_points, 2p) of parameters (see ``theta_grid``).
+    chunk_size : int, optional
+        Number of points evaluated at once (default keeps each chunk's
+        states to about 64 MB).
+    processes : int, optional
+        Number of worker processes (default: 1 for p = 1, else all CPUs).
+    cache_dir : str, optional
+        Directory of cached .npz results (no caching if None).
+    reverse_bits : bool, default=False
+        True if node `i` of the objective is read from qubit N - 1 - i, as in
+        the original figure 7 script, otherwise False.
+
+    Returns
+    -------
+    dict
+        "energies" and "variances" at each point of the grid, and the "grid".
+    """
+    G = nx.Graph()
+    G.add_edges_from(edges)
+    edges = [tuple(edge) for edge in G.edges()]
+    if costs is None:
+        costs = [1] * len(edges)
+    grid = np.atleast_2d(np.asarray(grid, dtype=float))
+    if grid.shape[1] != 2 * p:
+        print('--* Error: Each point of the grid must have 2p parameters. ')
+        print('--* Aborting. ')
+        return None
+    if cache_dir is not None:
+        file_name = os.path.join(cache_dir, f"landscape_{cache_key(edges, costs, p, grid, reverse_bits)}.npz")
+        if os.path.exists(file_name):
+            with np.load(file_name) as cached:
+                return {"energies": cached["energies"], "variances": cached["variances"], "grid": cached["grid"]}
+    n_qubits = G.number_of_nodes()
+    if chunk_size is None:
+        chunk_size = max(1, 2**22 // 2**n_qubits)
+    chunks = [grid[start:start + chunk_size] for start in range(0, grid.shape[0], chunk_size)]
+    if processes is None:
+        processes = 1 if p == 1 else os.cpu_count()
+    arguments = [(edges, costs, n_qubits, p, chunk, reverse_bits) for chunk in chunks]
+    if processes > 1 and len(chunks) > 1:
+        with Pool(processes=processes) as process_pool:
+            results = process_pool.starmap(evaluate_chunk, arguments)
+    else:
+        results = [evaluate_chunk(*chunk_arguments) for chunk_arguments in arguments]
+    landscape = {"energies": np.concatenate([energies for energies, _ in results]),
+                 "variances": np.concatenate([variances for _, variances in results]),
+                 "grid": grid}
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.savez(file_name, **landscape)
+    return landscape
@@ -3,6 +3,7 @@ import math
 from numpy.linalg import norm
 
 from simopt.base import Model, Problem
+from simopt.rng_blocks import MRG32k3aBlocks
 
 class SYNTHETIC(Model):
     def __init__(self, fixed_factors={}):
@@ -21,6 +22,8 @@ class SYNTHETIC(Model):
                 "default": 1
             }
         }
+        # Pair values at the last x simulated (see pair_values).
+        self._pair_values = None
         # Set factors of the simulation model.
         super().__init__(fixed_factors)
         self.specifications = {
@@ -32,40 +35,83 @@ class SYNTHETIC(Model):
         }
         super().__init__(fixed_factors)
 
+    batch_available = True
+
+    # Squares are taken with np.float_power, which calls libm pow like ``**`` on
+    # Python floats; x * x and NumPy's ``**`` can differ from it in the last bit.
+    def sigma_vector(self, x, sigma_version=None):
+        # Noise standard deviation for each consecutive pair (x[i], x[i+1]).
+        if sigma_version is None:
+            sigma_version = self.factors["sigma_version"]
+        x = np.asarray(x, dtype=float)
+        u, v = x[:-1], x[1:]
+        if sigma_version == 1:
+            return np.sqrt(np.abs((u - 3) * (v - 2)))
+        x_sq = np.float_power(x, 2)
+        himmelblau = np.float_power(x_sq[:-1] + v - 11, 2) + np.float_power(u + x_sq[1:] - 7, 2)
+        if sigma_version == 2:
+            return np.sqrt(np.abs(himmelblau))
+        elif sigma_version == 3:
+            return np.sqrt(np.abs(himmelblau + 10 * np.float_power(u - v, 2)))
+        else:
+            return np.sqrt(np.abs(himmelblau + np.float_power(u - v, 2) + np.abs(u - 3)))
+
+    def himmelblau_terms(self, x):
+        # modified version of the Himmelblau's function, one term per pair (x[i], x[i+1])
+        x = np.asarray(x, dtype=float)
+        u, v = x[:-1], x[1:]
+        x_sq = np.float_power(x, 2)
+        return np.float_power(x_sq[:-1] + v - 11, 2) + np.float_power(u + x_sq[1:] - 7, 2) + np.float_power(u - v, 2) + np.abs(u - 3)
+
+    def pair_values(self, x, sigma_version):
+        # Noise standard deviations and objective terms of the pairs at x; those of
+        # the last x are kept, since solvers take many replications at one x.
+        key = (tuple(x), sigma_version)
+        values = self._pair_values
+        if values is None or values[0] != key:
+            values = (key, self.sigma_vector(x, sigma_version), self.himmelblau_terms(x))
+            self._pair_values = values
+        return values[1], values[2]
+
     def replicate(self, rng_list):
+        return self.replicate_at({}, rng_list)
+
+    def replicate_at(self, factors, rng_list):
+        # Read the factors from a merged dict; the model's factors are not changed.
+        factors = {**self.factors, **factors}
         rng = rng_list[0]
-        d = self.factors["dim"]
-        x = self.factors["X"]
-        sigma_version = self.factors["sigma_version"]
-        stochastic_noise = np.zeros(d)
-
-        for i in range(d-1):
-            if sigma_version == 1:
-                sigma = math.sqrt(abs((x[i] - 3) * (x[i+1] - 2)))
-            elif sigma_version == 2:
-                sigma = math.sqrt(abs((x[i]**2 + x[i+1]-11)**2 + (x[i]+x[i+1]**2-7)**2))
-            elif sigma_version == 3:
-                sigma = math.sqrt(abs((x[i]**2 + x[i+1]-11)**2 + (x[i]+x[i+1]**2-7)**2 + 10*(x[i]-x[i+1])**2))
-            else:
-                sigma = math.sqrt(abs((x[i]**2 + x[i+1]-11)**2 + (x[i]+x[i+1]**2-7)**2 + (x[i]-x[i+1])**2 + abs(x[i]-3)))
-
-            stochastic_noise[i] = rng.normalvariate(mu=0, sigma=sigma)
-
-        # modified version of the Himmelblau's function
-        
-        objective_value = 0 
-        for i in range(d-1):
-            if i%2 == 0:
-                objective_value += (x[i]**2 + x[i+1]-11)**2 + (x[i]+x[i+1]**2-7)**2 + (x[i]-x[i+1])**2 + abs(x[i]-3) + stochastic_noise[i]
-
-        
-        #objective_value = (x[0]**2 + x[1]-11)**2 + (x[0]+x[1]**2-7)**2 + (x[0]-x[1])**2 + abs(x[0]-3) + stochastic_noise[0]
+        d = factors["dim"]
+        sigma, terms = self.pair_values(factors["X"], factors["sigma_version"])
+        # Draw the d-1 standard normals at once (same values as d-1 calls to normalvariate).
+        normals = MRG32k3aBlocks(rng).normals(d-1)
+        stochastic_noise = sigma * normals
+        # Only pairs starting at an even index enter the objective; they are
+        # added one by one, in the order of the scalar version.
+        objective_value = 0
+        for term in (terms + stochastic_noise)[::2].tolist():
+            objective_value += term
 
         # Compose responses and gradients.
         responses = {"objective_value": objective_value}
         gradients = {}
         return responses, gradients
 
+    def replicate_batch(self, rng_list, m):
+        return self.replicate_batch_at({}, rng_list, m)
+
+    def replicate_batch_at(self, factors, rng_list, m):
+        factors = {**self.factors, **factors}
+        rng = rng_list[0]
+        d = factors["dim"]
+        sigma, terms = self.pair_values(factors["X"], factors["sigma_version"])
+        # Pre-draw the normals, one row per replication (i.e., per subsubstream).
+        normals = MRG32k3aBlocks(rng).subsubstream_normals(m, d-1)
+        stochastic_noise = sigma * normals
+        # Running sums over the pairs, in the order of the scalar version.
+        objective_value = np.cumsum((terms + stochastic_noise)[:, ::2], axis=1)[:, -1] if d > 1 else np.zeros(m)
+        responses = {"objective_value": objective_value}
+        return responses
+
 
 """
 Summary
@@ -93,6 +139,11 @@ class SYNTHETIC_MIN(Problem):
                 "description": "Max # of replications for a solver to take.",
                 "datatype": int,
                 "default": 50000
+            },
+            "time_budget": {
+                "description": "Max seconds spent simulating for a solver to take (0 to count replications only).",
+                "datatype": (int, float),
+                "default": 0.0
             }
         }
         super().__init__(fixed_factors, model_fixed_factors)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+"""
+Summary
+-------
+Generate nearly orthogonal Latin hypercube (NOLH) designs and stacks of
+them for data-farming experiments, as NumPy arrays.
+
+Design sizes follow the NOLH tables of Cioppa and Lucas (2007) used by the
+``stack_nolhs.rb`` script of the datafarming gem: 17, 33, 65, 129, and 257
+design points for up to 7, 11, 16, 22, and 29 factors. The first 2m - 2
+columns of a design with 2^m + 1 points form Ye's (1998) orthogonal Latin
+hypercube; any further columns are Latin permutations chosen by a
+deterministic swap search to keep all pairwise correlations small.
+"""
+from __future__ import annotations
+
+from functools import reduce
+
+import numpy as np
+
+# Number of design points and the most factors they are used for.
+nolh_sizes = [(17, 7), (33, 11), (65, 16), (129, 22), (257, 29)]
+
+# Designs already generated, keyed by (number of points, number of columns).
+base_designs = {}
+
+
+def ye_olh(m: int) -> np.ndarray:
+    """Construct Ye's orthogonal Latin hypercube.
+
+    Parameters
+    ----------
+    m : int
+        Order of the design (at least 2).
+
+    Returns
+    -------
+    ``numpy.ndarray``
+        Array of shape (2^m + 1, 2m - 2) with levels -2^(m-1), ..., 2^(m-1)
+        in each column (the center point is the middle row).
+    """
+    q = 2**(m - 1)
+    identity = np.eye(2, dtype=int)
+    flip = np.array([[0, 1], [1, 0]])
+    # Permutation matrices A_k and sign vectors a_k, k = 1, ..., m - 1.
+    A = [None] + [reduce(np.kron, [identity] * (m - 1 - k) + [flip] * k) for k in range(1, m)]
+    a = [None] + [reduce(np.kron, [np.array([-1, 1]) if j == m - k else np.array([1, 1]) for j in range(1, m)]) for k in range(1, m)]
+    e = np.arange(1, q + 1)
+    M = [e] + [A[k] @ e for k in range(1, m)] + [A[m - 1] @ A[k] @ e for k in range(1, m - 1)]
+    S = [np.ones(q, dtype=int)] + [a[k] for k in range(1, m)] + [a[1] * a[k + 1] for k in range(1, m - 1)]
+    T = np.column_stack(M) * np.column_stack(S)
+    return np.vstack([T, np.zeros((1, T.shape[1]), dtype=int), -T])
+
+
+def add_nearly_orthogonal_column(design: np.ndarray, rng: np.random.Generator, max_correlation: float = 0.01, max_swaps: int = 1000, max_candidates: int = 2000) -> np.ndarray:
+    """Append a Latin column with small correlations to existing columns.
+
+    Parameters
+    ----------
+    design : ``numpy.ndarray``
+        Array of shape (n, k) of centered Latin hypercube columns whose middle
+        row is the center point.
+    rng : ``numpy.random.Generator``
+        Generator of the starting permutation.
+    max_correlation : float, default=0.01
+        Stop once the largest absolute correlation is at most this value.
+    max_swaps : int, default=1000
+        Maximum number of improving swaps.
+    max_candidates : int, default=2000
+        Number of candidate swaps compared at each step.
+
+    Returns
+    -------
+    ``numpy.ndarray``
+        Array of shape (n, k + 1).
+    """
+    n = design.shape[0]
+    center = n // 2
+    levels = np.arange(n) - center
+    # Keep the center point: permute the non-zero levels over the other rows.
+    column = np.zeros(n, dtype=int)
+    rows = np.delete(np.arange(n), center)
+    column[rows] = rng.permutation(np.delete(levels, center))
+    # Correlations are proportional to inner products since all columns share levels.
+    products = design.T @ column
+    tolerance = max_correlation * np.sum(levels**2)
+    all_i, all_j = np.triu_indices(len(rows), k=1)
+    all_i, all_j = rows[all_i], rows[all_j]
+    failures = 0
+    for _ in range(max_swaps):
+        if np.max(np.abs(products)) <= tolerance:
+            break
+        # Consider a random subset of swaps in large designs.
+        if len(all_i) > max_candidates:
+            subset = rng.choice(len(all_i), max_candidates, replace=False)
+            i, j = all_i[subset], all_j[subset]
+        else:
+            i, j = all_i, all_j
+        # Change of the inner products from swapping the entries in rows i and j.
+        change = (design[i] - design[j]) * (column[j] - column[i])[:, np.newaxis]
+        worst = np.max(np.abs(products[np.newaxis, :] + change), axis=1)
+        best = np.argmin(worst)
+        if worst[best] >= np.max(np.abs(products)):
+            # Stop when no (sampled) swap improves several times in a row.
+            failures += 1
+            if len(i) == len(all_i) or failures == 10:
+                break
+            continue
+        failures = 0
+        column[i[best]], column[j[best]] = column[j[best]], column[i[best]]
+        products = products + change[best]
+    return np.column_stack([design, column])
+
+
+def nolh(n_factors: int, n_columns: int = None) -> np.ndarray:
+    """Generate a nearly orthogonal Latin hypercube with centered levels.
+
+    Parameters
+    ----------
+    n_factors : int
+        Number of factors.
+    n_columns : int, optional
+        Number of columns to generate (default: the most factors the design
+        size is used for, so stacks can rotate through them).
+
+    Returns
+    -------
+    ``numpy.ndarray``
+        Array of shape (n, n_columns) with levels -(n - 1) / 2, ..., (n - 1) / 2.
+    """
+    n_points = next((size for size, max_factors in nolh_sizes if n_factors <= max_factors), nolh_sizes[-1][0])
+    if n_columns is None:
+        n_columns = max(n_factors, dict(nolh_sizes)[n_points])
+    if (n_points, n_columns) not in base_designs:
+        m = int(np.log2(n_points - 1))
+        design = ye_olh(m)[:, :n_columns]
+        # Seed by design size so every call returns the same design.
+        rng = np.random.default_rng(n_points)
+        while design.shape[1] < n_columns:
+            design = add_nearly_orthogonal_column(design, rng)
+        base_designs[(n_points, n_columns)] = design
+    return base_designs[(n_points, n_columns)].copy()
+
+
+def stack_nolhs(n_factors: int, n_stacks: int = 1) -> np.ndarray:
+    """Generate a stack of NOLH designs with centered levels.
+
+    Notes
+    -----
+    Stack `s` uses the columns of the base design rotated by `s`, so each
+    factor is paired with a different column. The shared center point
+    appears only once.
+
+    Parameters
+    ----------
+    n_factors : int
+        Number of factors.
+    n_stacks : int, default=1
+        Number of stacked designs.
+
+    Returns
+    -------
+    ``numpy.ndarray``
+        Array of shape (n_stacks * (n - 1) + 1, n_factors).
+    """
+    design = nolh(n_factors)
+    n_points, n_columns = design.shape
+    center = n_points // 2
+    stacks = []
+    for stack in range(n_stacks):
+        rotated = design[:, [(stack + factor) % n_columns for factor in range(n_factors)]]
+        stacks.append(rotated if stack == 0 else np.delete(rotated, center, axis=0))
+    return np.vstack(stacks)
+
+
+def scale_design(design: np.ndarray, lows: np.ndarray, highs: np.ndarray, decimals: np.ndarray) -> list[np.ndarray]:
+    """Map centered design levels to factor ranges.
+
+    Parameters
+    ----------
+    design : ``numpy.ndarray``
+        Array of shape (n, k) of centered levels.
+    lows : ``numpy.ndarray``
+        Lowest value of each factor.
+    highs : ``numpy.ndarray``
+        Highest value of each factor.
+    decimals : ``numpy.ndarray``
+        Number of decimal places of each factor (0 for integers).
+
+    Returns
+    -------
+    columns : list [``numpy.ndarray``]
+        Values of each factor, integer-valued columns have an integer dtype.
+    """
+    half_range = np.max(np.abs(design))
+    fractions = (design + half_range) / (2 * half_range)
+    columns = []
+    for factor in range(design.shape[1]):
+        values = np.round(lows[factor] + fractions[:, factor] * (highs[factor] - lows[factor]), int(decimals[factor]))
+        columns.append(values.astype(int) if decimals[factor] == 0 else values)
+    return columns
+
+
+def read_factor_settings(filename: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Read a factor settings file with lines "low high decimals".
+
+    Parameters
+    ----------
+    filename : str
+        Path of the (tab- or space-separated) factor settings file.
+
+    Returns
+    -------
+    lows : ``numpy.ndarray``
+        Lowest value of each factor.
+    highs : ``numpy.ndarray``
+        Highest value of each factor.
+    decimals : ``numpy.ndarray``
+        Number of decimal places of each factor.
+    """
+    settings = np.atleast_2d(np.loadtxt(filename, ndmin=2))
+    return settings[:, 0], settings[:, 1], settings[:, 2].astype(int)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+"""
+Summary
+-------
+Optional wall-clock profiling of simulation replications, solution
+bookkeeping, and solver phases.
+"""
+from __future__ import annotations
+
+import time
+import math
+import functools
+
+import numpy as np
+
+# Profiler collecting timings in this process (None when profiling is off).
+active_profiler = None
+
+# Solver methods timed when profiling a solver (if the solver has them).
+# Times are inclusive, e.g., ``iterate`` includes ``construct_model``.
+solver_phases = ["iterate", "construct_model", "get_model_coefficients", "get_model_coefficients_reg", "get_stopping_time",
+                 "create_new_solution", "sort_and_end_update", "gen_simul_pert_vec"]
+
+
+class Profiler(object):
+    """Aggregate call counts, total times, and latency histograms of named
+    sections of code.
+
+    Attributes
+    ----------
+    counts : dict [str, int]
+        Number of timed calls of each section.
+    totals : dict [str, float]
+        Total time (in seconds) spent in each section.
+    histograms : dict [str, ``numpy.ndarray``]
+        Number of calls of each section falling into each latency bin.
+    """
+    # Latency bins are decades: <1us, 1-10us, ..., 0.1-1s, >=1s.
+    bin_labels = ["<1us", "1-10us", "10-100us", "0.1-1ms", "1-10ms", "10-100ms", "0.1-1s", ">=1s"]
+
+    def __init__(self):
+        self.counts = {}
+        self.totals = {}
+        self.histograms = {}
+
+    def add(self, name: str, seconds: float):
+        """Record one call of a section.
+
+        Parameters
+        ----------
+        name : str
+            Name of the section.
+        seconds : float
+            Time (in seconds) spent in the call.
+        """
+        if name not in self.counts:
+            self.counts[name] = 0
+            self.totals[name] = 0.0
+            self.histograms[name] = np.zeros(len(self.bin_labels), dtype=int)
+        self.counts[name] += 1
+        self.totals[name] += seconds
+        if seconds > 0:
+            self.histograms[name][min(max(math.floor(math.log10(seconds)) + 7, 0), len(self.bin_labels) - 1)] += 1
+        else:
+            self.histograms[name][0] += 1
+
+    def merge(self, other: "Profiler"):
+        """Add the timings of another profiler to this one.
+
+        Parameters
+        ----------
+        other : ``profiling.Profiler``
+            Profiler to merge, e.g., from another macroreplication.
+        """
+        for name in other.counts:
+            if name not in self.counts:
+                self.counts[name] = 0
+                self.totals[name] = 0.0
+                self.histograms[name] = np.zeros(len(self.bin_labels), dtype=int)
+            self.counts[name] += other.counts[name]
+            self.totals[name] += other.totals[name]
+            self.histograms[name] += other.histograms[name]
+
+    def report(self) -> list[str]:
+        """Summarize the timings, one line per section.
+
+        Returns
+        -------
+        lines : list [str]
+            Count, total and mean time, and latency histogram of each section.
+        """
+        lines = []
+        for name in sorted(self.totals, key=self.totals.get, reverse=True):
+            mean = self.totals[name] / self.counts[name]
+            histogram = ", ".join(f"{label}: {count}" for label, count in zip(self.bin_labels, self.histograms[name]) if count > 0)
+            lines.append(f"{name}: {self.counts[name]} calls, {self.totals[name]:.4f} s total, {mean * 1e6:.1f} us mean ({histogram})")
+        return lines
+
+
+def start_profiling() -> "Profiler":
+    """Start collecting timings in this process.
+
+    Returns
+    -------
+    ``profiling.Profiler``
+        Profiler receiving the timings.
+    """
+    global active_profiler
+    active_profiler = Profiler()
+    return active_profiler
+
+
+def stop_profiling() -> "Profiler":
+    """Stop collecting timings in this process.
+
+    Returns
+    -------
+    ``profiling.Profiler``
+        Profiler holding the collected timings.
+    """
+    global active_profiler
+    profiler = active_profiler
+    active_profiler = None
+    return profiler
+
+
+def instrument_solver(solver: "Solver"):
+    """Time the phases of a solver (see ``solver_phases``) while profiling is on.
+
+    Parameters
+    ----------
+    solver : ``base.Solver``
+        Solver whose methods are wrapped.
+    """
+    for phase in solver_phases:
+        if hasattr(solver, phase):
+            setattr(solver, phase, timed(getattr(solver, phase), f"{solver.name}.{phase}"))
+
+
+def uninstrument_solver(solver: "Solver"):
+    """Remove the wrappers added by ``instrument_solver``.
+
+    Parameters
+    ----------
+    solver : ``base.Solver``
+        Solver whose methods were wrapped.
+    """
+    for phase in solver_phases:
+        if phase in solver.__dict__:
+            delattr(solver, phase)
+
+
+def timed(function, name: str):
+    """Wrap a function so each call is recorded by the active profiler.
+
+    Parameters
+    ----------
+    function : callable
+        Function to time.
+    name : str
+        Name of the section the calls are recorded under.
+
+    Returns
+    -------
+    callable
+        Wrapped function.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if active_profiler is None:
+            return function(*args, **kwargs)
+        tic = time.perf_counter()
+        result = function(*args, **kwargs)
+        active_profiler.add(name, time.perf_counter() - tic)
+        return result
+    return wrapper
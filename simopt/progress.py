@@ -0,0 +1,363 @@
+#!/usr/bin/env python
+"""
+Summary
+-------
+Live progress, throughput, and ETA reporting for experiments whose
+macroreplications run in worker processes.
+
+Each worker publishes progress events (budget spent, solver iterations,
+calls to ``Problem.simulate``, and replications) over a queue shared with
+the parent process. The parent aggregates the latest event of each
+macroreplication into a periodically refreshed status line and/or a JSON
+heartbeat file with per-worker throughput and an ETA estimate.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import functools
+import multiprocessing
+
+# Reporter publishing progress from this process (None when not reporting).
+active_reporter = None
+
+
+class ProgressReporter(object):
+    """Publish the progress of one macroreplication from a worker process.
+
+    Attributes
+    ----------
+    channel : ``multiprocessing.Queue``
+        Queue to the parent's ``ProgressMonitor``.
+    mrep : int
+        Index of the macroreplication.
+    total : float
+        Budget of the macroreplication.
+    overhead : float
+        Budget charged per call to ``simulate`` on top of its replications.
+    use_clock : bool
+        True if the budget is the time spent simulating (time-budget mode),
+        otherwise False.
+    interval : float
+        Min time (in seconds) between two events.
+    n_calls : int
+        Number of calls to ``simulate``.
+    n_reps : int
+        Number of replications simulated.
+    n_iterations : int
+        Number of solver iterations (for solvers with an ``iterate`` method).
+    spent : float
+        Budget spent.
+
+    Parameters
+    ----------
+    channel : ``multiprocessing.Queue``
+        Queue to the parent's ``ProgressMonitor``.
+    mrep : int
+        Index of the macroreplication.
+    total : float
+        Budget of the macroreplication.
+    overhead : float, default=0
+        Budget charged per call to ``simulate`` on top of its replications.
+    use_clock : bool, default=False
+        True if the budget is the time spent simulating, otherwise False.
+    interval : float, default=0.5
+        Min time (in seconds) between two events.
+    """
+    def __init__(self, channel: "multiprocessing.Queue", mrep: int, total: float, overhead: float = 0, use_clock: bool = False, interval: float = 0.5):
+        self.channel = channel
+        self.mrep = mrep
+        self.total = total
+        self.overhead = overhead
+        self.use_clock = use_clock
+        self.interval = interval
+        self.n_calls = 0
+        self.n_reps = 0
+        self.n_iterations = 0
+        self.spent = 0
+        self.start = time.time()
+        self.last_publish = self.start
+
+    def record(self, m: int, clock: float = 0.0):
+        """Record a call to ``simulate`` and publish an event if due.
+
+        Parameters
+        ----------
+        m : int
+            Number of replications simulated.
+        clock : float, default=0.0
+            Time spent simulating so far (see ``Problem.simulation_time``).
+        """
+        self.n_calls += 1
+        self.n_reps += m
+        if self.use_clock:
+            self.spent = clock
+        else:
+            self.spent += m + self.overhead
+        if time.time() - self.last_publish >= self.interval:
+            self.publish()
+
+    def record_iteration(self):
+        """Record a solver iteration.
+        """
+        self.n_iterations += 1
+
+    def publish(self, done: bool = False):
+        """Send the current progress to the parent.
+
+        Parameters
+        ----------
+        done : bool, default=False
+            True if the macroreplication is finished, otherwise False.
+        """
+        self.last_publish = time.time()
+        self.channel.put({"mrep": self.mrep,
+                          "pid": os.getpid(),
+                          "start": self.start,
+                          "time": self.last_publish,
+                          "spent": self.spent,
+                          "total": self.total,
+                          "n_calls": self.n_calls,
+                          "n_reps": self.n_reps,
+                          "n_iterations": self.n_iterations,
+                          "done": done
+                          })
+
+
+def start_reporting(channel: "multiprocessing.Queue", mrep: int, total: float, overhead: float = 0, use_clock: bool = False) -> "ProgressReporter":
+    """Start publishing the progress of a macroreplication from this process.
+
+    Parameters
+    ----------
+    channel : ``multiprocessing.Queue``
+        Queue to the parent's ``ProgressMonitor``.
+    mrep : int
+        Index of the macroreplication.
+    total : float
+        Budget of the macroreplication.
+    overhead : float, default=0
+        Budget charged per call to ``simulate`` on top of its replications.
+    use_clock : bool, default=False
+        True if the budget is the time spent simulating, otherwise False.
+
+    Returns
+    -------
+    ``progress.ProgressReporter``
+        Reporter publishing the progress.
+    """
+    global active_reporter
+    active_reporter = ProgressReporter(channel, mrep, total, overhead, use_clock)
+    active_reporter.publish()
+    return active_reporter
+
+
+def stop_reporting():
+    """Publish the final progress of the macroreplication and stop reporting.
+    """
+    global active_reporter
+    if active_reporter is not None:
+        active_reporter.publish(done=True)
+    active_reporter = None
+
+
+def instrument_solver(solver: "Solver"):
+    """Count the iterations of a solver (calls to its ``iterate`` method)
+    while reporting.
+
+    Parameters
+    ----------
+    solver : ``base.Solver``
+        Solver whose ``iterate`` method is wrapped.
+    """
+    if hasattr(solver, "iterate"):
+        iterate = getattr(solver, "iterate")
+
+        @functools.wraps(iterate)
+        def wrapper(*args, **kwargs):
+            if active_reporter is not None:
+                active_reporter.record_iteration()
+            return iterate(*args, **kwargs)
+        # Keep a wrapper installed before (e.g., by ``profiling``) to restore it.
+        wrapper.wrapped_attribute = solver.__dict__.get("iterate")
+        setattr(solver, "iterate", wrapper)
+
+
+def uninstrument_solver(solver: "Solver"):
+    """Remove the wrapper added by ``instrument_solver``.
+
+    Parameters
+    ----------
+    solver : ``base.Solver``
+        Solver whose ``iterate`` method was wrapped.
+    """
+    wrapper = solver.__dict__.get("iterate")
+    if wrapper is not None and hasattr(wrapper, "wrapped_attribute"):
+        if wrapper.wrapped_attribute is None:
+            delattr(solver, "iterate")
+        else:
+            setattr(solver, "iterate", wrapper.wrapped_attribute)
+
+
+class ProgressMonitor(object):
+    """Aggregate progress events from worker processes into a status line
+    and/or a JSON heartbeat file.
+
+    Notes
+    -----
+    The throughput of a macroreplication is its budget spent per second
+    since it started. The ETA assumes that the running macroreplications
+    keep their throughput and that the ones not yet started are run at the
+    mean throughput of the others, as workers free up.
+
+    Attributes
+    ----------
+    label : str
+        Description of the work (e.g., solver, problem, and phase).
+    totals : list [float]
+        Budget of each macroreplication.
+    mreps : list [int]
+        Index of each macroreplication (as reported by the workers).
+    status_line : bool
+        True if a status line is printed, otherwise False.
+    heartbeat_file : str
+        Path of the JSON heartbeat file (None for no file).
+    interval : float
+        Time (in seconds) between two refreshes.
+    channel : ``multiprocessing.Queue``
+        Queue receiving the events (can be sent to pool workers).
+    progress : dict [int, dict]
+        Latest event of each macroreplication.
+
+    Parameters
+    ----------
+    label : str
+        Description of the work.
+    totals : list [float]
+        Budget of each macroreplication.
+    mreps : range, optional
+        Index of each macroreplication (default: 0, 1, ..., len(totals) - 1).
+    status_line : bool, default=True
+        True if a status line is printed, otherwise False.
+    heartbeat_file : str, optional
+        Path of the JSON heartbeat file.
+    interval : float, default=2.0
+        Time (in seconds) between two refreshes.
+    """
+    def __init__(self, label: str, totals: list[float], mreps: range = None, status_line: bool = True, heartbeat_file: str = None, interval: float = 2.0):
+        self.label = label
+        self.totals = totals
+        self.mreps = list(range(len(totals)) if mreps is None else mreps)
+        self.status_line = status_line
+        self.heartbeat_file = heartbeat_file
+        self.interval = interval
+        self.start = time.time()
+        self.last_refresh = 0.0
+        self.progress = {}
+        self._manager = multiprocessing.Manager()
+        self.channel = self._manager.Queue()
+
+    def poll(self):
+        """Collect the pending events and refresh the outputs if due.
+        """
+        while not self.channel.empty():
+            event = self.channel.get()
+            self.progress[event["mrep"]] = event
+        if time.time() - self.last_refresh >= self.interval:
+            self.refresh()
+
+    def summary(self) -> dict:
+        """Summarize the progress of all macroreplications.
+
+        Returns
+        -------
+        dict
+            Overall "elapsed" time, "finished" macroreplications, budget
+            "spent", "throughput" (budget per second summed over running
+            macroreplications), and "eta" (in seconds, None if unknown), and
+            per-macroreplication "workers" entries.
+        """
+        now = time.time()
+        workers = []
+        throughputs = []
+        remaining = 0.0
+        running_etas = []
+        for mrep, total in zip(self.mreps, self.totals):
+            event = self.progress.get(mrep)
+            if event is None:
+                remaining += total
+                continue
+            elapsed = max(event["time"] - event["start"], 1e-9)
+            throughput = event["spent"] / elapsed
+            left = 0.0 if event["done"] else max(total - event["spent"], 0.0)
+            eta = 0.0 if event["done"] else (left / throughput if throughput > 0 else None)
+            if not event["done"]:
+                throughputs.append(throughput)
+                running_etas.append(eta)
+            workers.append({"mrep": mrep,
+                            "pid": event["pid"],
+                            "spent": event["spent"],
+                            "total": total,
+                            "iterations": event["n_iterations"],
+                            "simulate_calls": event["n_calls"],
+                            "replications": event["n_reps"],
+                            "reps_per_second": event["n_reps"] / elapsed,
+                            "throughput": throughput,
+                            "eta": eta,
+                            "done": event["done"]
+                            })
+        finished = sum(worker["done"] for worker in workers)
+        # Estimate the time left: running macroreplications finish at their
+        # throughput; the others run as workers free up, at the mean throughput.
+        all_throughputs = [worker["throughput"] for worker in workers if worker["throughput"] > 0]
+        if remaining == 0 and None not in running_etas:
+            eta = max(running_etas, default=0.0)
+        elif len(all_throughputs) > 0 and len(throughputs) > 0 and None not in running_etas:
+            mean_throughput = sum(all_throughputs) / len(all_throughputs)
+            eta = max(running_etas, default=0.0) + remaining / (mean_throughput * len(throughputs))
+        else:
+            eta = None
+        return {"label": self.label,
+                "elapsed": now - self.start,
+                "n_macroreps": len(self.totals),
+                "finished": finished,
+                "spent": sum(worker["spent"] for worker in workers),
+                "total": sum(self.totals),
+                "throughput": sum(throughputs),
+                "eta": eta,
+                "workers": workers
+                }
+
+    def refresh(self, final: bool = False):
+        """Print the status line and/or write the heartbeat file.
+
+        Parameters
+        ----------
+        final : bool, default=False
+            True if this is the last refresh, otherwise False.
+        """
+        self.last_refresh = time.time()
+        summary = self.summary()
+        if self.status_line:
+            eta = "?" if summary["eta"] is None else f"{summary['eta']:.0f}s"
+            reps_per_second = sum(worker["replications"] for worker in summary["workers"]) / max(summary["elapsed"], 1e-9)
+            line = (f"{self.label}: {summary['finished']}/{summary['n_macroreps']} macroreps done, "
+                    f"budget {summary['spent']:.6g}/{summary['total']:.6g}, "
+                    f"{reps_per_second:.1f} reps/s, elapsed {summary['elapsed']:.0f}s, ETA {eta}")
+            sys.stdout.write("\r" + line.ljust(100) + ("\n" if final else ""))
+            sys.stdout.flush()
+        if self.heartbeat_file is not None:
+            temporary_file = self.heartbeat_file + ".tmp"
+            with open(temporary_file, "w") as file:
+                json.dump(summary, file, indent=1)
+            os.replace(temporary_file, self.heartbeat_file)
+
+    def close(self):
+        """Collect the last events, refresh the outputs, and stop the queue.
+        """
+        while not self.channel.empty():
+            event = self.channel.get()
+            self.progress[event["mrep"]] = event
+        self.refresh(final=True)
+        self._manager.shutdown()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+"""
+Summary
+-------
+Generate blocks of MRG32k3a random numbers as NumPy arrays.
+
+Draws are identical, bit for bit, to those from repeated calls to
+``MRG32k3a.random()`` and ``MRG32k3a.normalvariate()``, so CRN across
+solutions and macroreplications is unaffected. The generator state is
+only read and set through ``get_current_state()`` and ``seed()``.
+
+The NumPy jump-ahead reproduces the pure-Python implementation of
+MRG32k3a (``mrg32k3a.python``). Generators of other backends, e.g., the
+optional Rust backend, are drawn from directly.
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from mrg32k3a.mrg32k3a import MRG32k3a, mrgm1, mrgm2, mrga12, mrga13n, mrga21, mrga23n, mrgm1_plus_1, mrgm1_div_mrgm1_plus_1
+# Pure-Python generator class, and the constants of its Beasley-Springer-Moro algorithm.
+from mrg32k3a.python import MRG32k3a as PythonMRG32k3a, bsma, bsmb, bsmc
+
+# Rows of the jump matrices A1^k and A2^k for k = -2, -1, 0, 1, ...
+# Row k + 2 maps the first (second) half of a state to the first (second)
+# component of the state k steps later, i.e., x_k = A1_rows[k + 2] . s[:3] % mrgm1.
+# The tables grow on demand and are shared by all generators.
+A1_rows = np.eye(3, dtype=np.int64)
+A2_rows = np.eye(3, dtype=np.int64)
+
+
+def extend_jump_rows(n: int):
+    """Make sure the jump-matrix rows are available for up to `n` steps.
+
+    Parameters
+    ----------
+    n : int
+        Number of steps the generator is advanced by.
+    """
+    global A1_rows, A2_rows
+    n_have = A1_rows.shape[0] - 3
+    if n <= n_have:
+        return
+    # Grow geometrically to keep the number of extensions small.
+    n_new = max(n, 2 * n_have, 64)
+    rows1 = [list(map(int, row)) for row in A1_rows]
+    rows2 = [list(map(int, row)) for row in A2_rows]
+    for k in range(n_have + 1, n_new + 1):
+        # x_k = a12 * x_{k-2} + a13n * x_{k-3} and y_k = a21 * y_{k-1} + a23n * y_{k-3}.
+        rows1.append([(mrga12 * b + mrga13n * c) % mrgm1 for b, c in zip(rows1[k], rows1[k - 1])])
+        rows2.append([(mrga21 * a + mrga23n * c) % mrgm2 for a, c in zip(rows2[k + 1], rows2[k - 1])])
+    A1_rows = np.array(rows1, dtype=np.int64)
+    A2_rows = np.array(rows2, dtype=np.int64)
+
+
+def mat_vec_mod(rows: np.ndarray, states: np.ndarray, m: int) -> np.ndarray:
+    """Compute ``rows . state % m`` for every row and state without overflow.
+
+    Parameters
+    ----------
+    rows : ``numpy.ndarray``
+        Array of shape (n, 3) of jump-matrix rows, entries below `m`.
+    states : ``numpy.ndarray``
+        Array of shape (r, 3) of (half) states, entries below `m`.
+    m : int
+        Modulus.
+
+    Returns
+    -------
+    ``numpy.ndarray``
+        Array of shape (r, n).
+    """
+    result = np.zeros((states.shape[0], rows.shape[0]), dtype=np.int64)
+    for j in range(3):
+        a = rows[:, j][np.newaxis, :]
+        s = states[:, j][:, np.newaxis]
+        # Split the 32-bit multiplier into 16-bit halves so products fit in int64.
+        high = ((a >> 16) * s) % m
+        result += (((high << 16) + (a & 0xFFFF) * s) % m)
+    return result % m
+
+
+def bsm_array(u: np.ndarray) -> np.ndarray:
+    """Approximate quantiles of the standard normal distribution via the
+    Beasley-Springer-Moro algorithm, elementwise.
+
+    Notes
+    -----
+    Performs the same floating-point operations as ``mrg32k3a.bsm``; the
+    logarithms in the tails are taken with ``math.log`` so the results match.
+
+    Parameters
+    ----------
+    u : ``numpy.ndarray``
+        Probability values (between 0 and 1).
+
+    Returns
+    -------
+    z : ``numpy.ndarray``
+        Corresponding quantiles of the standard normal distribution.
+    """
+    def horner(x, coeffs):
+        result = 0.0
+        for c in reversed(coeffs):
+            result = result * x + c
+        return result
+
+    y = u - 0.5
+    z = np.empty_like(u)
+    # Approximate from the center (Beasly-Springer 1977).
+    center = np.abs(y) < 0.42
+    r = y[center] * y[center]
+    z[center] = y[center] * horner(r, bsma) / horner(r, bsmb)
+    # Approximate from the tails (Moro 1995).
+    tail = ~center
+    if np.any(tail):
+        r = np.where(y[tail] < 0, u[tail], 1 - u[tail])
+        s = np.array([math.log(-math.log(r_i)) for r_i in r.tolist()])
+        z[tail] = np.where(y[tail] < 0, -1, 1) * horner(s, bsmc)
+    return z
+
+
+class MRG32k3aBlocks(object):
+    """Wrapper around an ``mrg32k3a.mrg32k3a.MRG32k3a`` object that draws
+    random numbers in blocks.
+
+    Notes
+    -----
+    Blocks of fewer than ``min_block`` numbers are drawn by calling the
+    generator directly, which is faster than jumping ahead with NumPy for
+    small blocks and gives the same values. So are all blocks of
+    generators other than the pure-Python ``MRG32k3a`` (e.g., of the Rust
+    backend), whose normals may differ in the last bit from ``bsm_array``.
+
+    Attributes
+    ----------
+    rng : ``mrg32k3a.mrg32k3a.MRG32k3a``
+        Wrapped generator. Its state is advanced past every number drawn.
+    vectorized : bool
+        True if `rng` is a pure-Python ``MRG32k3a``, so blocks can be drawn
+        with NumPy, otherwise False.
+    min_block : int
+        Min number of draws for which the NumPy jump-ahead is used.
+
+    Parameters
+    ----------
+    rng : ``mrg32k3a.mrg32k3a.MRG32k3a``
+        Generator to draw from.
+    """
+    min_block = 128
+
+    def __init__(self, rng: MRG32k3a):
+        self.rng = rng
+        self.vectorized = type(rng) is PythonMRG32k3a
+
+    def _uniforms_from(self, states: np.ndarray, n: int) -> np.ndarray:
+        """Generate `n` uniforms following each of several states.
+
+        Parameters
+        ----------
+        states : ``numpy.ndarray``
+            Array of shape (r, 6) of generator states.
+        n : int
+            Number of uniforms per state.
+
+        Returns
+        -------
+        u : ``numpy.ndarray``
+            Array of shape (r, n).
+        """
+        extend_jump_rows(n)
+        x = mat_vec_mod(A1_rows[3:n + 3], states[:, :3], mrgm1)
+        y = mat_vec_mod(A2_rows[3:n + 3], states[:, 3:], mrgm2)
+        diff = x - y
+        return np.where(diff != 0, (diff % mrgm1) / mrgm1_plus_1, mrgm1_div_mrgm1_plus_1)
+
+    def advance(self, n: int):
+        """Advance the generator by `n` steps.
+
+        Parameters
+        ----------
+        n : int
+            Number of steps.
+        """
+        if n < 1:
+            return
+        if not self.vectorized:
+            for _ in range(n):
+                self.rng.random()
+            return
+        extend_jump_rows(n)
+        state = np.array([self.rng.get_current_state()], dtype=np.int64)
+        # The state after n steps holds components n-2, n-1, and n.
+        x = mat_vec_mod(A1_rows[n:n + 3], state[:, :3], mrgm1)[0]
+        y = mat_vec_mod(A2_rows[n:n + 3], state[:, 3:], mrgm2)[0]
+        self.rng.seed(tuple(int(v) for v in x) + tuple(int(v) for v in y))
+
+    def uniforms(self, n: int) -> np.ndarray:
+        """Generate `n` standard uniform variates and advance the generator.
+
+        Parameters
+        ----------
+        n : int
+            Number of variates.
+
+        Returns
+        -------
+        ``numpy.ndarray``
+            Same values as `n` calls to ``rng.random()``.
+        """
+        if n < self.min_block or not self.vectorized:
+            return np.array([self.rng.random() for _ in range(n)])
+        state = np.array([self.rng.get_current_state()], dtype=np.int64)
+        u = self._uniforms_from(state, n)[0]
+        self.advance(n)
+        return u
+
+    def normals(self, n: int) -> np.ndarray:
+        """Generate `n` standard normal variates and advance the generator.
+
+        Parameters
+        ----------
+        n : int
+            Number of variates.
+
+        Returns
+        -------
+        ``numpy.ndarray``
+            Same values as `n` calls to ``rng.normalvariate()``.
+        """
+        if n < self.min_block or not self.vectorized:
+            return np.array([self.rng.normalvariate() for _ in range(n)])
+        return bsm_array(self.uniforms(n))
+
+    def subsubstream_uniforms(self, m: int, n: int) -> np.ndarray:
+        """Generate `n` uniforms from each of `m` consecutive subsubstreams.
+
+        Notes
+        -----
+        Row 0 starts at the current state and row `i` at the start of the
+        `i`-th following subsubstream. Afterwards the generator is at the start
+        of the subsubstream following the last row, as if each row had been
+        drawn with ``random()`` followed by ``advance_subsubstream()``.
+
+        Parameters
+        ----------
+        m : int
+            Number of subsubstreams (e.g., replications).
+        n : int
+            Number of uniforms per subsubstream.
+
+        Returns
+        -------
+        ``numpy.ndarray``
+            Array of shape (m, n).
+        """
+        if m * n < self.min_block or not self.vectorized:
+            u = np.empty((m, n))
+            for i in range(m):
+                u[i] = [self.rng.random() for _ in range(n)]
+                self.rng.advance_subsubstream()
+            return u
+        states = [self.rng.get_current_state()]
+        for _ in range(m):
+            self.rng.advance_subsubstream()
+            states.append(self.rng.get_current_state())
+        return self._uniforms_from(np.array(states[:m], dtype=np.int64), n)
+
+    def subsubstream_normals(self, m: int, n: int) -> np.ndarray:
+        """Generate `n` standard normals from each of `m` consecutive subsubstreams.
+
+        Parameters
+        ----------
+        m : int
+            Number of subsubstreams (e.g., replications).
+        n : int
+            Number of normals per subsubstream.
+
+        Returns
+        -------
+        ``numpy.ndarray``
+            Array of shape (m, n). See ``subsubstream_uniforms``.
+        """
+        if m * n < self.min_block or not self.vectorized:
+            z = np.empty((m, n))
+            for i in range(m):
+                z[i] = [self.rng.normalvariate() for _ in range(n)]
+                self.rng.advance_subsubstream()
+            return z
+        return bsm_array(self.subsubstream_uniforms(m, n))
@@ -278,7 +278,7 @@ class ASTRODF1M(Solver):
                     sig2 = new_solution.objectives_var
                     # adaptive sampling
                     while True:
-                        if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or expended_budget >= budget:
+                        if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or expended_budget >= budget or problem.time_budget_exhausted():
                             break
                         problem.simulate(new_solution, 1)
                         expended_budget += 1 + overhead_costs
@@ -292,7 +292,7 @@ class ASTRODF1M(Solver):
                     sig2 = visited_pts_list[f_index].objectives_var
                     # adaptive sampling
                     while True:
-                        if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or expended_budget >= budget:
+                        if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or expended_budget >= budget or problem.time_budget_exhausted():
                             break
                         problem.simulate(visited_pts_list[f_index], 1)
                         expended_budget += 1 + overhead_costs
@@ -316,7 +316,7 @@ class ASTRODF1M(Solver):
                         expended_budget += 1 + overhead_costs
                         sample_size += 1
                         sig2 = new_solution.objectives_var
-                        if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or expended_budget >= budget:
+                        if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or expended_budget >= budget or problem.time_budget_exhausted():
                             break
                     fval.append(-1 * problem.minmax[0] * new_solution.objectives_mean)
                     interpolation_solns.append(new_solution)
@@ -421,9 +421,14 @@ class ASTRODF1M(Solver):
             # calculate kappa
             # pilot run
             pilot_run = int(max(lambda_min, .5 * problem.dim) - 1)
+            clock_start = problem.simulation_time
             problem.simulate(new_solution, pilot_run)
             expended_budget += pilot_run + overhead_costs
             sample_size = pilot_run
+            # In time-budget mode, scale the tuning budget (a share of the
+            # replication budget) to the replications the time budget affords.
+            if problem.time_budget_mode():
+                budget_limit *= problem.effective_budget(pilot_run + overhead_costs, problem.simulation_time - clock_start) / problem.factors["budget"]
             while True:
                 problem.simulate(new_solution, 1)
                 expended_budget += 1 + overhead_costs
@@ -431,12 +436,12 @@ class ASTRODF1M(Solver):
                 fn = new_solution.objectives_mean
                 sig2 = new_solution.objectives_var
                 # ...
-                if sample_size >= self.get_stopping_time(k, sig2, delta_k, fn / (delta_k ** 2), problem.dim) or expended_budget >= budget_limit:
+                if sample_size >= self.get_stopping_time(k, sig2, delta_k, fn / (delta_k ** 2), problem.dim) or expended_budget >= budget_limit or problem.time_budget_exhausted():
                     kappa = fn / (delta_k ** 2)
                     break
 
             recommended_solns.append(new_solution)
-            intermediate_budgets.append(expended_budget)
+            intermediate_budgets.append(problem.budget_stamp(expended_budget))
         fval, Y, q, grad, Hessian, delta_k, expended_budget, interpolation_solns, visited_pts_list = self.construct_model(new_x, delta_k, k, problem, expended_budget, kappa, new_solution, visited_pts_list)
 
 
@@ -480,7 +485,7 @@ class ASTRODF1M(Solver):
             expended_budget += 1 + overhead_costs
             sample_size += 1
             sig2 = candidate_solution.objectives_var
-            if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or expended_budget >= budget_limit:
+            if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or expended_budget >= budget_limit or problem.time_budget_exhausted():
                 break
 
         # calculate success ratio
@@ -505,7 +510,7 @@ class ASTRODF1M(Solver):
             final_ob = candidate_solution.objectives_mean
             delta_k = min(gamma_1 * delta_k, delta_max)
             recommended_solns.append(candidate_solution)
-            intermediate_budgets.append(expended_budget)
+            intermediate_budgets.append(problem.budget_stamp(expended_budget))
         # successful: accept
         elif rho >= eta_1:
             new_x = candidate_x
@@ -513,7 +518,7 @@ class ASTRODF1M(Solver):
             final_ob = candidate_solution.objectives_mean
             delta_k = min(delta_k, delta_max)
             recommended_solns.append(candidate_solution)
-            intermediate_budgets.append(expended_budget)
+            intermediate_budgets.append(problem.budget_stamp(expended_budget))
         # unsuccessful: shrink and reject
         else:
             delta_k = min(gamma_2 * delta_k, delta_max)
@@ -571,6 +576,8 @@ class ASTRODF1M(Solver):
         final_ob, delta_k, recommended_solns, intermediate_budgets, expended_budget, new_x, kappa, new_solution, visited_pts_list, norm_grad = self.iterate(k, \
         delta_candidate[0], delta_max, problem, visited_pts_list, problem.factors["initial_solution"], 0, budget * 0.01, recommended_solns =[], intermediate_budgets=[], kappa=1, new_solution=[])
         expended_budget_best = expended_budget
+        # Time on the simulation clock at the end of the best tuning run.
+        clock_best = problem.simulation_time
 
         for i in range(1, 3):
             final_ob_pt, delta_pt, recommended_solns_pt, intermediate_budgets_pt, expended_budget_pt, new_x_pt, kappa_pt, new_solution_pt, visited_pts_list, norm_grad_pt = self.iterate(k, \
@@ -582,16 +589,23 @@ class ASTRODF1M(Solver):
                 recommended_solns = recommended_solns_pt
                 intermediate_budgets = intermediate_budgets_pt
                 expended_budget_best = expended_budget_pt
+                clock_best = problem.simulation_time
                 new_x = new_x_pt
                 new_solution = new_solution_pt
                 kappa = kappa_pt
                 norm_grad = norm_grad_pt
 
         # continue the search from the best initial trust-region after parameter tuning
-        intermediate_budgets = (intermediate_budgets + np.ones(len(intermediate_budgets))*(expended_budget - expended_budget_best)).tolist()
+        # and charge the discarded tuning runs before its recommendations
+        # (in time-budget mode, the time they ran after the best one)
+        if problem.time_budget_mode():
+            budget_shift = problem.simulation_time - clock_best
+        else:
+            budget_shift = expended_budget - expended_budget_best
+        intermediate_budgets = (intermediate_budgets + np.ones(len(intermediate_budgets))*budget_shift).tolist()
         intermediate_budgets[0] = 0
 
-        while (expended_budget < budget):
+        while (expended_budget < budget) and not problem.time_budget_exhausted():
             k += 1
             final_ob, delta_k, recommended_solns, intermediate_budgets, expended_budget, new_x, kappa, new_solution, visited_pts_list, norm_grad = self.iterate(k,
                 delta_k, delta_max, problem, visited_pts_list, new_x, expended_budget, budget, recommended_solns, intermediate_budgets, kappa, new_solution)
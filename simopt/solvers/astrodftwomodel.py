@@ -356,7 +356,7 @@ class ASTRODF2M(Solver):
                     sample_size = new_solution.n_reps
                     sig2 = new_solution.objectives_var
                     # Sampling
-                    if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim):
+                    if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or problem.time_budget_exhausted():
                         fval.append(-1 * problem.minmax[0] * new_solution.objectives_mean)
                         interpolation_solns.append(new_solution)
                     else:
@@ -373,7 +373,7 @@ class ASTRODF2M(Solver):
                     sample_size = visited_pts_list[f_index].n_reps
                     sig2 = visited_pts_list[f_index].objectives_var
                     # Sampling
-                    if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim):
+                    if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or problem.time_budget_exhausted():
                         fval.append(-1 * problem.minmax[0] * visited_pts_list[f_index].objectives_mean)
                         interpolation_solns.append(visited_pts_list[f_index])
                     else:
@@ -410,7 +410,7 @@ class ASTRODF2M(Solver):
                         sig2 = new_solution.objectives_var
 
                     # Sampling
-                    if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim):
+                    if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or problem.time_budget_exhausted():
                         fval.append(-1 * problem.minmax[0] * new_solution.objectives_mean)
                         interpolation_solns.append(new_solution)
                     else:
@@ -559,7 +559,7 @@ class ASTRODF2M(Solver):
             fn = new_solution.objectives_mean
 
             # Sampling
-            if sample_size < self.get_stopping_time(k, sig2, delta_k, fn / (delta_k ** 2), problem.dim):
+            if sample_size < self.get_stopping_time(k, sig2, delta_k, fn / (delta_k ** 2), problem.dim) and not problem.time_budget_exhausted():
                 needed_replications = min(self.get_stopping_time(k, sig2, delta_k, fn / (delta_k ** 2), problem.dim) - sample_size, max(budget-expended_budget,2))
                 problem.simulate(new_solution, needed_replications)
                 num_implementation += 1
@@ -568,7 +568,7 @@ class ASTRODF2M(Solver):
 
             kappa = fn / (delta_k ** 2)
             recommended_solns.append(new_solution)
-            intermediate_budgets.append(expended_budget)
+            intermediate_budgets.append(problem.budget_stamp(expended_budget))
 
         fval, Y, q, q_r, grad, Hessian, delta_k, expended_budget, interpolation_solns, visited_pts_list, num_implementation = self.construct_model(new_x, delta_k, k, problem, expended_budget, kappa, new_solution, visited_pts_list, num_implementation)
 
@@ -618,7 +618,7 @@ class ASTRODF2M(Solver):
         sig2 = candidate_solution.objectives_var
 
         # Sampling
-        if sample_size < self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim):
+        if sample_size < self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) and not problem.time_budget_exhausted():
             needed_replications = min(self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) - sample_size, max(budget-expended_budget,2))
             problem.simulate(candidate_solution, needed_replications)
             num_implementation += 1
@@ -647,7 +647,7 @@ class ASTRODF2M(Solver):
             final_ob = candidate_solution.objectives_mean
             delta_k = min(gamma_1 * delta_k, delta_max)
             recommended_solns.append(candidate_solution)
-            intermediate_budgets.append(expended_budget)
+            intermediate_budgets.append(problem.budget_stamp(expended_budget))
         # successful: accept
         elif rho >= eta_1:
             new_x = candidate_x
@@ -655,7 +655,7 @@ class ASTRODF2M(Solver):
             final_ob = candidate_solution.objectives_mean
             delta_k = min(delta_k, delta_max)
             recommended_solns.append(candidate_solution)
-            intermediate_budgets.append(expended_budget)
+            intermediate_budgets.append(problem.budget_stamp(expended_budget))
         # unsuccessful: shrink and reject
         else:
             delta_k = min(gamma_2 * delta_k, delta_max)
@@ -713,9 +713,13 @@ class ASTRODF2M(Solver):
         # parameter tuning runs
         # run the first iteration with three choices of the initial trust region radius
         # return the one (of three) that more quickly progresses in search
+        # (their sample sizes are capped by the remaining replication budget,
+        # not by budget_limit, so they scale with budget also in time-budget mode)
         final_ob, delta_k, recommended_solns, intermediate_budgets, expended_budget, new_x, kappa, new_solution, visited_pts_list, norm_grad, var_data, num_implementation = self.iterate(k, \
         delta_candidate[0], delta_max, problem, visited_pts_list, problem.factors["initial_solution"], 0, budget * 0.01, recommended_solns =[], intermediate_budgets=[], kappa=1, new_solution=[], var_data=[], num_implementation= num_implementation)
         expended_budget_best = expended_budget
+        # Time on the simulation clock at the end of the best tuning run.
+        clock_best = problem.simulation_time
         for i in range(1, 3):
             final_ob_pt, delta_pt, recommended_solns_pt, intermediate_budgets_pt, expended_budget_pt, new_x_pt, kappa_pt, new_solution_pt, visited_pts_list, norm_grad_pt, var_data, num_implementation = self.iterate(k, \
                 delta_candidate[i], delta_max, problem, visited_pts_list, problem.factors["initial_solution"], 0, budget * 0.01, recommended_solns=[], intermediate_budgets=[], kappa=1, new_solution=[], var_data=[], num_implementation= num_implementation)
@@ -726,16 +730,23 @@ class ASTRODF2M(Solver):
                 recommended_solns = recommended_solns_pt
                 intermediate_budgets = intermediate_budgets_pt
                 expended_budget_best = expended_budget_pt
+                clock_best = problem.simulation_time
                 new_x = new_x_pt
                 new_solution = new_solution_pt
                 kappa = kappa_pt
                 norm_grad = norm_grad_pt
 
         # continue the search from the best initial trust-region after parameter tuning
-        intermediate_budgets = (intermediate_budgets + np.ones(len(intermediate_budgets))*(expended_budget - expended_budget_best)).tolist()
+        # and charge the discarded tuning runs before its recommendations
+        # (in time-budget mode, the time they ran after the best one)
+        if problem.time_budget_mode():
+            budget_shift = problem.simulation_time - clock_best
+        else:
+            budget_shift = expended_budget - expended_budget_best
+        intermediate_budgets = (intermediate_budgets + np.ones(len(intermediate_budgets))*budget_shift).tolist()
         intermediate_budgets[0] = 0
 
-        while (expended_budget < budget):
+        while (expended_budget < budget) and not problem.time_budget_exhausted():
             k += 1
             final_ob, delta_k, recommended_solns, intermediate_budgets, expended_budget, new_x, kappa, new_solution, visited_pts_list, norm_grad, var_data, num_implementation = self.iterate(k,
                 delta_k, delta_max, problem, visited_pts_list, new_x, expended_budget, budget, recommended_solns, intermediate_budgets, kappa, new_solution, var_data, num_implementation)
@@ -76,6 +76,11 @@ class NelderMeadQ(Solver):
                 "datatype": int,
                 "default": 10
             },
+            "shots_per_solution": {
+                "description": "number of shots taken at each solution instead of r replications, with the model choosing the replications (0 to take r replications)",
+                "datatype": int,
+                "default": 0
+            },
             "alpha": {
                 "description": "reflection coefficient > 0",
                 "datatype": float,
@@ -110,6 +115,7 @@ class NelderMeadQ(Solver):
         self.check_factor_list = {
             "crn_across_solns": self.check_crn_across_solns,
             "r": self.check_r,
+            "shots_per_solution": self.check_shots_per_solution,
             "alpha": self.check_alpha,
             "gammap": self.check_gammap,
             "betap": self.check_betap,
@@ -122,6 +128,9 @@ class NelderMeadQ(Solver):
     def check_r(self):
         return self.factors["r"] > 0
 
+    def check_shots_per_solution(self):
+        return self.factors["shots_per_solution"] >= 0
+
     def check_alpha(self):
         return self.factors["alpha"] > 0
 
@@ -161,7 +170,7 @@ class NelderMeadQ(Solver):
         n_pts = problem.dim + 1
         overhead_costs = self.factors["overhead_burden"]
         # Check for sufficiently large budget.
-        if problem.factors["budget"] < self.factors["r"] * n_pts:
+        if problem.factors["budget"] < self.reps_per_solution(problem) * n_pts:
             print('Budget is too small for a good quality run of Nelder-Mead.')
             return
         # Shrink variable bounds to avoid floating errors.
@@ -201,13 +210,11 @@ class NelderMeadQ(Solver):
         recommended_solns = []
         # Track overall budget spent.
         budget_spent = 0
-        r = self.factors["r"]  # For increasing replications.
 
         # Start Solving.
         # Evaluate solutions in initial structure.
         for solution in sol:
-            problem.simulate(solution, self.factors["r"])
-            budget_spent += self.factors["r"] + overhead_costs
+            budget_spent += self.simulate_solution(problem, solution) + overhead_costs
         # Record initial solution data.
         intermediate_budgets.append(0)
         recommended_solns.append(sol[0])
@@ -215,7 +222,7 @@ class NelderMeadQ(Solver):
         sort_sol = self.sort_and_end_update(problem, sol)
 
         # Maximization problem is converted to minimization by using minmax.
-        while budget_spent <= problem.factors["budget"]:
+        while budget_spent <= problem.factors["budget"] and not problem.time_budget_exhausted():
             # Reflect worst and update sort_sol.
             p_high = sort_sol[-1]  # Current worst point.
             p_cent = tuple(np.mean(tuple([s.x for s in sort_sol[0:-1]]), axis=0))  # Centroid for other pts.
@@ -236,8 +243,7 @@ class NelderMeadQ(Solver):
                         p_new = self.check_const(p_new, p_new2.x)
                         p_new = Solution(p_new, problem)
                         p_new.attach_rngs(rng_list=self.solution_progenitor_rngs, copy=True)
-                        problem.simulate(p_new, r)
-                        budget_spent += r + overhead_costs
+                        budget_spent += self.simulate_solution(problem, p_new) + overhead_costs
 
                         # Update sort_sol.
                         sort_sol[i] = p_new  # p_new replaces pi.
@@ -256,8 +262,7 @@ class NelderMeadQ(Solver):
             # Evaluate reflected point.
             p_refl = Solution(p_refl, problem)
             p_refl.attach_rngs(rng_list=self.solution_progenitor_rngs, copy=True)
-            problem.simulate(p_refl, r)
-            budget_spent += r + overhead_costs
+            budget_spent += self.simulate_solution(problem, p_refl) + overhead_costs
             refl_fn_val = tuple([-1 * i for i in problem.minmax]) * p_refl.objectives_mean
 
             # Track best, worst, and second worst points.
@@ -285,8 +290,7 @@ class NelderMeadQ(Solver):
                 # Evaluate expansion point.
                 p_exp = Solution(p_exp, problem)
                 p_exp.attach_rngs(rng_list=self.solution_progenitor_rngs, copy=True)
-                problem.simulate(p_exp, r)
-                budget_spent += r + overhead_costs
+                budget_spent += self.simulate_solution(problem, p_exp) + overhead_costs
                 exp_fn_val = tuple([-1 * i for i in problem.minmax]) * p_exp.objectives_mean
 
                 # Check if expansion point is an improvement relative to simplex.
@@ -298,7 +302,7 @@ class NelderMeadQ(Solver):
 
                     # Record data from expansion point (new best).
                     if budget_spent <= problem.factors["budget"]:
-                        intermediate_budgets.append(budget_spent)
+                        intermediate_budgets.append(problem.budget_stamp(budget_spent))
                         recommended_solns.append(p_exp)
                 else:
                     sort_sol[-1] = p_refl  # p_refl replaces p_high.
@@ -308,7 +312,7 @@ class NelderMeadQ(Solver):
 
                     # Record data from expansion point (new best).
                     if budget_spent <= problem.factors["budget"]:
-                        intermediate_budgets.append(budget_spent)
+                        intermediate_budgets.append(problem.budget_stamp(budget_spent))
                         recommended_solns.append(p_refl)
 
             # Check if accept contraction or shrink.
@@ -326,8 +330,7 @@ class NelderMeadQ(Solver):
                 # Evaluate contraction point.
                 p_cont = Solution(p_cont, problem)
                 p_cont.attach_rngs(rng_list=self.solution_progenitor_rngs, copy=True)
-                problem.simulate(p_cont, r)
-                budget_spent += r + overhead_costs
+                budget_spent += self.simulate_solution(problem, p_cont) + overhead_costs
                 cont_fn_val = tuple([-1 * i for i in problem.minmax]) * p_cont.objectives_mean
 
                 # Accept contraction.
@@ -341,7 +344,7 @@ class NelderMeadQ(Solver):
                     if cont_fn_val < fn_low:
                         # Record data from contraction point (new best).
                         if budget_spent <= problem.factors["budget"]:
-                            intermediate_budgets.append(budget_spent)
+                            intermediate_budgets.append(problem.budget_stamp(budget_spent))
                             recommended_solns.append(p_cont)
                 else:  # Contraction fails -> simplex shrinks by delta with p_low fixed.
                     sort_sol[-1] = p_high  # Replaced by p_refl.
@@ -356,8 +359,7 @@ class NelderMeadQ(Solver):
                         p_new = self.check_const(p_new, p_new2.x)
                         p_new = Solution(p_new, problem)
                         p_new.attach_rngs(rng_list=self.solution_progenitor_rngs, copy=True)
-                        problem.simulate(p_new, r)
-                        budget_spent += r + overhead_costs
+                        budget_spent += self.simulate_solution(problem, p_new) + overhead_costs
                         new_fn_val = tuple([-1 * i for i in problem.minmax]) * p_new.objectives_mean
 
                         # Check for new best.
@@ -372,13 +374,28 @@ class NelderMeadQ(Solver):
 
                     # Record data if there is a new best solution in the contraction.
                     if new_best == 1 and budget_spent <= problem.factors["budget"]:
-                        intermediate_budgets.append(budget_spent)
+                        intermediate_budgets.append(problem.budget_stamp(budget_spent))
                         recommended_solns.append(sort_sol[0])
                         
         return recommended_solns, intermediate_budgets
 
     # HELPER FUNCTIONS
 
+    # Number of replications taken at each solution.
+    def reps_per_solution(self, problem):
+        if self.factors["shots_per_solution"] > 0:
+            return max(1, -(-self.factors["shots_per_solution"] // problem.model.shots_per_replication()))
+        return self.factors["r"]
+
+    # Simulate a new solution: r replications, or shots_per_solution shots in one request
+    # (see Problem.simulate_shots) so the model can choose the job structure.
+    # Returns the number of replications taken.
+    def simulate_solution(self, problem, solution):
+        if self.factors["shots_per_solution"] > 0:
+            return problem.simulate_shots(solution, self.factors["shots_per_solution"])
+        problem.simulate(solution, self.factors["r"])
+        return self.factors["r"]
+
     def sort_and_end_update(self, problem, sol):
         sort_sol = sorted(sol, key=lambda s: tuple([-1 * i for i in problem.minmax]) * s.objectives_mean)
         return sort_sol
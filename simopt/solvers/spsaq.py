@@ -191,14 +191,15 @@ class SPSAQ(Solver):
         theta = problem.factors["initial_solution"]
         theta_sol = self.create_new_solution(tuple(theta), problem)
         recommended_solns.append(theta_sol)
-        intermediate_budgets.append(expended_budget)
+        intermediate_budgets.append(problem.budget_stamp(expended_budget))
         # Simulate initial solution.
         problem.simulate(theta_sol, self.factors["n_reps"])
         expended_budget = self.factors["n_reps"] + overhead_cost
         # Determine initial value for the parameters c, a, and A (Aalg) (according to Section III.B of Spall (1998)).
         c = float(max((theta_sol.objectives_var / self.factors["gavg"]) ** 0.5, .0001))
-        # Calculating the maximum expected number of loss evaluations per run.
-        nEvals = round((problem.factors["budget"] / self.factors["n_reps"]) * self.factors["eval_pct"])
+        # Calculating the maximum expected number of loss evaluations per run
+        # (in time-budget mode, from the replications the time budget affords).
+        nEvals = round((problem.effective_budget(expended_budget) / self.factors["n_reps"]) * self.factors["eval_pct"])
         Aalg = self.factors["iter_pct"] * nEvals / (2 * self.factors["gavg"])
         gbar = np.zeros((1, problem.dim))
         for _ in range(int(self.factors["n_loss"] / (2 * self.factors["gavg"]))):
@@ -227,7 +228,7 @@ class SPSAQ(Solver):
         # Run the main algorithm.
         # Initiate iteration counter.
         k = 0
-        while expended_budget < problem.factors["budget"]:
+        while expended_budget < problem.factors["budget"] and not problem.time_budget_exhausted():
             k += 1
             # Calculate the gain sequences ak and ck.
             ak = a / (k + Aalg) ** self.factors["alpha"]
@@ -255,7 +256,7 @@ class SPSAQ(Solver):
                 ftheta_best = ftheta
                 # Record data from the new best solution.
                 recommended_solns.append(theta_sol)
-                intermediate_budgets.append(expended_budget)
+                intermediate_budgets.append(problem.budget_stamp(expended_budget))
             # Estimate gradient. (-minmax is needed to cast this as a minimization problem.)
             ghat = np.dot(-1, problem.minmax) * np.divide((thetaplus_sol.objectives_mean - thetaminus_sol.objectives_mean) / ((step_weight_plus + step_weight_minus) * c), delta)
             # Take step and check feasibility.
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import os
+import csv
+import time
 from numpy.linalg import pinv
 from numpy.linalg import norm
 import numpy as np
@@ -13,6 +15,144 @@ warnings.filterwarnings("ignore")
 from simopt.base import Solver, Problem, Solution
 
 
+class IncrementalVarianceModel(object):
+    """Weighted least-squares model v(x) = q_0 + g'z + h'z^2 (z = x - center) of the
+    variance surface, kept as normal equations that are updated as points enter or
+    leave the neighborhood of the center point.
+
+    Each row costs O(d^2) to add or remove; moving the center or changing the radius
+    transforms the normal equations in O(d^3) regardless of the number of points.
+    The normal equations are kept in coordinates scaled by the radius, so they stay
+    well conditioned as the trust region shrinks.
+
+    Attributes
+    ----------
+    dim : int
+        Number of decision variables.
+    center : ``numpy.ndarray``
+        Center point of the model.
+    scale : float
+        Radius scaling the coordinates.
+    gram : ``numpy.ndarray``
+        Weighted sum of outer products of the basis vectors of the rows.
+    moment : ``numpy.ndarray``
+        Weighted sum of the basis vectors of the rows times their values.
+    rows : dict
+        Weight, point and value of each row in the model, by key.
+    n_downdates : int
+        Number of rows removed since the normal equations were last rebuilt.
+
+    Parameters
+    ----------
+    dim : int
+        Number of decision variables.
+    """
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.center = None
+        self.scale = None
+        self.gram = np.zeros((2 * dim + 1, 2 * dim + 1))
+        self.moment = np.zeros(2 * dim + 1)
+        self.rows = {}
+        self.n_downdates = 0
+
+    def add_rows(self, rows: list, sign: int = 1):
+        # add (sign = 1) or remove (sign = -1) rows (weight, x, value) in one rank-k update
+        if len(rows) == 0:
+            return
+        weights = sign * np.array([row[0] for row in rows], dtype=float)
+        u = (np.array([row[1] for row in rows], dtype=float) - self.center) / self.scale
+        phi = np.hstack((np.ones((len(rows), 1)), u, u ** 2))
+        self.gram += phi.T @ (weights[:, np.newaxis] * phi)
+        self.moment += phi.T @ (weights * np.array([row[2] for row in rows], dtype=float))
+
+    def move(self, center: np.ndarray, scale: float):
+        """Express the normal equations around a new center point and radius.
+
+        Parameters
+        ----------
+        center : ``numpy.ndarray``
+            New center point.
+        scale : float
+            New radius.
+        """
+        center = np.array(center, dtype=float)
+        if self.center is not None and np.array_equal(center, self.center) and scale == self.scale:
+            return
+        if self.center is None or len(self.rows) == 0:
+            self.center = center
+            self.scale = scale
+            return
+        # u' = a * u + t, so u'^2 = a^2 * u^2 + 2 * a * t * u + t^2.
+        a = self.scale / scale
+        t = (self.center - center) / scale
+        d = self.dim
+        T = np.zeros((2 * d + 1, 2 * d + 1))
+        T[0, 0] = 1
+        T[1:d + 1, 0] = t
+        T[1:d + 1, 1:d + 1] = np.diag(np.full(d, a))
+        T[d + 1:, 0] = t ** 2
+        T[d + 1:, 1:d + 1] = np.diag(2 * a * t)
+        T[d + 1:, d + 1:] = np.diag(np.full(d, a ** 2))
+        self.gram = T @ self.gram @ T.T
+        self.moment = T @ self.moment
+        self.center = center
+        self.scale = scale
+
+    def update(self, center: np.ndarray, scale: float, rows: dict):
+        """Move the model and replace its rows, adding and removing only the rows
+        that changed.
+
+        Parameters
+        ----------
+        center : ``numpy.ndarray``
+            Center point.
+        scale : float
+            Radius of the neighborhood.
+        rows : dict
+            Weight, point and value of each row, by key.
+        """
+        self.move(center, scale)
+        removed = [key for key in self.rows if rows.get(key) != self.rows[key]]
+        self.n_downdates += len(removed)
+        if self.n_downdates > len(rows):
+            # Rebuild from scratch now and then to discard the rounding errors of removed rows.
+            self.gram[:] = 0
+            self.moment[:] = 0
+            self.rows = {}
+            self.n_downdates = 0
+        else:
+            self.add_rows([self.rows.pop(key) for key in removed], sign=-1)
+        added = [key for key in rows if key not in self.rows]
+        self.add_rows([rows[key] for key in added])
+        for key in added:
+            self.rows[key] = rows[key]
+
+    def coefficients(self) -> np.ndarray:
+        """Solve the normal equations.
+
+        Returns
+        -------
+        ``numpy.ndarray``
+            Coefficients (q_0, g, h) in unscaled coordinates z = x - center.
+        """
+        # Solve in scaled coordinates, where the normal equations are well conditioned.
+        if not (np.all(np.isfinite(self.gram)) and np.all(np.isfinite(self.moment))):
+            raise np.linalg.LinAlgError("Variance model has non-finite rows.")
+        eigenvalues, eigenvectors = np.linalg.eigh(self.gram)
+        if np.max(eigenvalues) <= 0:
+            raise np.linalg.LinAlgError("Variance model has no rows.")
+        keep = eigenvalues > np.max(eigenvalues) * len(eigenvalues) * np.finfo(float).eps
+        q_scaled = eigenvectors[:, keep] @ ((eigenvectors[:, keep].T @ self.moment) / eigenvalues[keep])
+        unscale = np.concatenate(([1.0], np.full(self.dim, 1 / self.scale), np.full(self.dim, 1 / self.scale ** 2)))
+        q = unscale * q_scaled
+        if not np.all(keep):
+            # Rank deficient: take the solution of minimum norm in unscaled coordinates, as a full regression would.
+            null_space = unscale[:, np.newaxis] * eigenvectors[:, ~keep]
+            q = q + null_space @ np.linalg.lstsq(null_space, -q, rcond=None)[0]
+        return q
+
+
 class VMIASTRODF(Solver):
     """Three version of ASTRO-DF-VMs with varying sampling version and ASTRO-DF.
 
@@ -122,6 +262,21 @@ class VMIASTRODF(Solver):
                 "datatype": bool,
                 "default": True
             },
+            "reuse_mode": {
+                "description": "single: reuse the farthest visited point, multiple: reuse a well-poised subset of visited points",
+                "datatype": str,
+                "default": "single"
+            },
+            "pivot_threshold": {
+                "description": "smallest pivot (scaled by the trust-region radius) of a reused point in the multiple reuse mode",
+                "datatype": float,
+                "default": 0.1
+            },
+            "contraction_radius": {
+                "description": "largest distance (relative to the trust-region radius) of a point carried over from an earlier pass of the contraction loop, 1 to disable",
+                "datatype": float,
+                "default": 1.0
+            },
             "criticality_threshold": {
                 "description": "threshold on gradient norm indicating near-critical region",
                 "datatype": float,
@@ -146,6 +301,16 @@ class VMIASTRODF(Solver):
                 "description": "constant for the penalty function",
                 "datatype": float,
                 "default": 0.1
+            },
+            "incremental_variance_model": {
+                "description": "update the variance model incrementally through its normal equations instead of refitting it by least squares (faster, but single runs can take different paths)",
+                "datatype": bool,
+                "default": False
+            },
+            "telemetry_path": {
+                "description": "file prefix for per-iteration telemetry (one CSV file per solver, problem and macroreplication), empty to disable",
+                "datatype": str,
+                "default": ""
             }
         }
         self.check_factor_list = {
@@ -158,8 +323,15 @@ class VMIASTRODF(Solver):
             "beta": self.check_beta,
             "mu": self.check_mu,
             "lambda_min": self.check_lambda_min,
-            "criticality_threshold": self.check_criticality_threshold
+            "criticality_threshold": self.check_criticality_threshold,
+            "reuse_mode": self.check_reuse_mode,
+            "pivot_threshold": self.check_pivot_threshold,
+            "contraction_radius": self.check_contraction_radius
         }
+        self.telemetry = None
+        self.variance_model = None
+        # design points carried over between passes of the contraction loop (and their replications)
+        self.contraction_stats = {"carried_points": 0, "carried_reps": 0}
         super().__init__(fixed_factors)
 
     def check_eta_1(self):
@@ -189,6 +361,48 @@ class VMIASTRODF(Solver):
     def check_criticality_threshold(self):
         return self.factors["criticality_threshold"] > 0
 
+    def check_reuse_mode(self):
+        return self.factors["reuse_mode"] in ["single", "multiple"]
+
+    def check_pivot_threshold(self):
+        return self.factors["pivot_threshold"] > 0
+
+    def check_contraction_radius(self):
+        return self.factors["contraction_radius"] >= 1
+
+    # columns of the per-iteration telemetry file
+    telemetry_fields = ["k", "delta", "delta_model", "delta_next", "rho", "success", "ind_success", "kappa", "norm_grad",
+                        "expended_budget", "sample_sizes", "candidate_sample_size", "reuse_hits", "carried_points", "carried_reps", "simulate_calls",
+                        "simulate_reps", "overhead", "num_implementation", "time_model", "time_subproblem",
+                        "time_simulation", "time_total"]
+
+    # wrap problem.simulate to count the calls, replications and time spent simulating
+    def start_telemetry(self, problem):
+        self.telemetry = {"records": [], "simulate_calls": 0, "simulate_reps": 0, "simulate_time": 0.0}
+        simulate = problem.simulate
+
+        def timed_simulate(solution, m=1):
+            tic = time.perf_counter()
+            simulate(solution, m)
+            self.telemetry["simulate_time"] += time.perf_counter() - tic
+            self.telemetry["simulate_calls"] += 1
+            self.telemetry["simulate_reps"] += m
+
+        problem.simulate = timed_simulate
+
+    # restore problem.simulate and write the records of this macroreplication
+    # to "<telemetry_path>_<solver>_<problem>_mrep<macrorep>.csv"
+    def stop_telemetry(self, problem):
+        del problem.simulate
+        file_name = f"{self.factors['telemetry_path']}_{self.name}_{problem.name}_mrep{self.macrorep}.csv"
+        if os.path.dirname(file_name) and not os.path.exists(os.path.dirname(file_name)):
+            os.makedirs(os.path.dirname(file_name))
+        with open(file_name, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=self.telemetry_fields)
+            writer.writeheader()
+            writer.writerows(self.telemetry["records"])
+        self.telemetry = None
+
     # generate the coordinate vector corresponding to the variable number v_no
     def get_coordinate_vector(self, size, v_no):
         arr = np.zeros(size)
@@ -245,6 +459,8 @@ class VMIASTRODF(Solver):
         criticality_select = self.factors["criticality_select"]
         criticality_threshold = self.factors["criticality_threshold"]
         reuse_points = self.factors["reuse_points"]
+        reuse_mode = self.factors["reuse_mode"]
+        contraction_radius = self.factors["contraction_radius"]
         overhead_costs = self.factors["overhead_burden"]
         sampling_version = self.factors["sampling_version"]
         j = 0
@@ -253,6 +469,8 @@ class VMIASTRODF(Solver):
         delta_k = delta
         pf_constant = self.factors["penalty_function_constant"]
         reguralized_objective = self.factors["reguralized_objective"]
+        # design points simulated in the previous pass of the contraction loop
+        pass_solns = []
 
         while True:
             fval = []
@@ -260,49 +478,54 @@ class VMIASTRODF(Solver):
             delta_k = delta_k * w ** (j - 1)
 
             # Calculate the distance between the center point and other design points
-            Dist = []
-            R_X = []
-            R_V = []
-
-            for i in range(len(visited_pts_list)):
-                Dist.append(norm(np.array(visited_pts_list[i].x) - np.array(x_k)) - delta_k)
-                # If the design point is outside the trust region, we will not reuse it (distance = -big M)
-                if Dist[-1] > 0:
-                    Dist[-1] = -delta_k * 10000
+            visited_dist = np.array([norm(np.array(visited_pts_list[i].x) - np.array(x_k)) for i in range(len(visited_pts_list))])
+            Dist = visited_dist - delta_k
+            # If the design point is outside the trust region, we will not reuse it (distance = -big M)
+            Dist[Dist > 0] = -delta_k * 10000
 
             # Find the index of visited design points list for reusing points
             # The reused point will be the farthest point from the center point among the design points within the trust region
-            f_index = Dist.index(max(Dist))
-
-            r_var = delta_k
-            while len(R_V) <= 2*problem.dim + 1:
-                R_dist = []
-                for i in range(len(visited_pts_list)):
-                    R_dist.append(norm(np.array(visited_pts_list[i].x) - np.array(x_k)) - r_var)
-                    # If the design point is outside the trust region, we will not reuse it (distance = -big M)
-                    if R_dist[i] > 0:
-                        R_dist[i] = - delta_k * 10000
-                    elif R_dist[i] != - delta_k:
-                        R_X.append([np.array(visited_pts_list[i].x)])
-                        R_V.append(visited_pts_list[i].objectives_var)
-                r_var = r_var * 1.5
+            f_index = int(np.argmax(Dist))
 
             # Using variance model to find the minimizer of variance model
             if k > 1 and sampling_version != 0:
-                Y = [[x_k]]
-                Vval = [new_solution.objectives_var]
+                # Take the visited points within growing radii (by a factor 1.5), one pass per radius,
+                # until the regression has more than 2d+1 rows
+                # (a point within several radii, or listed several times in visited_pts_list, counts each time)
+                R_index = []
+                r_var = delta_k
+                while len(R_index) <= 2*problem.dim + 1:
+                    R_dist = visited_dist - r_var
+                    R_index.extend(np.nonzero((R_dist <= 0) & (R_dist != - delta_k))[0])
+                    r_var = r_var * 1.5
+
+                if self.factors["incremental_variance_model"]:
+                    # Rows of the variance model: the center point and the visited points, weighted by their counts
+                    weights = {}
+                    for i in R_index:
+                        weights[id(visited_pts_list[i])] = weights.get(id(visited_pts_list[i]), 0) + 1
+                    rows = {"center": (1, tuple(x_k), float(new_solution.objectives_var[0]))}
+                    for soln in visited_pts_list:
+                        if id(soln) in weights:
+                            rows[id(soln)] = (weights[id(soln)], soln.x, float(soln.objectives_var[0]))
+
+                    # update the regression model and obtain the model coefficients
+                    q_r, grad, Hessian, ind_success = self.get_model_coefficients_incremental(x_k, delta_k, rows, problem)
+                else:
+                    Y = [[x_k]]
+                    Vval = [new_solution.objectives_var]
 
-                # Constrcut variance model
-                for i in range(len(R_X)):
-                    Y.append(R_X[i])
-                    Vval.append(R_V[i])
+                    # Constrcut variance model
+                    for i in R_index:
+                        Y.append([np.array(visited_pts_list[i].x)])
+                        Vval.append(visited_pts_list[i].objectives_var)
 
-                Z_r = np.zeros((len(Y), problem.dim))
-                for i in range(1, len(Y)):
-                    Z_r[i, :] = np.array(Y[i][0]) - np.array(Y[0][0])
+                    Z_r = np.zeros((len(Y), problem.dim))
+                    for i in range(1, len(Y)):
+                        Z_r[i, :] = np.array(Y[i][0]) - np.array(Y[0][0])
 
-                # construct the regression model and obtain the model coefficients
-                q_r, grad, Hessian, ind_success = self.get_model_coefficients_reg(Z_r, Vval, problem)
+                    # construct the regression model and obtain the model coefficients
+                    q_r, grad, Hessian, ind_success = self.get_model_coefficients_reg(Z_r, Vval, problem)
                 
                 if ind_success != 0:
                     if np.dot(np.multiply(grad, Hessian), grad) <= 0:
@@ -378,8 +601,24 @@ class VMIASTRODF(Solver):
                     Z = self.get_rotated_basis_interpolation_points(np.zeros(problem.dim), delta_k, problem, rotate_matrix,
                                                              np.array(visited_pts_list[f_index].x) - np.array(x_k))
 
+            # Visited solutions whose replications are reused for the design points
+            if k > 1 and reuse_points == True and reuse_mode == "multiple":
+                # Replace planned design points by visited points that keep the interpolation set well poised
+                Y, reused_solns = self.select_reused_points(x_k, delta_k, Y, visited_pts_list, problem)
+                Z = [np.array(Y[i][0]) - np.array(x_k) for i in range(len(Y))]
+            else:
+                reused_solns = [None] * len(Y)
+                if (norm(np.array(x_k) - np.array(visited_pts_list[f_index].x)) != 0) and (reuse_points == True) and (ind_success == 0):
+                    reused_solns[1] = visited_pts_list[f_index]
+
+            # Keep the points of the previous pass that lie along the same directions and close enough to the center point
+            if j > 1 and contraction_radius > 1:
+                Y, reused_solns = self.carry_over_points(x_k, delta_k * contraction_radius, Y, reused_solns, pass_solns)
+                Z = [np.array(Y[i][0]) - np.array(x_k) for i in range(len(Y))]
+
             # Evaluate the function estimate for the interpolation points
             for i in range(2 * problem.dim + 1):
+                reused_soln = reused_solns[i]
                 # for X_0, we don't need to simulate the new solution
                 if (k == 1) and (i == 0):
                     if reguralized_objective == False:
@@ -416,7 +655,7 @@ class VMIASTRODF(Solver):
                     # Adaptive Sampling
                     else:
                         while True:
-                            if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or expended_budget >= budget:
+                            if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or expended_budget >= budget or problem.time_budget_exhausted():
                                 break
                             problem.simulate(new_solution, 1)
                             expended_budget += 1 + overhead_costs
@@ -430,43 +669,43 @@ class VMIASTRODF(Solver):
 
                         interpolation_solns.append(new_solution)
 
-                # else if we reuse one design point, reuse the replications
-                elif (i == 1) and (norm(np.array(x_k) - np.array(visited_pts_list[f_index].x)) != 0) and (reuse_points == True) and (ind_success == 0):
-                    sample_size = visited_pts_list[f_index].n_reps
-                    sig2 = visited_pts_list[f_index].objectives_var
+                # else if we reuse visited design points, reuse the replications
+                elif reused_soln is not None:
+                    sample_size = reused_soln.n_reps
+                    sig2 = reused_soln.objectives_var
                     # Two-Stage Sampling
                     if sampling_version != 0:
                         if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim):                            
                             if reguralized_objective == False:
-                                fval.append(-1 * problem.minmax[0] * visited_pts_list[f_index].objectives_mean)
+                                fval.append(-1 * problem.minmax[0] * reused_soln.objectives_mean)
                             else:
-                                fval.append(-1 * problem.minmax[0] * visited_pts_list[f_index].objectives_mean + pf_constant*visited_pts_list[f_index].objectives_var)
-                            interpolation_solns.append(visited_pts_list[f_index])
+                                fval.append(-1 * problem.minmax[0] * reused_soln.objectives_mean + pf_constant*reused_soln.objectives_var)
+                            interpolation_solns.append(reused_soln)
                         else:
                             needed_replications = min(self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) - sample_size, max(budget-expended_budget,2))
-                            problem.simulate(visited_pts_list[f_index], needed_replications)
+                            problem.simulate(reused_soln, needed_replications)
                             num_implementation += 1
                             expended_budget += needed_replications + overhead_costs
                             if reguralized_objective == False:
-                                fval.append(-1 * problem.minmax[0] * visited_pts_list[f_index].objectives_mean)
+                                fval.append(-1 * problem.minmax[0] * reused_soln.objectives_mean)
                             else:
-                                fval.append(-1 * problem.minmax[0] * visited_pts_list[f_index].objectives_mean + pf_constant*visited_pts_list[f_index].objectives_var)
-                            interpolation_solns.append(visited_pts_list[f_index])
+                                fval.append(-1 * problem.minmax[0] * reused_soln.objectives_mean + pf_constant*reused_soln.objectives_var)
+                            interpolation_solns.append(reused_soln)
                             
                     # Adaptive Sampling
                     else:
                         while True:
-                            if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or expended_budget >= budget:
+                            if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or expended_budget >= budget or problem.time_budget_exhausted():
                                 break
-                            problem.simulate(visited_pts_list[f_index], 1)
+                            problem.simulate(reused_soln, 1)
                             expended_budget += 1 + overhead_costs
                             sample_size += 1
-                            sig2 = visited_pts_list[f_index].objectives_var
+                            sig2 = reused_soln.objectives_var
                         if reguralized_objective == False:
-                            fval.append(-1 * problem.minmax[0] * visited_pts_list[f_index].objectives_mean)
+                            fval.append(-1 * problem.minmax[0] * reused_soln.objectives_mean)
                         else:
-                            fval.append(-1 * problem.minmax[0] * visited_pts_list[f_index].objectives_mean + pf_constant*visited_pts_list[f_index].objectives_var)
-                        interpolation_solns.append(visited_pts_list[f_index])
+                            fval.append(-1 * problem.minmax[0] * reused_soln.objectives_mean + pf_constant*reused_soln.objectives_var)
+                        interpolation_solns.append(reused_soln)
 
                 # for new points, we need to run the simulation
                 else:
@@ -587,7 +826,7 @@ class VMIASTRODF(Solver):
                             expended_budget += 1 + overhead_costs
                             sample_size += 1
                             sig2 = design_set_solution.objectives_var
-                            if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or expended_budget >= budget:
+                            if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or expended_budget >= budget or problem.time_budget_exhausted():
                                 break
 
                         if reguralized_objective == False:
@@ -597,6 +836,8 @@ class VMIASTRODF(Solver):
 
                         interpolation_solns.append(design_set_solution)
 
+            pass_solns = interpolation_solns[-(2 * problem.dim + 1):]
+
             # construct the model and obtain the model coefficients
             q, grad, Hessian = self.get_model_coefficients(Z, fval, problem)
 
@@ -660,6 +901,96 @@ class VMIASTRODF(Solver):
 
         return q, grad, Hessian, ind_success
 
+    # update the variance model with the rows of the visited points around x_k and obtain its coefficients
+    # (used instead of get_model_coefficients_reg if incremental_variance_model is set)
+    def get_model_coefficients_incremental(self, x_k, delta_k, rows, problem):
+        if self.variance_model is None or self.variance_model.dim != problem.dim:
+            self.variance_model = IncrementalVarianceModel(problem.dim)
+        try:
+            # solve the linear least squares problem
+            self.variance_model.update(x_k, delta_k, rows)
+            q = self.variance_model.coefficients()
+            grad = q[1:problem.dim + 1]
+            grad = np.reshape(grad, problem.dim)
+            Hessian = q[problem.dim + 1: 2 * problem.dim + 1]
+            Hessian = np.reshape(Hessian, problem.dim)
+            ind_success = 1
+        except np.linalg.LinAlgError:
+            # start the model over so a bad row (e.g., a nan variance) does not stay in the normal equations
+            self.variance_model = IncrementalVarianceModel(problem.dim)
+            q = 0
+            grad = 0
+            Hessian = 0
+            ind_success = 0
+
+        return q, grad, Hessian, ind_success
+
+    # choose visited points within the trust region to replace planned design points, by Gaussian elimination with
+    # pivoting on the model basis [z, z^2] of the scaled points (the center point takes the constant term);
+    # a visited point is taken whenever its pivot is at least pivot_threshold, so the set stays well poised,
+    # and the planned points complete the set
+    def select_reused_points(self, x_k, delta, Y, visited_pts_list, problem):
+        pivot_threshold = self.factors["pivot_threshold"]
+        reused_solns = [None] * len(Y)
+        # visited points within the trust region (other than the center point)
+        candidates = []
+        candidate_xs = set()
+        for soln in visited_pts_list:
+            distance = norm(np.array(soln.x) - np.array(x_k))
+            if 0 < distance <= delta and soln.x not in candidate_xs:
+                candidates.append(soln)
+                candidate_xs.add(soln.x)
+        if len(candidates) == 0:
+            return Y, reused_solns
+
+        points = [np.array(soln.x) for soln in candidates] + [np.array(Y[i][0]) for i in range(1, len(Y))]
+        scaled = (np.array(points) - np.array(x_k)) / delta
+        U = np.hstack((scaled, scaled ** 2))
+        columns = list(range(2 * problem.dim))
+        chosen = []
+        for _ in range(2 * problem.dim):
+            # prefer visited points with a large enough pivot, else complete with the planned points
+            rows = [r for r in range(len(candidates)) if r not in chosen]
+            if len(rows) == 0 or np.max(np.abs(U[np.ix_(rows, columns)])) < pivot_threshold:
+                rows = [r for r in range(len(candidates), len(points)) if r not in chosen]
+            pivots = np.abs(U[np.ix_(rows, columns)])
+            r, c = np.unravel_index(np.argmax(pivots), pivots.shape)
+            r, c = rows[r], columns[c]
+            if U[r, c] == 0:
+                # the planned points cannot complete the set, keep the planned design
+                return Y, [None] * len(Y)
+            chosen.append(r)
+            U = U - np.outer(U[:, c] / U[r, c], U[r, :])
+            columns.remove(c)
+
+        new_Y = [Y[0]]
+        for r in chosen:
+            new_Y.append([points[r]])
+            if r < len(candidates):
+                reused_solns[len(new_Y) - 1] = candidates[r]
+        return new_Y, reused_solns
+
+    # replace planned design points (other than the center point and reused points) by points simulated in the
+    # previous pass of the contraction loop that lie in the same direction from x_k within distance radius,
+    # so only the points whose geometry changed are simulated again
+    def carry_over_points(self, x_k, radius, Y, reused_solns, pass_solns):
+        Y = list(Y)
+        reused_solns = list(reused_solns)
+        for i in range(1, len(Y)):
+            if reused_solns[i] is not None:
+                continue
+            planned = np.array(Y[i][0]) - np.array(x_k)
+            for soln in pass_solns:
+                offset = np.array(soln.x) - np.array(x_k)
+                distance = norm(offset)
+                if (0 < distance <= radius) and (soln not in reused_solns) and norm(offset / distance - planned / norm(planned)) < 1e-8:
+                    Y[i] = [np.array(soln.x)]
+                    reused_solns[i] = soln
+                    self.contraction_stats["carried_points"] += 1
+                    self.contraction_stats["carried_reps"] += soln.n_reps
+                    break
+        return Y, reused_solns
+
     # compute the interpolation points (2d+1) using the coordinate basis
     def get_coordinate_basis_interpolation_points(self, x_k, delta, problem):
         Y = [[x_k]]
@@ -721,6 +1052,14 @@ class VMIASTRODF(Solver):
         pf_constant = self.factors["penalty_function_constant"]
         reguralized_objective = self.factors["reguralized_objective"]
 
+        if self.telemetry is not None:
+            tic_iteration = time.perf_counter()
+            telemetry_start = dict(self.telemetry)
+            contraction_start = dict(self.contraction_stats)
+            delta_start = delta_k
+            budget_start = expended_budget
+            visited_before = set(map(id, visited_pts_list))
+            time_subproblem = 0.0
 
         if k == 1:
             new_solution = self.create_new_solution(tuple(new_x), problem)
@@ -743,7 +1082,7 @@ class VMIASTRODF(Solver):
                     sample_size += 1
                     fn = new_solution.objectives_mean
                     sig2 = new_solution.objectives_var
-                    if sample_size >= self.get_stopping_time(k, sig2, delta_k, fn / (delta_k ** 2), problem.dim) or expended_budget >= budget_limit:
+                    if sample_size >= self.get_stopping_time(k, sig2, delta_k, fn / (delta_k ** 2), problem.dim) or expended_budget >= budget_limit or problem.time_budget_exhausted():
                         kappa = fn / (delta_k ** 2)
                         break
             
@@ -768,11 +1107,19 @@ class VMIASTRODF(Solver):
             recommended_solns.append(new_solution)
             intermediate_budgets.append(0)
             recommended_solns.append(new_solution)
-            intermediate_budgets.append(expended_budget)
+            intermediate_budgets.append(problem.budget_stamp(expended_budget))
 
+        if self.telemetry is not None:
+            tic_model = time.perf_counter()
+            simulate_time_model = self.telemetry["simulate_time"]
         fval, Y, q, q_r, ind_success, grad, Hessian, delta_k, expended_budget, interpolation_solns, visited_pts_list, num_implementation = self.construct_model(new_x, delta_k, k, problem, expended_budget, kappa, new_solution, visited_pts_list, num_implementation)
+        if self.telemetry is not None:
+            time_model = time.perf_counter() - tic_model - (self.telemetry["simulate_time"] - simulate_time_model)
+            delta_model = delta_k
 
         if norm(grad) != 0:
+            if self.telemetry is not None:
+                tic_subproblem = time.perf_counter()
             if simple_solve:
                 # Cauchy reduction
                 if np.dot(np.multiply(grad, Hessian), grad) <= 0:
@@ -790,6 +1137,8 @@ class VMIASTRODF(Solver):
                 nlc = NonlinearConstraint(con_f, 0, delta_k)
                 solve_subproblem = minimize(subproblem, np.zeros(problem.dim), method='trust-constr', constraints=nlc)
                 candidate_x = new_x + solve_subproblem.x
+            if self.telemetry is not None:
+                time_subproblem = time.perf_counter() - tic_subproblem
 
             # handle the box constraints
             for i in range(problem.dim):
@@ -877,7 +1226,7 @@ class VMIASTRODF(Solver):
                     expended_budget += 1 + overhead_costs
                     sample_size += 1
                     sig2 = candidate_solution.objectives_var
-                    if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or expended_budget >= budget:
+                    if sample_size >= self.get_stopping_time(k, sig2, delta_k, kappa, problem.dim) or expended_budget >= budget or problem.time_budget_exhausted():
                         break
 
             # calculate success ratio
@@ -908,7 +1257,8 @@ class VMIASTRODF(Solver):
             final_ob = candidate_solution.objectives_mean
             delta_k = min(gamma_1 * delta_k, delta_max)
             recommended_solns.append(candidate_solution)
-            intermediate_budgets.append(expended_budget)
+            intermediate_budgets.append(problem.budget_stamp(expended_budget))
+            success = 2
         # successful: accept
         elif rho >= eta_1:
             new_x = candidate_x
@@ -916,14 +1266,45 @@ class VMIASTRODF(Solver):
             final_ob = candidate_solution.objectives_mean
             delta_k = min(delta_k, delta_max)
             recommended_solns.append(candidate_solution)
-            intermediate_budgets.append(expended_budget)
+            intermediate_budgets.append(problem.budget_stamp(expended_budget))
+            success = 1
         # unsuccessful: shrink and reject
         else:
             delta_k = min(gamma_2 * delta_k, delta_max)
             final_ob = fval[0]
+            success = 0
 
         norm_grad = norm(grad)
 
+        if self.telemetry is not None:
+            design_solns = interpolation_solns[-(2 * problem.dim + 1):]
+            simulate_reps = self.telemetry["simulate_reps"] - telemetry_start["simulate_reps"]
+            self.telemetry["records"].append({
+                "k": k,
+                "delta": delta_start,
+                "delta_model": delta_model,
+                "delta_next": delta_k,
+                "rho": float(np.squeeze(rho)),
+                "success": success,
+                "ind_success": ind_success,
+                "kappa": float(np.squeeze(kappa)),
+                "norm_grad": norm_grad,
+                "expended_budget": expended_budget,
+                "sample_sizes": ";".join(str(soln.n_reps) for soln in design_solns),
+                "candidate_sample_size": candidate_solution.n_reps if norm_grad != 0 else 0,
+                "reuse_hits": sum(id(soln) in visited_before for soln in design_solns),
+                "carried_points": self.contraction_stats["carried_points"] - contraction_start["carried_points"],
+                "carried_reps": self.contraction_stats["carried_reps"] - contraction_start["carried_reps"],
+                "simulate_calls": self.telemetry["simulate_calls"] - telemetry_start["simulate_calls"],
+                "simulate_reps": simulate_reps,
+                "overhead": expended_budget - budget_start - simulate_reps,
+                "num_implementation": num_implementation,
+                "time_model": time_model,
+                "time_subproblem": time_subproblem,
+                "time_simulation": self.telemetry["simulate_time"] - telemetry_start["simulate_time"],
+                "time_total": time.perf_counter() - tic_iteration
+            })
+
         return final_ob, delta_k, recommended_solns, intermediate_budgets, expended_budget, new_x, kappa, new_solution, visited_pts_list, norm_grad, var_data, num_implementation
 
 
@@ -946,35 +1327,44 @@ class VMIASTRODF(Solver):
         """
 
         budget = problem.factors["budget"]
-        # Designate random number generator for random sampling
-        find_next_soln_rng = self.rng_list[1]
-
-        # Generate many dummy solutions without replication only to find a reasonable maximum radius
-        dummy_solns = []
-        for i in range(10000*problem.dim):
-            dummy_solns += [problem.get_random_solution(find_next_soln_rng)]
-        
-        delta_max_arr = []
-        for i in range(problem.dim):
-            delta_max_arr += [min(max([sol[i] for sol in dummy_solns])-min([sol[i] for sol in dummy_solns]),
-                                  problem.upper_bounds[0] - problem.lower_bounds[0])]
-
-        delta_max = max(delta_max_arr)
-
-        delta_start = delta_max * 0.05
-        delta_candidate = [delta_start]
-
-        visited_pts_list = []
-        var_data = []
-        num_implementation = 0
-        k = 1
-
-        final_ob, delta_k, recommended_solns, intermediate_budgets, expended_budget, new_x, kappa, new_solution, visited_pts_list, norm_grad, var_data, num_implementation = self.iterate(k, \
-        delta_candidate[0], delta_max, problem, visited_pts_list, problem.factors["initial_solution"], 0, budget * 0.01, recommended_solns =[], intermediate_budgets=[], kappa=1, new_solution=[], var_data=[], num_implementation= num_implementation)
-        
-        while (expended_budget < budget):
-            k += 1
-            final_ob, delta_k, recommended_solns, intermediate_budgets, expended_budget, new_x, kappa, new_solution, visited_pts_list, norm_grad, var_data, num_implementation = self.iterate(k,
-                delta_k, delta_max, problem, visited_pts_list, new_x, expended_budget, budget, recommended_solns, intermediate_budgets, kappa, new_solution, var_data, num_implementation)
+        self.contraction_stats = {"carried_points": 0, "carried_reps": 0}
+        self.variance_model = IncrementalVarianceModel(problem.dim)
+        if self.factors["telemetry_path"]:
+            self.start_telemetry(problem)
+        try:
+            # Designate random number generator for random sampling
+            find_next_soln_rng = self.rng_list[1]
+
+            # Generate many dummy solutions without replication only to find a reasonable maximum radius
+            dummy_solns = []
+            for i in range(10000*problem.dim):
+                dummy_solns += [problem.get_random_solution(find_next_soln_rng)]
+
+            delta_max_arr = []
+            for i in range(problem.dim):
+                delta_max_arr += [min(max([sol[i] for sol in dummy_solns])-min([sol[i] for sol in dummy_solns]),
+                                      problem.upper_bounds[0] - problem.lower_bounds[0])]
+
+            delta_max = max(delta_max_arr)
+
+            delta_start = delta_max * 0.05
+            delta_candidate = [delta_start]
+
+            visited_pts_list = []
+            var_data = []
+            num_implementation = 0
+            k = 1
+
+            final_ob, delta_k, recommended_solns, intermediate_budgets, expended_budget, new_x, kappa, new_solution, visited_pts_list, norm_grad, var_data, num_implementation = self.iterate(k, \
+            delta_candidate[0], delta_max, problem, visited_pts_list, problem.factors["initial_solution"], 0, budget * 0.01, recommended_solns =[], intermediate_budgets=[], kappa=1, new_solution=[], var_data=[], num_implementation= num_implementation)
+
+            while (expended_budget < budget) and not problem.time_budget_exhausted():
+                k += 1
+                final_ob, delta_k, recommended_solns, intermediate_budgets, expended_budget, new_x, kappa, new_solution, visited_pts_list, norm_grad, var_data, num_implementation = self.iterate(k,
+                    delta_k, delta_max, problem, visited_pts_list, new_x, expended_budget, budget, recommended_solns, intermediate_budgets, kappa, new_solution, var_data, num_implementation)
+        finally:
+            # Restore problem.simulate even if the solver fails.
+            if self.telemetry is not None:
+                self.stop_telemetry(problem)
 
         return recommended_solns, intermediate_budgets